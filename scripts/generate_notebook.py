@@ -203,6 +203,47 @@ except Exception as e:
     print(f"统计分析出错: {e}")
 """))
 
+        # 轨迹存档按需读取
+        nb['cells'].append(self._create_markdown_cell("""
+## 轨迹存档分析
+
+配置 `trajectory_archive.enabled` 为 true 时, 各实验的轨迹保存在内存映射的轨迹存档中。
+以下单元格逐个场景读取指定的时间窗口, 只有用到的切片会从磁盘读入内存。
+"""))
+
+        nb['cells'].append(self._create_code_cell("""
+# 逐场景读取轨迹切片
+try:
+    from src.utils.trajectory_archive import TrajectoryArchive
+
+    archive = TrajectoryArchive.from_config(experiment_manager.config)
+    if archive is None or len(archive) == 0:
+        print("未启用轨迹存档或存档为空")
+    else:
+        print(f"存档场景数: {len(archive)}, 车辆总数: {archive.vehicle_count}")
+
+        # 各场景前20个时间步内的平均速度, 每次只映射一个场景的速度切片
+        window = slice(0, 20)
+        mean_speed = [
+            (item['key'], float(item['v'][item['v'] > 0].mean()) if (item['v'] > 0).any() else 0.0)
+            for item in archive.iter_scenarios(names=('v',), time=window)
+        ]
+        df_speed = pd.DataFrame(mean_speed, columns=['scenario', 'mean_speed'])
+        print(df_speed.describe())
+
+        # 第一个场景中第一辆车的位置与速度曲线
+        first = archive.scenario(0, names=('x', 'v'), vehicles=[0])
+        fig, axes = plt.subplots(1, 2, figsize=(12, 4))
+        axes[0].plot(first['x'][0])
+        axes[0].set_title('位置')
+        axes[1].plot(first['v'][0])
+        axes[1].set_title('速度')
+        plt.tight_layout()
+        plt.show()
+except Exception as e:
+    print(f"轨迹存档分析出错: {e}")
+"""))
+
         # 保存Notebook
         notebook_path = os.path.join(self.output_dir, 'comprehensive_analysis.ipynb')
 
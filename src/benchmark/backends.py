@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, Sequence
+
+from src.core.backends import solve_with_backend
+from src.benchmark.scenarios import generate_benchmark_car_list
+
+
+def run_backend(config: Dict[str, Any], backend: str) -> Dict[str, Any]:
+    """
+    使用指定后端求解一个场景, 记录构建时间、求解时间与目标值
+
+    Gurobi受限许可证下超出规模的实例记录为 size_limited
+
+    :param config: 包含车辆列表的配置
+    :param backend: 后端名称
+    :return: 求解统计
+    """
+    try:
+        solution = solve_with_backend(config, backend)
+    except Exception as e:
+        from src.benchmark.solver_suite import SIZE_LIMIT_ERROR
+        if getattr(e, 'errno', None) == SIZE_LIMIT_ERROR:
+            return {'status': 'size_limited'}
+        raise
+
+    return {
+        'status': solution['status'],
+        'build_time': solution['build_time'],
+        'solve_time': solution['solve_time'],
+        'objective_value': solution.get('objective_value', np.nan)
+    }
+
+
+def benchmark_backends(config: Dict[str, Any],
+                       backends: Sequence[str] = ('gurobi', 'highs'),
+                       seeds: Sequence[int] = range(3),
+                       densities: Sequence[float] = (0.1, 0.3),
+                       total_time: int = 20,
+                       max_vehicles: int = 12) -> pd.DataFrame:
+    """
+    在相同场景上比较各求解后端的求解时间与目标值
+
+    :param config: 模型配置
+    :param backends: 参与比较的后端名称
+    :param seeds: 场景随机种子
+    :param densities: 各道路的车流密度
+    :param total_time: 总模拟时间
+    :param max_vehicles: 每个场景的车辆数上限
+    :return: 每个场景与后端一行的对比表
+    """
+    rows = []
+
+    for density in densities:
+        for seed in seeds:
+            car_list = generate_benchmark_car_list(density, total_time, seed,
+                                                   max_vehicles=max_vehicles)
+            # 矩阵形式的模型描述仅支持线性化模型, 各后端统一按 linear 求解
+            exp_config = dict(config, total_time=total_time, car_list=car_list, formulation='linear')
+
+            for backend in backends:
+                record = {
+                    'density': density,
+                    'seed': seed,
+                    'car_count': len(car_list),
+                    'backend': backend
+                }
+                record.update(run_backend(exp_config, backend))
+                rows.append(record)
+
+    results = pd.DataFrame(rows)
+
+    # 相对于第一个后端的目标值差异与求解时间比
+    reference = results[results['backend'] == backends[0]].set_index(['density', 'seed'])
+    keys = pd.MultiIndex.from_frame(results[['density', 'seed']])
+    results['objective_difference'] = \
+        results['objective_value'].to_numpy() - reference['objective_value'].reindex(keys).to_numpy()
+    results['time_ratio'] = \
+        results['solve_time'].to_numpy() / reference['solve_time'].reindex(keys).to_numpy()
+
+    return results
+
+
+def main():
+    import yaml
+
+    with open('configs/default_config.yaml', 'r') as file:
+        config = yaml.safe_load(file)
+
+    results = benchmark_backends(config)
+
+    print("求解后端对比:")
+    print(results.to_string(index=False))
+    print(results.groupby('backend')[['solve_time', 'objective_difference']].mean().to_string())
+
+
+if __name__ == '__main__':
+    main()
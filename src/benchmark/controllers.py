@@ -0,0 +1,64 @@
+import time
+import pandas as pd
+from typing import Dict, Any, Sequence
+
+from src.core.controllers import CONTROLLERS, run_controller
+from src.benchmark.scenarios import generate_benchmark_car_list
+
+
+def benchmark_controllers(config: Dict[str, Any],
+                          controllers: Sequence[str] = tuple(CONTROLLERS),
+                          densities: Sequence[float] = (0.1, 0.2, 0.3),
+                          scenarios_per_density: int = 100,
+                          total_time: int = 120) -> pd.DataFrame:
+    """
+    在大量随机场景上运行基准控制策略, 汇总每种策略与密度下的平均耗时与目标值
+
+    :param config: 模型配置
+    :param controllers: 控制策略名称
+    :param densities: 车流密度
+    :param scenarios_per_density: 每个密度的场景数, 场景的随机种子依次为 0, 1, ...
+    :param total_time: 总模拟时间
+    :return: 每种 (策略, 密度) 一行的汇总表
+    """
+    config = dict(config, total_time=total_time)
+    rows = []
+
+    for density in densities:
+        car_lists = [
+            generate_benchmark_car_list(density, total_time // 2, seed)
+            for seed in range(scenarios_per_density)
+        ]
+        for controller in controllers:
+            start = time.perf_counter()
+            results = [run_controller(controller, config, car_list) for car_list in car_lists]
+            elapsed = time.perf_counter() - start
+
+            rows.append({
+                'controller': controller,
+                'density': density,
+                'scenarios': len(car_lists),
+                'average_vehicles': sum(len(car_list) for car_list in car_lists) / len(car_lists),
+                'time_per_scenario': elapsed / len(car_lists),
+                'average_objective': sum(r['objective_value'] for r in results) / len(results),
+                'conflict_violations': sum(r['violations']['conflict'] for r in results),
+                'unsafe_scenarios': sum(r['violation_count'] > 0 for r in results)
+            })
+
+    return pd.DataFrame(rows)
+
+
+def main():
+    import yaml
+
+    with open('configs/default_config.yaml', 'r') as file:
+        config = yaml.safe_load(file)
+
+    results = benchmark_controllers(config)
+
+    print("基准控制策略耗时:")
+    print(results.to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+import time
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, List, Sequence
+
+from src.core.model import TrafficOptimizationModel
+
+
+DEFAULT_CAR_COUNTS = (10, 50, 100, 200, 500, 1000, 2000)
+
+
+def generate_random_car_list(car_count: int,
+                             total_time: int,
+                             num_roads: int = 12,
+                             bus_ratio: float = 0.2,
+                             seed: int = 0) -> List[List[int]]:
+    """
+    生成用于构建测试的随机车辆列表
+
+    :param car_count: 车辆数量
+    :param total_time: 总模拟时间
+    :param num_roads: 道路数量
+    :param bus_ratio: 公交车比例
+    :param seed: 随机种子
+    :return: 车辆信息列表 [发车时间, 车辆类型, 道路编号]
+    """
+    rng = np.random.default_rng(seed)
+
+    initial_time = rng.integers(0, total_time, size=car_count)
+    car_type = (rng.random(car_count) < bus_ratio).astype(int)
+    car_route = rng.integers(1, num_roads + 1, size=car_count)
+
+    return np.column_stack([initial_time, car_type, car_route]).tolist()
+
+
+def time_model_build(config: Dict[str, Any],
+                     car_list: List[List[int]],
+                     build_mode: str) -> float:
+    """
+    统计构建一个模型(变量、约束、目标函数)所需的时间, 不求解
+
+    :param config: 模型配置
+    :param car_list: 车辆信息列表
+    :param build_mode: 模型构建方式
+    :return: 构建耗时(秒)
+    """
+    exp_config = dict(config, build_mode=build_mode)
+
+    start = time.perf_counter()
+
+    optimizer = TrafficOptimizationModel(exp_config)
+    optimizer.model.Params.OutputFlag = 0
+    optimizer.create_variables(len(car_list))
+    optimizer.add_constraints(
+        car_count=len(car_list),
+        car_type=[car[1] for car in car_list],
+        car_route=[car[2] for car in car_list],
+        initial_time=[car[0] for car in car_list]
+    )
+    optimizer.set_objective(
+        car_count=len(car_list),
+        car_type=[car[1] for car in car_list]
+    )
+    # Gurobi延迟更新, 强制写入后才计入完整构建时间
+    optimizer.model.update()
+
+    elapsed = time.perf_counter() - start
+    optimizer.model.dispose()
+
+    return elapsed
+
+
+def benchmark_model_build(config: Dict[str, Any],
+                          car_counts: Sequence[int] = DEFAULT_CAR_COUNTS,
+                          repeats: int = 1,
+                          seed: int = 0) -> pd.DataFrame:
+    """
+    比较逐车辆构建与矩阵构建两种方式的模型构建时间
+
+    :param config: 模型配置
+    :param car_counts: 车辆数量序列
+    :param repeats: 每组重复次数, 取最短时间
+    :param seed: 随机种子
+    :return: 构建时间对比表
+    """
+    rows = []
+    total_time = config.get('total_time', 80)
+
+    for car_count in car_counts:
+        car_list = generate_random_car_list(car_count, total_time, seed=seed)
+
+        timings = {
+            build_mode: min(time_model_build(config, car_list, build_mode)
+                            for _ in range(repeats))
+            for build_mode in ('loop', 'matrix')
+        }
+
+        rows.append({
+            'car_count': car_count,
+            'total_time': total_time,
+            'loop_build_time': timings['loop'],
+            'matrix_build_time': timings['matrix'],
+            'speedup': timings['loop'] / timings['matrix']
+        })
+
+    return pd.DataFrame(rows)
+
+
+def main():
+    import yaml
+
+    with open('configs/default_config.yaml', 'r') as file:
+        config = yaml.safe_load(file)
+
+    results = benchmark_model_build(config)
+
+    print("模型构建时间对比:")
+    print(results.to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+import time
+import pandas as pd
+from typing import Dict, Any, Sequence
+
+from src.core.model import build_traffic_optimization
+from src.core.online import OnlineOptimizer, latency_percentiles
+from src.benchmark.scenarios import generate_benchmark_car_list
+
+
+def rebuild_latency(config: Dict[str, Any], car_list) -> float:
+    """
+    从头构建并求解已到达车辆的完整模型所需的时间, 作为增量求解的对照
+
+    :param config: 模型配置
+    :param car_list: 已到达的车辆
+    :return: 构建与求解的总时间(秒)
+    """
+    start = time.perf_counter()
+    optimizer = build_traffic_optimization(dict(config, car_list=car_list))
+    optimizer.model.Params.OutputFlag = 0
+    optimizer.solve()
+    optimizer.model.dispose()
+
+    return time.perf_counter() - start
+
+
+def benchmark_online_latency(config: Dict[str, Any],
+                             seeds: Sequence[int] = range(3),
+                             density: float = 0.2,
+                             total_time: int = 20,
+                             max_vehicles: int = 12,
+                             rebuild: bool = True) -> pd.DataFrame:
+    """
+    回放 TrafficGenerator 生成的车辆到达序列, 记录每次到达的决策时延
+
+    :param config: 模型配置
+    :param seeds: 场景随机种子
+    :param density: 各道路的车流密度
+    :param total_time: 总模拟时间
+    :param max_vehicles: 每个场景的车辆数上限
+    :param rebuild: 是否同时记录每次到达从头构建求解的时延
+    :return: 每次到达一行的时延记录
+    """
+    config = dict(config, total_time=total_time)
+    rows = []
+
+    for seed in seeds:
+        car_list = generate_benchmark_car_list(density, total_time, seed,
+                                               max_vehicles=max_vehicles)
+        car_list = sorted(car_list, key=lambda car: car[0])
+
+        decisions = OnlineOptimizer(config).replay(car_list)
+        for arrival, decision in enumerate(decisions):
+            record = dict(decision, seed=seed, arrival=arrival)
+            if rebuild:
+                record['rebuild_latency'] = rebuild_latency(config, car_list[:arrival + 1])
+            rows.append(record)
+
+    return pd.DataFrame(rows)
+
+
+def main():
+    import yaml
+
+    with open('configs/default_config.yaml', 'r') as file:
+        config = yaml.safe_load(file)
+
+    results = benchmark_online_latency(config)
+    target = config.get('online', {}).get('latency_target', 1.0)
+
+    print("在线增量求解的决策时延:")
+    print(results.to_string(index=False))
+    print(f"增量求解时延分位数(秒): {latency_percentiles(results['latency'])}")
+    print(f"从头求解时延分位数(秒): {latency_percentiles(results['rebuild_latency'])}")
+    print(f"满足 {target} 秒时延目标的比例: {results['within_target'].mean():.2%}")
+
+
+if __name__ == '__main__':
+    main()
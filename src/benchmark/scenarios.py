@@ -0,0 +1,39 @@
+import numpy as np
+from typing import List, Optional
+
+from src.utils.traffic_generator import TrafficGenerator
+
+
+def generate_benchmark_car_list(density: float,
+                                total_time: int,
+                                seed: int,
+                                num_roads: int = 12,
+                                bus_interval: int = 8,
+                                max_vehicles: Optional[int] = None) -> List[List[int]]:
+    """
+    以固定随机种子生成基准测试用的车辆列表
+
+    :param density: 各道路的车流密度
+    :param total_time: 总模拟时间
+    :param seed: 随机种子
+    :param num_roads: 道路数量
+    :param bus_interval: 公交车发车间隔
+    :param max_vehicles: 车辆数上限, 超出时保留发车最早的车辆
+    :return: 车辆信息列表 [发车时间, 车辆类型, 道路编号]
+    """
+    flows = TrafficGenerator.generate_vehicle_flows(
+        p_list=[density] * num_roads,
+        total_time=total_time,
+        bus_interval=bus_interval,
+        rng=seed
+    )
+    car_list = TrafficGenerator.flows_to_car_list(flows)
+
+    # 发车时间须落在模拟时域内
+    car_list = [car for car in car_list if car[0] < total_time]
+
+    if max_vehicles is not None and len(car_list) > max_vehicles:
+        order = np.argsort([car[0] for car in car_list], kind='stable')[:max_vehicles]
+        car_list = [car_list[i] for i in sorted(order)]
+
+    return car_list
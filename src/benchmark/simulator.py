@@ -0,0 +1,70 @@
+import time
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, Sequence
+
+from src.core.simulator import TrajectorySimulator
+
+
+def benchmark_simulator(config: Dict[str, Any],
+                        vehicle_counts: Sequence[int] = (1000, 5000, 10000),
+                        total_time: int = 300,
+                        seed: int = 0) -> pd.DataFrame:
+    """
+    记录仿真器推进与校验大规模随机场景所需的时间
+
+    :param config: 模型配置
+    :param vehicle_counts: 各场景的车辆数
+    :param total_time: 仿真时间步数
+    :param seed: 随机种子
+    :return: 每个场景一行的耗时表
+    """
+    config = dict(config, total_time=total_time)
+    simulator = TrajectorySimulator(config)
+    rng = np.random.default_rng(seed)
+    route_count = len(config.get('road_length', [154, 145, 154, 145])) \
+        * config.get('intersection', {}).get('routes_per_road', 3)
+    rows = []
+
+    for car_count in vehicle_counts:
+        car_list = np.column_stack([
+            np.sort(rng.integers(0, total_time, car_count)),
+            rng.integers(0, 2, car_count),
+            rng.integers(1, route_count + 1, car_count)
+        ])
+
+        start = time.perf_counter()
+        solution = simulator.simulate(car_list)
+        simulate_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = simulator.evaluate(solution, car_list)
+        evaluate_time = time.perf_counter() - start
+
+        rows.append({
+            'car_count': car_count,
+            'total_time': total_time,
+            'simulate_time': simulate_time,
+            'evaluate_time': evaluate_time,
+            'crossed': result['crossed'],
+            **{f'{name}_violations': count for name, count in result['violations'].items()},
+            'gap_shortfall': result['gap_shortfall']
+        })
+
+    return pd.DataFrame(rows)
+
+
+def main():
+    import yaml
+
+    with open('configs/default_config.yaml', 'r') as file:
+        config = yaml.safe_load(file)
+
+    results = benchmark_simulator(config)
+
+    print("轨迹仿真器耗时:")
+    print(results.to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
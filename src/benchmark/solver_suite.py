@@ -0,0 +1,226 @@
+import os
+import json
+import time
+import itertools
+import logging
+import platform
+import gurobipy
+from datetime import datetime
+from typing import Dict, Any, List, Sequence, Optional
+
+from src.core.model import build_traffic_optimization
+from src.benchmark.scenarios import generate_benchmark_car_list
+
+
+# 受限许可证下模型规模超限时Gurobi返回的错误码
+SIZE_LIMIT_ERROR = 10010
+
+
+def run_benchmark_instance(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    构建并求解一个基准实例, 记录构建与求解各阶段的统计
+
+    :param config: 包含车辆列表的配置
+    :return: 基准统计
+    """
+    record = {}
+
+    start = time.perf_counter()
+    optimizer = build_traffic_optimization(config)
+    optimizer.model.Params.OutputFlag = 0
+    optimizer.model.update()
+    record['build_time'] = time.perf_counter() - start
+
+    model = optimizer.model
+    record['num_variables'] = model.NumVars
+    record['num_constraints'] = model.NumConstrs + model.NumQConstrs
+
+    try:
+        # 预处理后的模型规模
+        presolved = model.presolve()
+        record['presolve_variables'] = presolved.NumVars
+        record['presolve_constraints'] = presolved.NumConstrs + presolved.NumQConstrs
+        presolved.dispose()
+
+        optimizer.solve()
+    except gurobipy.GurobiError as e:
+        model.dispose()
+        if e.errno == SIZE_LIMIT_ERROR:
+            record['status'] = 'size_limited'
+            return record
+        raise
+
+    record['status'] = model.status
+    record['first_incumbent_time'] = model._first_incumbent_time
+    record['solve_time'] = model.Runtime
+    record['objective_value'] = model.ObjVal if model.SolCount > 0 else None
+    record['mip_gap'] = model.MIPGap if model.SolCount > 0 else None
+    record['node_count'] = model.NodeCount
+    model.dispose()
+
+    return record
+
+
+def run_solver_benchmark(config: Dict[str, Any],
+                         car_counts: Sequence[int] = (5, 10, 15),
+                         total_times: Sequence[int] = (10, 20),
+                         densities: Sequence[float] = (0.1, 0.3),
+                         seeds: Sequence[int] = (0, 1),
+                         time_limit: float = 60) -> List[Dict[str, Any]]:
+    """
+    在车辆数、模拟时域与车流密度的网格上运行求解器基准测试
+
+    默认网格可在Gurobi受限许可证下运行, 超出许可证规模的实例记录为 size_limited
+
+    :param config: 模型配置
+    :param car_counts: 车辆数上限序列
+    :param total_times: 模拟时域序列
+    :param densities: 车流密度序列
+    :param seeds: 场景随机种子序列
+    :param time_limit: 单个实例的求解时间上限(秒)
+    :return: 每个实例的基准统计列表
+    """
+    logger = logging.getLogger('SolverBenchmark')
+    results = []
+
+    for car_count, total_time, density, seed in itertools.product(
+            car_counts, total_times, densities, seeds
+    ):
+        car_list = generate_benchmark_car_list(density, total_time, seed,
+                                               max_vehicles=car_count)
+        exp_config = dict(
+            config,
+            total_time=total_time,
+            car_list=car_list,
+            solver=dict(config.get('solver', {}), time_limit=time_limit)
+        )
+
+        record = {
+            'car_count': len(car_list),
+            'max_vehicles': car_count,
+            'total_time': total_time,
+            'density': density,
+            'seed': seed
+        }
+        record.update(run_benchmark_instance(exp_config))
+        results.append(record)
+
+        logger.info(
+            f"车辆数 {record['car_count']}, 时域 {total_time}, 密度 {density}, "
+            f"种子 {seed}: 状态 {record['status']}, 求解时间 {record.get('solve_time')}"
+        )
+
+    return results
+
+
+def save_benchmark_results(results: List[Dict[str, Any]],
+                           output_path: str,
+                           config: Optional[Dict[str, Any]] = None):
+    """
+    将基准结果与运行环境信息保存为JSON
+
+    :param results: 基准统计列表
+    :param output_path: 输出文件路径
+    :param config: 基准使用的模型配置
+    """
+    payload = {
+        'metadata': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'gurobi_version': '.'.join(map(str, gurobipy.gurobi.version())),
+            'python_version': platform.python_version(),
+            'platform': platform.platform(),
+            'formulation': {
+                key: config.get(key) for key in ('build_mode', 'solver')
+            } if config else {}
+        },
+        'results': results
+    }
+
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, indent=2, ensure_ascii=False, default=str)
+
+
+def compare_benchmark_results(baseline_path: str,
+                              current_path: str,
+                              time_tolerance: float = 1.5,
+                              gap_tolerance: float = 1e-3,
+                              objective_tolerance: float = 1e-4) -> List[Dict[str, Any]]:
+    """
+    对比两次基准结果, 找出求解变慢、目标值变差、间隙变大或状态变化的实例
+
+    :param baseline_path: 基线结果文件
+    :param current_path: 当前结果文件
+    :param time_tolerance: 求解时间允许的增长倍数
+    :param gap_tolerance: MIP间隙允许的增加量
+    :param objective_tolerance: 目标值(最小化)允许的相对增加量
+    :return: 回归实例列表
+    """
+    def load(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return {
+                (r['max_vehicles'], r['total_time'], r['density'], r['seed']): r
+                for r in json.load(f)['results']
+            }
+
+    baseline, current = load(baseline_path), load(current_path)
+    regressions = []
+
+    for key in sorted(baseline.keys() & current.keys()):
+        before, after = baseline[key], current[key]
+        reasons = []
+
+        if before['status'] != after['status']:
+            reasons.append(f"状态 {before['status']} -> {after['status']}")
+        if before.get('solve_time') and after.get('solve_time') \
+                and after['solve_time'] > time_tolerance * max(before['solve_time'], 1e-2):
+            reasons.append(f"求解时间 {before['solve_time']:.3f} -> {after['solve_time']:.3f}")
+        if before.get('objective_value') is not None and after.get('objective_value') is not None \
+                and after['objective_value'] > before['objective_value'] \
+                + objective_tolerance * max(abs(before['objective_value']), 1):
+            reasons.append(f"目标值 {before['objective_value']:.4f} -> {after['objective_value']:.4f}")
+        if before.get('mip_gap') is not None and after.get('mip_gap') is not None \
+                and after['mip_gap'] > before['mip_gap'] + gap_tolerance:
+            reasons.append(f"MIP间隙 {before['mip_gap']:.4f} -> {after['mip_gap']:.4f}")
+
+        if reasons:
+            regressions.append({
+                'max_vehicles': key[0],
+                'total_time': key[1],
+                'density': key[2],
+                'seed': key[3],
+                'reasons': reasons
+            })
+
+    return regressions
+
+
+def main():
+    import yaml
+    import argparse
+
+    parser = argparse.ArgumentParser(description='求解器基准测试')
+    parser.add_argument('--config', default='configs/default_config.yaml')
+    parser.add_argument('--output', default='outputs/benchmarks/solver_benchmark.json')
+    parser.add_argument('--baseline', default=None, help='用于回归对比的基线结果文件')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    with open(args.config, 'r') as file:
+        config = yaml.safe_load(file)
+
+    results = run_solver_benchmark(config)
+    save_benchmark_results(results, args.output, config)
+    print(f"基准结果已保存到 {args.output}")
+
+    if args.baseline:
+        regressions = compare_benchmark_results(args.baseline, args.output)
+        for regression in regressions:
+            print(f"回归: {regression}")
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+import time
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, Sequence
+
+from src.core.model import build_traffic_optimization
+from src.core.template import ModelTemplate
+from src.benchmark.scenarios import generate_benchmark_car_list
+
+
+def benchmark_template_reuse(config: Dict[str, Any],
+                             densities: Sequence[float] = (0.1, 0.15, 0.2, 0.25, 0.3),
+                             seed: int = 0,
+                             total_time: int = 20,
+                             max_vehicles: int = 12) -> pd.DataFrame:
+    """
+    在依次求解的一组场景上比较每次重新构建模型与复用模型模板的构建时间与求解时间
+
+    模板按全部场景的最大车辆数一次性构建, 之后每个场景仅写入变量界、右端项与交叉口约束
+
+    :param config: 模型配置
+    :param densities: 依次求解的各场景车流密度
+    :param seed: 场景随机种子
+    :param total_time: 总模拟时间
+    :param max_vehicles: 每个场景的车辆数上限
+    :return: 每个场景一行的对比表
+    """
+    config = dict(config, total_time=total_time)
+    car_lists = [
+        generate_benchmark_car_list(density, total_time, seed, max_vehicles=max_vehicles)
+        for density in densities
+    ]
+
+    start = time.perf_counter()
+    template = ModelTemplate(config, max(len(car_list) for car_list in car_lists))
+    template.model.Params.OutputFlag = 0
+    template_build_time = time.perf_counter() - start
+
+    rows = []
+    for density, car_list in zip(densities, car_lists):
+        start = time.perf_counter()
+        optimizer = build_traffic_optimization(dict(config, car_list=car_list))
+        optimizer.model.Params.OutputFlag = 0
+        optimizer.model.update()
+        fresh_build_time = time.perf_counter() - start
+        model = optimizer.solve()
+        fresh_objective = model.ObjVal if model.SolCount > 0 else np.nan
+        fresh_solve_time = model.Runtime
+        model.dispose()
+
+        start = time.perf_counter()
+        template.apply_scenario(car_list)
+        template.model.update()
+        apply_time = time.perf_counter() - start
+        model = template.solve()
+
+        rows.append({
+            'density': density,
+            'car_count': len(car_list),
+            'fresh_build_time': fresh_build_time,
+            'template_apply_time': apply_time,
+            'fresh_solve_time': fresh_solve_time,
+            'template_solve_time': model.Runtime,
+            'fresh_objective': fresh_objective,
+            'template_objective': model.ObjVal if model.SolCount > 0 else np.nan
+        })
+
+    template.model.dispose()
+
+    results = pd.DataFrame(rows)
+    results['template_build_time'] = template_build_time
+    results['objective_difference'] = results['template_objective'] - results['fresh_objective']
+
+    return results
+
+
+def main():
+    import yaml
+
+    with open('configs/default_config.yaml', 'r') as file:
+        config = yaml.safe_load(file)
+
+    results = benchmark_template_reuse(config)
+
+    print("模型模板复用对比:")
+    print(results.to_string(index=False))
+    print(f"重新构建总时间: {results['fresh_build_time'].sum():.4f} 秒, "
+          f"模板构建与写入总时间: "
+          f"{results['template_build_time'].iloc[0] + results['template_apply_time'].sum():.4f} 秒")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,322 @@
+import time
+import logging
+from abc import ABC, abstractmethod
+import numpy as np
+import scipy.sparse as sp
+from typing import Dict, Any, Optional, Type
+
+from src.core.conflicts import crossing_start
+from src.core.formulation import build_matrix_problem
+from src.core.heuristics import TrajectoryHeuristics
+
+
+# 求解状态统一使用Gurobi的状态码, 结果分析与缓存无需区分后端
+OPTIMAL = 2
+INFEASIBLE = 3
+UNBOUNDED = 5
+TIME_LIMIT = 9
+UNKNOWN = 12
+
+
+def add_gurobi_constraints(model, name: str, A: sp.spmatrix, variables, lower: np.ndarray, upper: np.ndarray):
+    """
+    以 lower <= A @ variables <= upper 的形式向Gurobi模型添加一块约束
+
+    上下界相等的行添加为等式, 其余行按有限的一侧分别添加
+
+    :param model: Gurobi模型
+    :param name: 约束块名称
+    :param A: 稀疏约束矩阵
+    :param variables: 与 A 的列对应的一维MVar
+    :param lower: 下界, 无下界处为 -inf
+    :param upper: 上界, 无上界处为 inf
+    """
+    A = sp.csr_matrix(A)
+    lower = np.asarray(lower, dtype=float)
+    upper = np.asarray(upper, dtype=float)
+    equal = lower == upper
+    for sense, bound, rows in (('=', lower, equal),
+                               ('>', lower, ~equal & np.isfinite(lower)),
+                               ('<', upper, ~equal & np.isfinite(upper))):
+        if rows.any():
+            model.addMConstr(A[rows], variables, sense, bound[rows], name=f'{name}_{sense}')
+
+
+class SolverBackend(ABC):
+    """
+    求解后端接口: 变量与约束的创建、求解与解的提取
+
+    变量按添加顺序排成一列, add_variables 返回该块的起始列,
+    约束矩阵的列与之对应
+    """
+    name = None
+
+    def __init__(self, solver_config: Optional[Dict[str, Any]] = None):
+        """
+        :param solver_config: 配置中的 solver 部分(time_limit、mip_gap、threads)
+        """
+        solver_config = solver_config or {}
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.time_limit = solver_config.get('time_limit', 1500)
+        self.mip_gap = solver_config.get('mip_gap', 0.001)
+        self.threads = solver_config.get('threads')
+        self.column_count = 0
+
+    @abstractmethod
+    def add_variables(self, name: str, lb: np.ndarray, ub: np.ndarray, binary: bool) -> int:
+        """
+        添加一块变量
+
+        :param name: 变量块名称
+        :param lb: 下界
+        :param ub: 上界, 可为 inf
+        :param binary: 是否为0-1变量
+        :return: 该块的起始列
+        """
+
+    @abstractmethod
+    def add_constraints(self, name: str, A: sp.csr_matrix, lower: np.ndarray, upper: np.ndarray):
+        """
+        添加一块约束 lower <= A @ z <= upper, 单侧约束的另一侧为 inf
+
+        :param name: 约束块名称
+        :param A: 覆盖全部已添加变量列的稀疏矩阵
+        :param lower: 下界
+        :param upper: 上界
+        """
+
+    @abstractmethod
+    def set_objective(self, objective: np.ndarray):
+        """
+        设置最小化目标的系数
+
+        :param objective: 每列的目标系数
+        """
+
+    @abstractmethod
+    def solve(self) -> Dict[str, Any]:
+        """
+        求解模型
+
+        :return: 包含 status、solve_time, 有解时包含 objective_value 与 mip_gap 的字典
+        """
+
+    @abstractmethod
+    def get_values(self) -> np.ndarray:
+        """
+        :return: 全部变量的取值
+        """
+
+    def set_start(self, values: np.ndarray):
+        """
+        设置MIP初始解, 不支持初始解的后端忽略并给出警告
+
+        :param values: 全部变量的初始值, NaN 表示该位置不提供初始值
+        """
+        self.logger.warning(f"{self.name} 后端不支持MIP初始解, 已忽略 warm_start")
+
+    def load(self, problem: Dict[str, Any]):
+        """
+        将 build_matrix_problem 描述的模型加载到后端
+
+        :param problem: 矩阵形式的模型描述
+        """
+        for name, lb, ub, binary in problem['variables']:
+            self.add_variables(name, lb, ub, binary)
+        for name, A, lower, upper in problem['constraints']:
+            self.add_constraints(name, A, lower, upper)
+        self.set_objective(problem['objective'])
+
+
+class GurobiBackend(SolverBackend):
+    name = 'gurobi'
+
+    def __init__(self, solver_config: Optional[Dict[str, Any]] = None):
+        import gurobipy
+
+        super().__init__(solver_config)
+        self._gurobipy = gurobipy
+        self.model = gurobipy.Model()
+        self.model.Params.OutputFlag = 0
+        self.model.Params.MIPGap = self.mip_gap
+        self.model.Params.TimeLimit = self.time_limit
+        if self.threads is not None:
+            self.model.Params.Threads = self.threads
+        self.blocks = []
+
+    def add_variables(self, name, lb, ub, binary):
+        GRB = self._gurobipy.GRB
+        start = self.column_count
+        self.blocks.append(self.model.addMVar(
+            len(lb),
+            lb=lb,
+            ub=np.where(np.isinf(ub), GRB.INFINITY, ub),
+            vtype=GRB.BINARY if binary else GRB.CONTINUOUS,
+            name=name
+        ))
+        self.column_count += len(lb)
+        return start
+
+    def add_constraints(self, name, A, lower, upper):
+        variables = self._gurobipy.hstack(self.blocks) if len(self.blocks) > 1 else self.blocks[0]
+        add_gurobi_constraints(self.model, name, A, variables, lower, upper)
+
+    def set_objective(self, objective):
+        position = 0
+        for block in self.blocks:
+            block.Obj = objective[position:position + block.shape[0]]
+            position += block.shape[0]
+        self.model.ModelSense = self._gurobipy.GRB.MINIMIZE
+
+    def set_start(self, values):
+        values = np.where(np.isnan(values), self._gurobipy.GRB.UNDEFINED, values)
+        position = 0
+        for block in self.blocks:
+            block.Start = values[position:position + block.shape[0]]
+            position += block.shape[0]
+
+    def solve(self):
+        self.model.optimize()
+        result = {'status': self.model.status, 'solve_time': self.model.Runtime}
+        if self.model.SolCount > 0:
+            result['objective_value'] = self.model.ObjVal
+            result['mip_gap'] = self.model.MIPGap
+        return result
+
+    def get_values(self):
+        return np.concatenate([block.X for block in self.blocks])
+
+
+class HighsBackend(SolverBackend):
+    """
+    基于 scipy.optimize.milp 调用开源求解器HiGHS, 不需要商业许可证, 可在任意数量的核上并行运行
+
+    scipy.optimize.milp 不接受初始解, 配置的 warm_start 被忽略
+    """
+    name = 'highs'
+
+    def __init__(self, solver_config: Optional[Dict[str, Any]] = None):
+        super().__init__(solver_config)
+        self._lb, self._ub, self._integrality = [], [], []
+        self._constraints = []
+        self._objective = None
+        self._values = None
+
+    def add_variables(self, name, lb, ub, binary):
+        start = self.column_count
+        self._lb.append(np.asarray(lb, dtype=float))
+        self._ub.append(np.asarray(ub, dtype=float))
+        self._integrality.append(np.full(len(lb), int(binary)))
+        self.column_count += len(lb)
+        return start
+
+    def add_constraints(self, name, A, lower, upper):
+        self._constraints.append((sp.csr_matrix(A), lower, upper))
+
+    def set_objective(self, objective):
+        self._objective = np.asarray(objective, dtype=float)
+
+    def solve(self):
+        from scipy.optimize import milp, Bounds, LinearConstraint
+
+        constraints = [
+            LinearConstraint(A, lower, upper)
+            for A, lower, upper in self._constraints
+            if A.shape[0] > 0
+        ]
+        start = time.perf_counter()
+        result = milp(
+            self._objective,
+            integrality=np.concatenate(self._integrality),
+            bounds=Bounds(np.concatenate(self._lb), np.concatenate(self._ub)),
+            constraints=constraints,
+            options={'time_limit': self.time_limit, 'mip_rel_gap': self.mip_gap, 'disp': False}
+        )
+        solve_time = time.perf_counter() - start
+
+        # scipy.optimize.milp 状态: 0 最优, 1 达到迭代或时间上限, 2 不可行, 3 无界
+        status = {0: OPTIMAL, 1: TIME_LIMIT, 2: INFEASIBLE, 3: UNBOUNDED}.get(result.status, UNKNOWN)
+        output = {'status': status, 'solve_time': solve_time}
+        if result.x is not None:
+            self._values = result.x
+            output['objective_value'] = float(result.fun)
+            if getattr(result, 'mip_gap', None) is not None:
+                output['mip_gap'] = float(result.mip_gap)
+        return output
+
+    def get_values(self):
+        if self._values is None:
+            raise RuntimeError("模型无可用解")
+        return self._values
+
+
+BACKENDS: Dict[str, Type[SolverBackend]] = {
+    GurobiBackend.name: GurobiBackend,
+    HighsBackend.name: HighsBackend
+}
+
+
+def get_backend(name: str) -> Type[SolverBackend]:
+    """
+    按名称获取求解后端
+
+    :param name: 后端名称('gurobi' 或 'highs')
+    :return: 后端类
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"未知的求解后端: {name}")
+    return BACKENDS[name]
+
+
+def solve_with_backend(config: Dict[str, Any], backend: Optional[str] = None) -> Dict[str, Any]:
+    """
+    以指定后端构建并求解交通优化模型
+
+    返回值与 PerformanceAnalyzer.extract_solution 的格式一致, 可直接用于性能分析与结果缓存。
+    配置 solver.warm_start 为 'heuristic' 时, 使用FCFS预约启发式轨迹作为MIP初始解
+
+    :param config: 包含车辆列表的配置
+    :param backend: 后端名称, 默认取配置中的 solver.backend
+    :return: 包含求解状态、目标值与 (车辆, 时间) 形状解数组的字典
+    """
+    solver_config = config.get('solver', {})
+    backend = backend or solver_config.get('backend', 'gurobi')
+
+    start = time.perf_counter()
+    problem = build_matrix_problem(config)
+    solver = get_backend(backend)(solver_config)
+    solver.load(problem)
+    if solver_config.get('warm_start') == 'heuristic':
+        solver.set_start(heuristic_start(config, problem))
+    build_time = time.perf_counter() - start
+
+    solution = solver.solve()
+    solution['backend'] = backend
+    solution['build_time'] = build_time
+    if 'objective_value' not in solution:
+        return solution
+
+    values = solver.get_values()
+    shape = (problem['car_count'], problem['total_time'])
+    block_size = shape[0] * shape[1]
+    for name, offset in problem['offsets'].items():
+        if name != 'cross':
+            solution[name] = values[offset:offset + block_size].reshape(shape)
+
+    return solution
+
+
+def heuristic_start(config: Dict[str, Any], problem: Dict[str, Any]) -> np.ndarray:
+    """
+    将FCFS预约启发式轨迹排列为 build_matrix_problem 变量顺序的初始值
+
+    :param config: 包含车辆列表的配置
+    :param problem: 矩阵形式的模型描述
+    :return: 全部变量的初始值
+    """
+    heuristic = TrajectoryHeuristics.fcfs_reservation(config.get('car_list', []), config)
+    values = [heuristic[name].ravel() for name, _, _, _ in problem['variables'] if name != 'cross']
+    if problem['crossing'] is not None:
+        values.append(crossing_start(problem['crossing'], heuristic['cross_time']))
+
+    return np.concatenate(values).astype(float)
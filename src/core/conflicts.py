@@ -0,0 +1,338 @@
+import numpy as np
+import scipy.sparse as sp
+from typing import Dict, Any, Tuple
+
+from src.core.intersection import (
+    route_approach,
+    route_length,
+    route_zones,
+    vehicle_limits,
+    crossing_steps,
+    headway_steps,
+    earliest_arrival
+)
+
+
+def arrival_windows(car_list,
+                    config: Dict[str, Any],
+                    initial_velocity=None,
+                    initial_position=None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    每辆车通过停车线的时间窗口 [最早, 最晚]
+
+    最早时刻由以 a_max 加速至 v_max 的运动学推得, 最晚时刻为最早时刻加上
+    intersection.max_delay, 并截断在时域之内。最早时刻超出时域的车辆窗口为空(最晚 < 最早)
+
+    :param car_list: 车辆信息列表 [发车时间, 车辆类型, 道路编号]
+    :param config: 配置参数
+    :param initial_velocity: 每辆车在初始时刻的速度, 默认取配置中的initial_velocity
+    :param initial_position: 每辆车在初始时刻已行驶的距离, 默认为0
+    :return: (最早通过时刻, 最晚通过时刻)
+    """
+    total_time = config.get('total_time', 80)
+    max_delay = config.get('intersection', {}).get('max_delay', 30)
+
+    earliest = earliest_arrival(car_list, config, initial_velocity, initial_position)
+    latest = np.minimum(earliest + max_delay, total_time - 1)
+
+    return earliest, latest
+
+
+def conflict_pairs(zones: np.ndarray,
+                   occupy_start: np.ndarray,
+                   occupy_end: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    找出共享冲突区且占用时间窗口重叠的车辆对
+
+    对每个冲突区按占用起始时刻排序, 与车辆 k 重叠的只可能是其后起始时刻不晚于
+    k 的占用结束时刻的车辆, 通过二分查找得到, 无需枚举全部车辆对
+
+    :param zones: (车辆, 冲突区) 形状的布尔数组
+    :param occupy_start: 每辆车最早可能占用冲突区的时刻
+    :param occupy_end: 每辆车最晚可能占用冲突区的时刻(含)
+    :return: (车辆 i, 车辆 j) 数组, 满足 i < j 且不重复
+    """
+    car_count = zones.shape[0]
+    codes = []
+
+    for zone in range(zones.shape[1]):
+        members = np.flatnonzero(zones[:, zone] & (occupy_end >= occupy_start))
+        if len(members) < 2:
+            continue
+
+        members = members[np.argsort(occupy_start[members], kind='stable')]
+        starts = occupy_start[members]
+        stops = np.searchsorted(starts, occupy_end[members], side='right')
+
+        # 第 k 个成员与成员 k+1 .. stops[k]-1 重叠
+        counts = np.maximum(stops - np.arange(len(members)) - 1, 0)
+        first = np.repeat(np.arange(len(members)), counts)
+        second = first + 1 + np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+
+        i, j = members[first], members[second]
+        codes.append(np.minimum(i, j) * car_count + np.maximum(i, j))
+
+    if not codes:
+        return np.empty(0, dtype=int), np.empty(0, dtype=int)
+
+    codes = np.unique(np.concatenate(codes))
+    return codes // car_count, codes % car_count
+
+
+def approach_successors(approach: np.ndarray,
+                        initial_time: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    同一进口道上按发车顺序相邻的前后车
+
+    同一进口道的车辆不能超车, 只需约束相邻前后车的车头时距
+
+    :param approach: 每辆车的进口道编号
+    :param initial_time: 每辆车的初始时间
+    :return: (前车, 后车) 数组
+    """
+    order = np.lexsort((np.arange(len(approach)), initial_time, approach))
+    same = approach[order][1:] == approach[order][:-1]
+
+    return order[:-1][same], order[1:][same]
+
+
+def build_crossing_constraints(car_list,
+                               config: Dict[str, Any],
+                               initial_velocity=None,
+                               initial_position=None) -> Dict[str, Any]:
+    """
+    构建交叉口通过时刻、冲突区与车头时距约束的稀疏矩阵
+
+    每辆车在其通过时间窗口内的每个时刻有一个0-1通过变量 y。全部约束写成
+    A_x @ x + A_w @ w + A_y @ y <= rhs 的形式, 其中 x、w 按 (车辆, 时间) 展平:
+
+    - 每辆车至多通过一次: sum_s y[c, s] <= 1
+    - 通过之前位于有效区域: w[c, t] + sum_{s<=t} y[c, s] >= 1 (t >= 初始时间)
+    - 冲突: 共享冲突区且窗口重叠的车辆对, 任一时刻至多一辆车占用冲突区
+    - 车头时距: 后车 t 时刻前通过, 则前车须在 t - h 时刻前通过
+    - 位置: 通过后 x[c, t] >= L, 通过前 x[c, t] <= L, 大M由道路长度与最高速度推得
+
+    :param car_list: 车辆信息列表 [发车时间, 车辆类型, 道路编号]
+    :param config: 配置参数
+    :param initial_velocity: 每辆车在初始时刻的速度, 默认取配置中的initial_velocity
+    :param initial_position: 每辆车在初始时刻已行驶的距离, 默认为0
+    :return: 包含约束矩阵、右端项、通过窗口与变量下标偏移的字典
+    """
+    car_array = np.asarray(car_list, dtype=int).reshape(-1, 3)
+    initial_time, car_type, car_route = car_array[:, 0], car_array[:, 1], car_array[:, 2]
+    car_count = len(car_array)
+    total_time = config.get('total_time', 80)
+
+    earliest, latest = arrival_windows(car_array, config, initial_velocity, initial_position)
+    size = np.maximum(latest - earliest + 1, 0)
+    offset = np.cumsum(size) - size
+    duration = crossing_steps(car_type, config)
+
+    rows = _RowBuilder(earliest, latest, offset)
+
+    # 至多通过一次
+    cars = np.flatnonzero(size > 0)
+    row = rows.new(len(cars), 1.0)
+    rows.add_window(row, cars, earliest[cars], latest[cars], 1.0)
+
+    # 通过之前位于有效区域, 两边取负写成 <= 形式
+    link_car, link_time = np.nonzero(np.arange(total_time)[None, :] >= initial_time[:, None])
+    row = rows.new(len(link_car), -1.0)
+    rows.add('w', row, link_car * total_time + link_time, -1.0)
+    rows.add_window(row, link_car, earliest[link_car], link_time, -1.0)
+
+    # 冲突区: 占用时段为 [通过时刻, 通过时刻 + duration - 1]
+    occupy_end = latest + duration - 1
+    first, second = conflict_pairs(route_zones(car_route, config), earliest, occupy_end)
+    overlap_start = np.maximum(earliest[first], earliest[second])
+    overlap_end = np.minimum(occupy_end[first], occupy_end[second])
+    counts = np.maximum(overlap_end - overlap_start + 1, 0)
+    pair = np.repeat(np.arange(len(first)), counts)
+    step = np.repeat(overlap_start, counts) + np.arange(counts.sum()) \
+        - np.repeat(np.cumsum(counts) - counts, counts)
+    row = rows.new(len(pair), 1.0)
+    for vehicle in (first[pair], second[pair]):
+        rows.add_window(row, vehicle, step - duration[vehicle] + 1, step, 1.0)
+
+    # 车头时距: sum_{s<=t} y[后车, s] - sum_{s<=t-h} y[前车, s] <= 0
+    leader, follower = approach_successors(route_approach(car_route, config), initial_time)
+    headway = headway_steps(car_type[follower], config)
+    counts = size[follower]
+    index = np.repeat(np.arange(len(follower)), counts)
+    step = np.repeat(earliest[follower], counts) + np.arange(counts.sum()) \
+        - np.repeat(np.cumsum(counts) - counts, counts)
+    row = rows.new(len(index), 0.0)
+    rows.add_window(row, follower[index], earliest[follower[index]], step, 1.0)
+    rows.add_window(row, leader[index], earliest[leader[index]], step - headway[index], -1.0)
+
+    # 位置与通过时刻一致: 通过后 x >= L, 通过前 x <= L
+    # 大M取车辆以最高速度行驶可达的位置减去道路长度, 仅为可能越过停车线的时刻生成行
+    length = route_length(car_route, config)
+    limits = vehicle_limits(car_type, config)
+    time_step = config.get('time_step', 1)
+    start_position = np.zeros(car_count) if initial_position is None \
+        else np.broadcast_to(np.asarray(initial_position, dtype=float), (car_count,))
+
+    reach_car, reach_time = np.nonzero(np.arange(total_time)[None, :] >= earliest[:, None])
+    row = rows.new(len(reach_car), 0.0)
+    rows.add('x', row, reach_car * total_time + reach_time, -1.0)
+    rows.add_window(row, reach_car, earliest[reach_car], reach_time, length[reach_car])
+
+    elapsed = np.arange(total_time)[None, :] - initial_time[:, None]
+    reachable = start_position[:, None] + limits['v_max'][:, None] * time_step * elapsed
+    big_m = reachable - length[:, None]
+    bound_car, bound_time = np.nonzero((elapsed > 0) & (big_m > 0))
+    row = rows.new(len(bound_car), length[bound_car])
+    rows.add('x', row, bound_car * total_time + bound_time, 1.0)
+    rows.add_window(row, bound_car, earliest[bound_car], bound_time, -big_m[bound_car, bound_time])
+
+    blocks = rows.matrices({
+        'x': car_count * total_time,
+        'w': car_count * total_time,
+        'y': int(size.sum())
+    })
+
+    return {
+        'A_x': blocks['x'],
+        'A_w': blocks['w'],
+        'A_y': blocks['y'],
+        'rhs': rows.rhs(),
+        'earliest': earliest,
+        'latest': latest,
+        'offset': offset,
+        'num_pairs': len(first)
+    }
+
+
+def crossing_start(crossing: Dict[str, Any], cross_time: np.ndarray) -> np.ndarray:
+    """
+    将每辆车的通过时刻转换为通过变量 y 的初始值
+
+    :param crossing: build_crossing_constraints 的返回值
+    :param cross_time: 每辆车的通过时刻, -1 表示不通过
+    :return: 通过变量的初始值数组
+    """
+    earliest, latest, offset = crossing['earliest'], crossing['latest'], crossing['offset']
+    start = np.zeros(crossing['A_y'].shape[1])
+
+    cross_time = np.asarray(cross_time, dtype=int)
+    inside = (cross_time >= earliest) & (cross_time <= latest)
+    start[offset[inside] + cross_time[inside] - earliest[inside]] = 1.0
+
+    return start
+
+
+def reserved_crossing_mask(car_list,
+                           crossing: Dict[str, Any],
+                           config: Dict[str, Any],
+                           reserved_list,
+                           reserved_time) -> np.ndarray:
+    """
+    不在模型中、已确定通过时刻的车辆对模型中通过变量的限制
+
+    已确定的车辆在 [通过时刻, 通过时刻 + duration - 1] 内继续占用其冲突区, 且作为
+    同一进口道的前车约束后车的车头时距。返回与之冲突的通过变量, 这些变量须取0
+
+    :param car_list: 模型中的车辆信息列表 [发车时间, 车辆类型, 道路编号]
+    :param crossing: 模型中车辆的 build_crossing_constraints 返回值
+    :param config: 配置参数
+    :param reserved_list: 已确定车辆的信息列表 [发车时间, 车辆类型, 道路编号]
+    :param reserved_time: 已确定车辆的通过时刻, 与模型使用同一时间轴, 可为负
+    :return: 与通过变量对应的布尔数组, True 表示该通过时刻不可用
+    """
+    car_array = np.asarray(car_list, dtype=int).reshape(-1, 3)
+    reserved_array = np.asarray(reserved_list, dtype=int).reshape(-1, 3)
+    reserved_time = np.asarray(reserved_time, dtype=int).reshape(-1)
+    earliest, latest, offset = crossing['earliest'], crossing['latest'], crossing['offset']
+    size = np.maximum(latest - earliest + 1, 0)
+
+    # 每个通过变量对应的车辆与通过时刻
+    car = np.repeat(np.arange(len(car_array)), size)
+    slot = np.repeat(earliest, size) + np.arange(size.sum()) - np.repeat(offset, size)
+
+    car_route, reserved_route = car_array[:, 2], reserved_array[:, 2]
+    shared = (route_zones(car_route, config).astype(int)
+              @ route_zones(reserved_route, config).T.astype(int)) > 0
+    same_approach = route_approach(car_route, config)[:, None] == route_approach(reserved_route, config)[None, :]
+    duration = crossing_steps(car_array[:, 1], config)
+    reserved_duration = crossing_steps(reserved_array[:, 1], config)
+    headway = headway_steps(car_array[:, 1], config)
+
+    # (通过变量, 已确定车辆) 的占用时段重叠或车头时距不足
+    overlap = (slot[:, None] + duration[car][:, None] - 1 >= reserved_time[None, :]) \
+        & (slot[:, None] <= reserved_time[None, :] + reserved_duration[None, :] - 1)
+    too_close = slot[:, None] < reserved_time[None, :] + headway[car][:, None]
+    blocked = (shared[car] & overlap) | (same_approach[car] & too_close)
+
+    return blocked.any(axis=1)
+
+
+class _RowBuilder:
+    """
+    以坐标形式累积 A_x、A_w 与 A_y 的非零元
+    """
+
+    def __init__(self, earliest: np.ndarray, latest: np.ndarray, offset: np.ndarray):
+        self.earliest = earliest
+        self.latest = latest
+        self.offset = offset
+        self.row_count = 0
+        self._rhs = []
+        self._entries = {'x': [], 'w': [], 'y': []}
+
+    def new(self, count: int, rhs) -> np.ndarray:
+        """
+        追加一批约束行
+
+        :param count: 行数
+        :param rhs: 右端项, 标量或每行一个值
+        :return: 新约束行的行号
+        """
+        row = np.arange(self.row_count, self.row_count + count)
+        self.row_count += count
+        self._rhs.append(np.broadcast_to(np.asarray(rhs, dtype=float), (count,)))
+        return row
+
+    def add(self, name: str, row: np.ndarray, column: np.ndarray, value):
+        """
+        为每行添加 value * z[column], z 为按 (车辆, 时间) 展平的 x 或 w
+        """
+        value = np.broadcast_to(np.asarray(value, dtype=float), (len(row),))
+        self._entries[name].append((row, column, value))
+
+    def add_window(self,
+                   row: np.ndarray,
+                   vehicle: np.ndarray,
+                   first: np.ndarray,
+                   last: np.ndarray,
+                   value):
+        """
+        为每行添加 value * sum_{first <= s <= last} y[vehicle, s], 超出车辆通过窗口的部分自动截断
+        """
+        low = np.maximum(first, self.earliest[vehicle])
+        high = np.minimum(last, self.latest[vehicle])
+        counts = np.maximum(high - low + 1, 0)
+
+        repeated = np.repeat(np.arange(len(row)), counts)
+        step = np.repeat(low, counts) + np.arange(counts.sum()) \
+            - np.repeat(np.cumsum(counts) - counts, counts)
+        column = self.offset[vehicle[repeated]] + step - self.earliest[vehicle[repeated]]
+        value = np.broadcast_to(np.asarray(value, dtype=float), (len(row),))[repeated]
+
+        self._entries['y'].append((row[repeated], column, value))
+
+    def rhs(self) -> np.ndarray:
+        return np.concatenate(self._rhs) if self._rhs else np.empty(0)
+
+    def matrices(self, columns: Dict[str, int]) -> Dict[str, sp.csr_matrix]:
+        result = {}
+        for name, column_count in columns.items():
+            entries = self._entries[name]
+            if entries:
+                row, column, value = (np.concatenate(part) for part in zip(*entries))
+            else:
+                row = column = np.empty(0, dtype=int)
+                value = np.empty(0)
+            result[name] = sp.csr_matrix((value, (row, column)),
+                                         shape=(self.row_count, column_count))
+        return result
@@ -0,0 +1,304 @@
+import time
+from abc import ABC, abstractmethod
+import numpy as np
+from typing import List, Dict, Any, Optional, Type
+
+from src.core.conflicts import approach_successors
+from src.core.heuristics import TrajectoryHeuristics
+from src.core.simulator import TrajectorySimulator, Policy
+from src.core.intersection import (
+    route_approach,
+    route_length,
+    vehicle_limits,
+    crossing_steps,
+    headway_steps
+)
+
+
+# 求解状态与 PerformanceAnalyzer 的约定一致: 2 表示得到可用解,
+# 轨迹违反安全约束时与Gurobi的不可行状态码相同, 按不可行处理
+SOLVED = 2
+UNSAFE = 3
+
+
+class BaselineController(ABC):
+    """
+    基准控制策略: 不经优化直接生成与优化模型相同 (车辆, 时间) 格式的轨迹
+    """
+    name = None
+
+    def __init__(self, config: Dict[str, Any]):
+        """
+        :param config: 模型配置参数
+        """
+        self.config = config
+        self.simulator = TrajectorySimulator(config)
+
+    @abstractmethod
+    def trajectories(self, car_array: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        生成全部车辆的轨迹
+
+        :param car_array: (车辆, 3) 形状的车辆信息数组
+        :return: x/v/w/theta 数组
+        """
+
+    def run(self, car_list: List[List[int]]) -> Dict[str, Any]:
+        """
+        运行控制策略
+
+        返回值与 PerformanceAnalyzer.extract_solution 的格式一致, 目标值为按车型成本
+        加权的有效区域时间步数, 与优化模型的目标可直接比较。
+        轨迹违反安全约束时求解状态为 UNSAFE, 结果分析按不可行处理
+
+        :param car_list: 车辆信息列表 [发车时间, 车辆类型, 道路编号]
+        :return: 包含求解状态、目标值、耗时、违反次数与解数组的字典
+        """
+        start = time.perf_counter()
+        car_array = np.asarray(car_list, dtype=int).reshape(-1, 3)
+        solution = self.trajectories(car_array)
+        solve_time = time.perf_counter() - start
+
+        evaluation = self.simulator.evaluate(solution, car_array)
+        violation_count = sum(evaluation['violations'].values())
+        result = {
+            'status': SOLVED if violation_count == 0 else UNSAFE,
+            'controller': self.name,
+            'solve_time': solve_time,
+            'objective_value': evaluation['objective_value'],
+            'violations': evaluation['violations'],
+            'violation_count': violation_count
+        }
+        if violation_count:
+            result['message'] = f"控制策略 {self.name} 的轨迹违反安全约束 {violation_count} 次"
+        result.update({name: solution[name] for name in ('x', 'v', 'w', 'theta')})
+
+        return result
+
+
+class FCFSReservationController(BaselineController):
+    """
+    基于预约的自动交叉口管理(AIM): 车辆按到达顺序预约冲突区, 不限制最大延误
+    """
+    name = 'fcfs'
+
+    def trajectories(self, car_array):
+        cross_time = TrajectoryHeuristics.reserve_crossings(car_array, self.config)
+        return TrajectoryHeuristics.trajectories_for_crossings(car_array, cross_time, self.config)
+
+
+class SignalController(BaselineController):
+    """
+    信号控制的公共部分
+
+    每个进口道为一个相位。车辆按发车顺序在进口道内排队, 只有队首车辆在本进口道绿灯、
+    且与前一辆通过的车辆间隔不小于车头时距与冲突区占用时间时才可越过停车线;
+    其余车辆以能够在停车线前停住的速度行驶, 并与同一路线的前车保持最小车距
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.road_count = len(config.get('road_length', [154, 145, 154, 145]))
+        self.time_step = config.get('time_step', 1)
+        self.tolerance = self.simulator.tolerance
+
+    def reset(self):
+        """
+        开始一次新的仿真前重置信号状态
+
+        定时信号只依赖时刻, 默认不做任何处理; 保存相位等内部状态的信号(如感应信号)覆盖此方法
+        """
+
+    @abstractmethod
+    def permitted(self, t: int, approach: np.ndarray, duration: np.ndarray, state: Dict[str, Any]) -> np.ndarray:
+        """
+        信号是否允许车辆在 t + 1 时刻越过停车线, 并在占用冲突区期间保持绿灯
+
+        :param t: 当前时刻
+        :param approach: 候选车辆的进口道
+        :param duration: 候选车辆占用冲突区的时间步数
+        :param state: 各车当前位置 x、是否在排队 waiting、路线长度 length 与进口道 approach
+        :return: 布尔数组
+        """
+
+    def trajectories(self, car_array):
+        self.reset()
+        return self.simulator.simulate(car_array, policy=self._policy(car_array))
+
+    def _policy(self, car_array: np.ndarray) -> Policy:
+        """
+        构建闭环策略, 记录已通过车辆的通过时刻以控制放行间隔
+        """
+        initial_time, car_type, car_route = car_array[:, 0], car_array[:, 1], car_array[:, 2]
+        car_count = len(car_array)
+
+        limits = vehicle_limits(car_type, self.config)
+        length = route_length(car_route, self.config)
+        approach = route_approach(car_route, self.config)
+        duration = crossing_steps(car_type, self.config)
+        headway = headway_steps(car_type, self.config)
+
+        # 进口道内的排队顺序与同一路线上的前车
+        queue_order = np.lexsort((np.arange(car_count), initial_time, approach))
+        lane_leader = np.full(car_count, -1)
+        leader, follower = approach_successors(car_route, initial_time)
+        lane_leader[follower] = leader
+
+        cross_time = np.full(car_count, -1)
+        # 各进口道最近一辆车的通过时刻, 以及其驶离冲突区的时刻
+        last_crossing = np.full(self.road_count, -np.inf)
+        release = np.zeros(self.road_count)
+
+        def policy(t, x, v):
+            active = initial_time < t
+            crossed = active & (x > length + self.tolerance)
+            new = crossed & (cross_time < 0)
+            cross_time[new] = t
+            last_crossing[approach[new]] = t
+            release[approach[new]] = t + duration[new]
+
+            # 各进口道队首: 已进入且尚未通过的车辆中排队最靠前者
+            waiting = (initial_time <= t) & ~crossed
+            queued = queue_order[waiting[queue_order]]
+            head = np.zeros(car_count, dtype=bool)
+            _, first = np.unique(approach[queued], return_index=True)
+            head[queued[first]] = True
+
+            state = {'x': x, 'waiting': waiting, 'length': length, 'approach': approach}
+            allowed = head & (t + 1 >= release[approach]) & (t + 1 >= last_crossing[approach] + headway)
+            allowed &= self.permitted(t, approach, duration, state)
+            # 只有本步即可越过停车线的车辆按放行处理, 其余车辆须能在停车线前停住
+            v_free = np.minimum(v + limits['a_max'], limits['v_max'])
+            crossing = allowed & (x + self.time_step * v_free > length + self.tolerance)
+
+            target = np.where(crossing, v_free,
+                              np.minimum(v_free, _stopping_speed(length - x, limits['a_min'], self.time_step)))
+
+            # 与同一路线尚未通过的前车保持最小车距
+            has_leader = lane_leader >= 0
+            leader_x = np.where(has_leader, x[np.maximum(lane_leader, 0)], np.inf)
+            leader_ahead = has_leader & ~crossed[np.maximum(lane_leader, 0)]
+            gap_distance = np.where(leader_ahead, leader_x - limits['vehicle_gap'] - x, np.inf)
+            target = np.minimum(target, _stopping_speed(gap_distance, limits['a_min'], self.time_step))
+
+            return np.where(crossed, limits['a_max'], target - v)
+
+        return policy
+
+
+class FixedTimeSignalController(SignalController):
+    """
+    定时信号: 各进口道依次获得固定时长的绿灯, 相位之间插入全红
+    """
+    name = 'fixed_time'
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        signal_config = config.get('controllers', {}).get('fixed_time', {})
+        self.green = signal_config.get('green', 10)
+        self.all_red = signal_config.get('all_red', 2)
+
+    def green_approach(self, t: np.ndarray) -> np.ndarray:
+        """
+        :param t: 时刻
+        :return: 该时刻绿灯的进口道, 全红时为 -1
+        """
+        period = self.green + self.all_red
+        phase_time = np.asarray(t) % (period * self.road_count)
+        return np.where(phase_time % period < self.green, phase_time // period, -1)
+
+    def permitted(self, t, approach, duration, state):
+        # 从通过时刻到驶离冲突区均为本进口道绿灯
+        return (self.green_approach(t + 1) == approach) & (self.green_approach(t + duration) == approach) \
+            & ((t + 1) // (self.green + self.all_red) == (t + duration) // (self.green + self.all_red))
+
+
+class ActuatedSignalController(SignalController):
+    """
+    感应信号: 绿灯至少持续 min_green, 检测区内仍有车辆时延长, 至多 max_green;
+    切换时按顺序跳到检测区内有车辆的下一个进口道, 全红时长不短于车辆占用冲突区的时间
+    """
+    name = 'actuated'
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        signal_config = config.get('controllers', {}).get('actuated', {})
+        self.min_green = signal_config.get('min_green', 4)
+        self.max_green = signal_config.get('max_green', 20)
+        self.detection_distance = signal_config.get('detection_distance', 30)
+        self.all_red = signal_config.get('all_red', 2)
+
+    def reset(self):
+        self.phase = -1
+        self.last_phase = -1
+        self.phase_start = 0
+        self.red_until = 0
+
+    def permitted(self, t, approach, duration, state):
+        clearance = max(self.all_red, int(duration.max(initial=1)))
+        detected = state['waiting'] & (state['length'] - state['x'] <= self.detection_distance)
+        demand = np.bincount(state['approach'][detected], minlength=self.road_count) > 0
+
+        if self.phase >= 0:
+            elapsed = t + 1 - self.phase_start
+            if elapsed >= self.max_green or (elapsed >= self.min_green and not demand[self.phase]):
+                self.red_until = t + 1 + clearance
+                self.phase = -1
+        elif t + 1 >= self.red_until:
+            for k in range(1, self.road_count + 1):
+                candidate = (self.last_phase + k) % self.road_count
+                if demand[candidate]:
+                    self.phase = candidate
+                    self.last_phase = candidate
+                    self.phase_start = t + 1
+                    break
+
+        if self.phase < 0:
+            return np.zeros(len(approach), dtype=bool)
+        # 达到最长绿灯之前驶离冲突区
+        return (approach == self.phase) & (t + duration <= self.phase_start + self.max_green - 1)
+
+
+def _stopping_speed(distance: np.ndarray, a_min: np.ndarray, time_step: float) -> np.ndarray:
+    """
+    以最大减速度 |a_min| 逐步减速时, 行驶距离不超过 distance 的最大当前速度
+
+    速度序列 v, v - a, v - 2a, ... 的行驶距离为 (n + 1) * v - a * n * (n + 1) / 2,
+    其中 n 为满足 a * n * (n + 1) / 2 <= distance 的最大整数
+
+    :param distance: 可行驶的距离
+    :param a_min: 最大减速度(负值)
+    :param time_step: 时间步长
+    :return: 最大速度, 距离无限时为 inf
+    """
+    deceleration = np.abs(a_min)
+    steps = np.maximum(np.asarray(distance, dtype=float), 0.0) / time_step
+    # 距离无限(没有需要停住的位置)时速度不受限制
+    bounded = np.isfinite(steps)
+    steps = np.where(bounded, steps, 0.0)
+    n = np.floor((np.sqrt(1 + 8 * steps / deceleration) - 1) / 2)
+    return np.where(bounded, (steps + deceleration * n * (n + 1) / 2) / (n + 1), np.inf)
+
+
+CONTROLLERS: Dict[str, Type[BaselineController]] = {
+    FixedTimeSignalController.name: FixedTimeSignalController,
+    ActuatedSignalController.name: ActuatedSignalController,
+    FCFSReservationController.name: FCFSReservationController
+}
+
+
+def run_controller(name: str, config: Dict[str, Any], car_list: Optional[List[List[int]]] = None) -> Dict[str, Any]:
+    """
+    以指定的基准控制策略生成轨迹
+
+    :param name: 策略名称('fixed_time'、'actuated' 或 'fcfs')
+    :param config: 配置参数
+    :param car_list: 车辆信息列表, 默认取配置中的 car_list
+    :return: 与 PerformanceAnalyzer.extract_solution 格式一致的结果
+    """
+    if name not in CONTROLLERS:
+        raise ValueError(f"未知的控制策略: {name}")
+    if car_list is None:
+        car_list = config.get('car_list', [])
+
+    return CONTROLLERS[name](config).run(car_list)
@@ -0,0 +1,296 @@
+import time
+import logging
+import multiprocessing
+import gurobipy
+import numpy as np
+import scipy.sparse as sp
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Tuple
+
+from src.core.conflicts import build_crossing_constraints
+from src.core.heuristics import TrajectoryHeuristics
+from src.core.intersection import route_approach, route_zones, crossing_steps
+
+
+class LagrangianDecomposition:
+    def __init__(self, config: Dict[str, Any]):
+        """
+        初始化拉格朗日分解求解器
+
+        将冲突区容量约束(每个冲突区每个时刻至多一辆车)以乘子松弛到目标函数中,
+        问题分解为各进口道相互独立的子问题: 子问题保留本进口道内的通过窗口、
+        车头时距与冲突约束, 在进程池中并行求解。主问题以次梯度法更新乘子,
+        并以子问题给出的通过顺序经FCFS预约修复得到可行上界
+
+        :param config: 模型配置参数
+        """
+        self.config = config
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self.total_time = config.get('total_time', 80)
+
+        decomposition_config = config.get('decomposition', {})
+        self.max_iterations = decomposition_config.get('max_iterations', 50)
+        self.gap_tolerance = decomposition_config.get('gap_tolerance', 0.01)
+        self.time_limit = decomposition_config.get('time_limit', 300)
+        self.subproblem_time_limit = decomposition_config.get('subproblem_time_limit', 30)
+        self.step_scale = decomposition_config.get('step_scale', 2.0)
+        self.patience = decomposition_config.get('patience', 3)
+        self.workers = decomposition_config.get('workers', 1)
+
+    def solve(self, car_list: List[List[int]]) -> Dict[str, Any]:
+        """
+        迭代求解拉格朗日对偶, 记录每次迭代的上下界与间隙
+
+        :param car_list: 车辆信息列表 [发车时间, 车辆类型, 道路编号]
+        :return: 最优可行解的轨迹、通过时刻与迭代记录
+        """
+        start_clock = time.perf_counter()
+        car_array = np.asarray(car_list, dtype=int).reshape(-1, 3)
+        initial_time, car_type, car_route = car_array[:, 0], car_array[:, 1], car_array[:, 2]
+
+        cost = np.where(car_type == 1,
+                        self.config.get('cost_bus', 1),
+                        self.config.get('cost_car', 1)).astype(float)
+        zones = route_zones(car_route, self.config)
+        duration = crossing_steps(car_type, self.config)
+
+        subproblems, latest = self._build_subproblems(car_array, cost)
+
+        # 乘子定义在 (冲突区, 时刻) 上, 时刻延伸到最后一辆车驶出冲突区
+        horizon = self.total_time + int(duration.max(initial=1))
+        multipliers = np.zeros((zones.shape[1], horizon))
+        # 所有车辆均不通过时的目标值, 通过变量的系数相对于该常数计算
+        constant = float(np.sum(cost * (self.total_time - initial_time)))
+
+        lower_bound, upper_bound = -np.inf, np.inf
+        best_cross_time = np.full(len(car_array), -1)
+        step_scale = self.step_scale
+        stall = 0
+        iterations = []
+
+        executor = None
+        if self.workers > 1 and len(subproblems) > 1:
+            # Gurobi环境不能跨fork共享, 使用spawn启动子进程
+            executor = ProcessPoolExecutor(max_workers=self.workers,
+                                           mp_context=multiprocessing.get_context('spawn'))
+
+        try:
+            for iteration in range(self.max_iterations):
+                tasks = [
+                    (problem['A'], problem['rhs'],
+                     problem['cost'] + self._occupancy_penalty(problem, zones, duration, multipliers),
+                     self.subproblem_time_limit)
+                    for problem in subproblems
+                ]
+                results = list(executor.map(_solve_subproblem, tasks)) if executor \
+                    else [_solve_subproblem(task) for task in tasks]
+
+                # 拉格朗日对偶值为下界
+                relaxed_cross_time = np.full(len(car_array), -1)
+                dual_value = constant - multipliers.sum()
+                for problem, (selected, bound) in zip(subproblems, results):
+                    dual_value += bound
+                    chosen = problem['var_car'][selected]
+                    relaxed_cross_time[chosen] = problem['var_step'][selected]
+
+                if dual_value > lower_bound + 1e-9:
+                    lower_bound = dual_value
+                    stall = 0
+                else:
+                    stall += 1
+                    if stall >= self.patience:
+                        step_scale /= 2
+                        stall = 0
+
+                # 按松弛解的通过顺序修复为可行解
+                priority = np.where(relaxed_cross_time >= 0, relaxed_cross_time, np.inf)
+                cross_time = TrajectoryHeuristics.reserve_crossings(
+                    car_array, self.config, priority=priority, latest=latest
+                )
+                primal_value = _schedule_cost(cross_time, initial_time, cost, self.total_time)
+                if primal_value < upper_bound:
+                    upper_bound = primal_value
+                    best_cross_time = cross_time
+
+                gap = _relative_gap(lower_bound, upper_bound)
+                occupancy = _zone_occupancy(relaxed_cross_time, zones, duration, horizon)
+                subgradient = occupancy - 1.0
+                # 投影次梯度: 乘子为0且约束松弛的位置不参与步长计算
+                subgradient[(multipliers <= 0) & (subgradient < 0)] = 0.0
+                norm = float(np.sum(subgradient ** 2))
+
+                step = step_scale * (upper_bound - dual_value) / norm if norm > 0 else 0.0
+                iterations.append({
+                    'iteration': iteration,
+                    'lower_bound': float(lower_bound),
+                    'upper_bound': float(upper_bound),
+                    'dual_value': float(dual_value),
+                    'gap': float(gap),
+                    'step': float(step),
+                    'elapsed': time.perf_counter() - start_clock
+                })
+                self.logger.info(
+                    f"迭代 {iteration}: 下界 {lower_bound:.2f}, 上界 {upper_bound:.2f}, 间隙 {gap:.2%}"
+                )
+
+                if gap <= self.gap_tolerance or norm == 0 \
+                        or time.perf_counter() - start_clock >= self.time_limit:
+                    break
+
+                multipliers = np.maximum(multipliers + step * subgradient, 0.0)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        trajectories = TrajectoryHeuristics.trajectories_for_crossings(
+            car_array, best_cross_time, self.config
+        )
+
+        return {
+            'objective_value': float(upper_bound),
+            'lower_bound': float(lower_bound),
+            'gap': float(_relative_gap(lower_bound, upper_bound)),
+            'solve_time': time.perf_counter() - start_clock,
+            'iterations': iterations,
+            **trajectories
+        }
+
+    def _build_subproblems(self,
+                           car_array: np.ndarray,
+                           cost: np.ndarray) -> Tuple[List[Dict[str, Any]], np.ndarray]:
+        """
+        按进口道划分子问题, 每个子问题仅含通过变量 y
+
+        子问题约束取自 build_crossing_constraints 中不涉及 x、w 的行(至多通过一次、
+        车头时距与进口道内的冲突约束); 目标中 y[c, s] 的系数为在 s 时刻通过相对于
+        不通过节省的延误成本
+
+        :param car_array: (车辆, 3) 形状的车辆信息数组
+        :param cost: 每辆车的单位时间延误成本
+        :return: (子问题列表, 每辆车的最晚通过时刻)
+        """
+        approach = route_approach(car_array[:, 2], self.config)
+        subproblems = []
+        latest = np.full(len(car_array), -1)
+
+        for a in np.unique(approach):
+            cars = np.flatnonzero(approach == a)
+            crossing = build_crossing_constraints(car_array[cars], self.config)
+            latest[cars] = crossing['latest']
+
+            rows = (np.diff(crossing['A_w'].indptr) == 0) & (np.diff(crossing['A_x'].indptr) == 0)
+            size = np.maximum(crossing['latest'] - crossing['earliest'] + 1, 0)
+            local_car = np.repeat(np.arange(len(cars)), size)
+            var_step = np.repeat(crossing['earliest'], size) + np.arange(size.sum()) \
+                - np.repeat(crossing['offset'], size)
+
+            subproblems.append({
+                'A': sp.csr_matrix(crossing['A_y'][rows]),
+                'rhs': crossing['rhs'][rows],
+                'var_car': cars[local_car],
+                'var_step': var_step,
+                'cost': cost[cars][local_car] * (var_step - self.total_time)
+            })
+
+        return subproblems, latest
+
+    @staticmethod
+    def _occupancy_penalty(problem: Dict[str, Any],
+                           zones: np.ndarray,
+                           duration: np.ndarray,
+                           multipliers: np.ndarray) -> np.ndarray:
+        """
+        通过变量 y[c, s] 在拉格朗日项中的系数: 车辆在 [s, s + duration) 内占用的
+        各冲突区对应乘子之和
+
+        :param problem: 子问题
+        :param zones: (车辆, 冲突区) 形状的布尔数组
+        :param duration: 每辆车通过冲突区的时间步数
+        :param multipliers: (冲突区, 时刻) 形状的乘子
+        :return: 每个通过变量的惩罚系数
+        """
+        cumulative = np.concatenate(
+            [np.zeros((multipliers.shape[0], 1)), np.cumsum(multipliers, axis=1)], axis=1
+        )
+        car, step = problem['var_car'], problem['var_step']
+        end = np.minimum(step + duration[car], multipliers.shape[1])
+        per_zone = cumulative[:, end] - cumulative[:, step]
+
+        return np.sum(per_zone * zones[car].T, axis=0)
+
+
+def _solve_subproblem(task: Tuple[sp.csr_matrix, np.ndarray, np.ndarray, float]) -> Tuple[np.ndarray, float]:
+    """
+    求解单个进口道的0-1子问题: min objective @ y, s.t. A @ y <= rhs
+
+    在进程池中运行, 返回选中的通过变量与目标下界(未证明最优时取最优界)
+
+    :param task: (约束矩阵, 右端项, 目标系数, 时间上限)
+    :return: (选中变量的下标, 目标下界)
+    """
+    A, rhs, objective, time_limit = task
+    if A.shape[1] == 0:
+        return np.empty(0, dtype=int), 0.0
+
+    with gurobipy.Env(params={'OutputFlag': 0}) as env, gurobipy.Model(env=env) as model:
+        model.Params.TimeLimit = time_limit
+        model.Params.MIPGap = 0
+        y = model.addMVar(A.shape[1], vtype=gurobipy.GRB.BINARY, obj=objective)
+        if A.shape[0] > 0:
+            model.addMConstr(A, y, '<', rhs)
+        model.optimize()
+
+        selected = np.flatnonzero(y.X > 0.5) if model.SolCount > 0 else np.empty(0, dtype=int)
+        return selected, float(model.ObjBound)
+
+
+def _zone_occupancy(cross_time: np.ndarray,
+                    zones: np.ndarray,
+                    duration: np.ndarray,
+                    horizon: int) -> np.ndarray:
+    """
+    统计每个冲突区每个时刻被占用的车辆数
+
+    :param cross_time: 通过时刻, -1 表示不通过
+    :param zones: (车辆, 冲突区) 形状的布尔数组
+    :param duration: 每辆车通过冲突区的时间步数
+    :param horizon: 时刻数
+    :return: (冲突区, 时刻) 形状的占用车辆数
+    """
+    steps = np.arange(horizon)
+    crossing = cross_time >= 0
+    occupying = crossing[:, None] & (steps[None, :] >= cross_time[:, None]) \
+        & (steps[None, :] < (cross_time + duration)[:, None])
+
+    return zones.T.astype(float) @ occupying.astype(float)
+
+
+def _schedule_cost(cross_time: np.ndarray,
+                   initial_time: np.ndarray,
+                   cost: np.ndarray,
+                   total_time: int) -> float:
+    """
+    通过时刻方案的目标值, 即各车辆在有效区域内的加权时间步数
+    """
+    leave = np.where(cross_time >= 0, cross_time, total_time)
+    return float(np.sum(cost * (leave - initial_time)))
+
+
+def _relative_gap(lower_bound: float, upper_bound: float) -> float:
+    """
+    上下界的相对间隙
+    """
+    if not np.isfinite(lower_bound) or not np.isfinite(upper_bound):
+        return np.inf
+    return max(upper_bound - lower_bound, 0.0) / max(abs(upper_bound), 1e-9)
+
+
+def run_decomposition_optimization(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    使用拉格朗日分解方式运行交通优化
+
+    :param config: 配置参数
+    :return: 可行解轨迹、上下界及迭代记录
+    """
+    return LagrangianDecomposition(config).solve(config.get('car_list', []))
@@ -0,0 +1,269 @@
+import numpy as np
+import scipy.sparse as sp
+from typing import Dict, Any, List, Tuple
+
+from src.core.conflicts import build_crossing_constraints
+from src.core.intersection import route_length, vehicle_limits
+
+
+def acceleration_difference_matrix(initial_time: np.ndarray,
+                                   total_time: int) -> Tuple[sp.csr_matrix, np.ndarray]:
+    """
+    构建速度一阶差分的稀疏矩阵, 每行对应 v[c, t] - v[c, t - 1]
+
+    仅为车辆进入路网之后的时刻 (t > initial_time[c]) 生成行
+
+    :param initial_time: 车辆初始时间数组
+    :param total_time: 总模拟时间
+    :return: (差分矩阵, 每行对应的车辆编号)
+    """
+    car_count = len(initial_time)
+    steps = np.arange(total_time)
+
+    row_car, row_time = np.nonzero(steps[None, :] > initial_time[:, None])
+    rows = np.arange(len(row_car))
+    columns = row_car * total_time + row_time
+
+    difference = sp.csr_matrix(
+        (np.concatenate([np.ones(len(rows)), -np.ones(len(rows))]),
+         (np.concatenate([rows, rows]), np.concatenate([columns, columns - 1]))),
+        shape=(len(rows), car_count * total_time)
+    )
+
+    return difference, row_car
+
+
+def kinematic_matrices(initial_time: np.ndarray,
+                       total_time: int,
+                       time_step: float = 1) -> Tuple[sp.csr_matrix, sp.csr_matrix]:
+    """
+    构建线性位置更新 x[c, t] - x[c, t - 1] - v[c, t - 1] * dt = 0 的稀疏矩阵
+
+    行与 acceleration_difference_matrix 一致, 仅为车辆进入路网之后的时刻生成
+
+    :param initial_time: 车辆初始时间数组
+    :param total_time: 总模拟时间
+    :param time_step: 时间步长
+    :return: (作用于 x 的差分矩阵, 作用于 v 的矩阵)
+    """
+    difference, _ = acceleration_difference_matrix(initial_time, total_time)
+
+    # 差分矩阵中 -1 的位置即 (c, t - 1)
+    previous = difference.copy()
+    previous.data = np.where(previous.data < 0, -float(time_step), 0.0)
+    previous.eliminate_zeros()
+
+    return difference, previous
+
+
+def variable_bounds(car_array: np.ndarray,
+                    config: Dict[str, Any],
+                    initial_velocity=None,
+                    initial_position=None) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """
+    构建 x/v/w/theta 变量块的上下界, 均为 (车辆, 时间) 形状
+
+    速度上下限与初始速度写入速度的变量界; 车辆进入前位置为0, 进入时位置为
+    initial_position。线性化(linear)形式中进入状态 theta 由初始时间确定,
+    双线性(bilinear)形式中仅固定进入时刻及之前的取值
+
+    :param car_array: 车辆信息数组 [发车时间, 车辆类型, 道路编号]
+    :param config: 配置参数
+    :param initial_velocity: 每辆车的初始速度, 默认均取配置中的initial_velocity
+    :param initial_position: 每辆车在初始时间已行驶的距离, 默认为0
+    :return: 以变量块名称为键的 (下界, 上界), 无上界处为 inf
+    """
+    initial_time, car_type = car_array[:, 0], car_array[:, 1]
+    car_count = len(car_array)
+    total_time = config.get('total_time', 80)
+
+    if initial_velocity is None:
+        initial_velocity = np.full(car_count, float(config.get('initial_velocity', 6)))
+    if initial_position is None:
+        initial_position = np.zeros(car_count)
+    initial_velocity = np.asarray(initial_velocity, dtype=float).reshape(car_count, 1)
+    initial_position = np.asarray(initial_position, dtype=float).reshape(car_count, 1)
+
+    limits = vehicle_limits(car_type, config)
+    steps = np.arange(total_time)
+    active = steps[None, :] >= initial_time[:, None]
+    start = steps[None, :] == initial_time[:, None]
+
+    v_lb = np.where(active, limits['v_min'][:, None], 0.0)
+    v_ub = np.where(active, limits['v_max'][:, None], np.inf)
+    v_lb = np.where(start, np.maximum(v_lb, initial_velocity), v_lb)
+    v_ub = np.where(start, np.minimum(v_ub, initial_velocity), v_ub)
+
+    position = np.where(start, initial_position, 0.0)
+    x_lb = np.where(active & ~start, 0.0, position)
+    x_ub = np.where(active & ~start, np.inf, position)
+
+    theta_lb = active if config.get('formulation', 'bilinear') == 'linear' else start
+
+    return {
+        'x': (x_lb, x_ub),
+        'v': (v_lb, v_ub),
+        'w': (np.zeros(active.shape), np.ones(active.shape)),
+        'theta': (theta_lb.astype(float), active.astype(float))
+    }
+
+
+def vehicle_constraint_blocks(car_array: np.ndarray,
+                              config: Dict[str, Any],
+                              area_link: bool) -> List[Tuple[str, Dict[str, sp.csr_matrix], np.ndarray, np.ndarray]]:
+    """
+    构建每辆车自身的加速度约束、线性化位置更新约束以及位置与有效区域的关联约束
+
+    每块约束为 lower <= sum(A_b @ b) <= upper, 其中 b 为按 (车辆, 时间) 展平的
+    变量块。双线性(bilinear)形式的位置更新含变量乘积, 不在此生成
+
+    :param car_array: 车辆信息数组 [发车时间, 车辆类型, 道路编号]
+    :param config: 配置参数
+    :param area_link: 是否添加位置与有效区域的关联约束(未添加交叉口约束时使用)
+    :return: (约束块名称, 以变量块名称为键的子矩阵, 下界, 上界) 列表
+    """
+    initial_time, car_type, car_route = car_array[:, 0], car_array[:, 1], car_array[:, 2]
+    total_time = config.get('total_time', 80)
+    block_size = len(car_array) * total_time
+    limits = vehicle_limits(car_type, config)
+    constraints = []
+
+    # 加速度约束
+    difference, row_car = acceleration_difference_matrix(initial_time, total_time)
+    if difference.shape[0] > 0:
+        constraints.append(('acceleration', {'v': difference},
+                            limits['a_min'][row_car], limits['a_max'][row_car]))
+
+    # 位置更新约束
+    if config.get('formulation', 'bilinear') == 'linear':
+        difference, previous = kinematic_matrices(initial_time, total_time, config.get('time_step', 1))
+        if difference.shape[0] > 0:
+            zeros = np.zeros(difference.shape[0])
+            constraints.append(('kinematics', {'x': difference, 'v': previous}, zeros, zeros))
+
+    # 以道路长度为大M关联位置与有效区域: L * w + x >= L
+    if area_link:
+        length = route_length(car_route, config)
+        active = np.arange(total_time)[None, :] >= initial_time[:, None]
+        area_car, area_time = np.nonzero(active)
+        rows = np.arange(len(area_car))
+        columns = area_car * total_time + area_time
+        constraints.append((
+            'area',
+            {
+                'x': sp.csr_matrix((np.ones(len(rows)), (rows, columns)), shape=(len(rows), block_size)),
+                'w': sp.csr_matrix((length[area_car], (rows, columns)), shape=(len(rows), block_size))
+            },
+            length[area_car],
+            np.full(len(rows), np.inf)
+        ))
+
+    return constraints
+
+
+def delay_cost(car_type, config: Dict[str, Any]) -> np.ndarray:
+    """
+    每辆车单位时间的延迟成本, 即目标函数中 w 的系数
+
+    :param car_type: 车辆类型(0:小汽车, 1:公交车)
+    :param config: 配置参数
+    :return: 每车的延迟成本
+    """
+    car_type = np.asarray(car_type, dtype=float)
+    return config.get('cost_car', 1) * (1 - car_type) + config.get('cost_bus', 1) * car_type
+
+
+def build_matrix_problem(config: Dict[str, Any],
+                         initial_velocity=None,
+                         initial_position=None) -> Dict[str, Any]:
+    """
+    以与求解器无关的矩阵形式描述交通优化模型
+
+    变量依次为按 (车辆, 时间) 展平的 x/v/w/theta 块与通过时刻变量 cross,
+    约束为 lower <= A @ z <= upper 形式的稀疏行块。变量界与约束块由
+    variable_bounds、vehicle_constraint_blocks 与 build_crossing_constraints 生成,
+    TrafficOptimizationModel 的矩阵构建方式使用同一组函数, 可交由任一求解后端求解
+
+    :param config: 包含车辆列表的配置, 须为线性化(linear)形式
+    :param initial_velocity: 每辆车的初始速度, 默认均取配置中的initial_velocity
+    :param initial_position: 每辆车在初始时间已行驶的距离, 默认为0
+    :return: 包含变量块、约束块与目标系数的字典
+    """
+    if config.get('formulation', 'bilinear') != 'linear':
+        raise ValueError("矩阵形式的模型描述仅支持线性化(linear)模型, 请在配置中设置 formulation: linear")
+
+    car_array = np.asarray(config.get('car_list', []), dtype=int).reshape(-1, 3)
+    car_count = len(car_array)
+    total_time = config.get('total_time', 80)
+    block_size = car_count * total_time
+
+    bounds = variable_bounds(car_array, config, initial_velocity, initial_position)
+    variables = [
+        (name, lb.ravel(), ub.ravel(), name in ('w', 'theta'))
+        for name, (lb, ub) in bounds.items()
+    ]
+    offsets = {'x': 0, 'v': block_size, 'w': 2 * block_size, 'theta': 3 * block_size}
+
+    crossing = None
+    conflicts = config.get('intersection', {}).get('conflicts', True)
+    if conflicts:
+        crossing = build_crossing_constraints(car_array, config, initial_velocity, initial_position)
+        cross_size = crossing['A_y'].shape[1]
+        variables.append(('cross', np.zeros(cross_size), np.ones(cross_size), True))
+        offsets['cross'] = 4 * block_size
+    column_count = sum(len(lb) for _, lb, _, _ in variables)
+
+    constraints = [
+        (name, _place_blocks(blocks, offsets, column_count), lower, upper)
+        for name, blocks, lower, upper in vehicle_constraint_blocks(car_array, config, area_link=not conflicts)
+    ]
+
+    # 交叉口冲突区与车头时距约束
+    if crossing is not None and crossing['A_w'].shape[0] > 0:
+        rows = crossing['A_w'].shape[0]
+        constraints.append((
+            'crossing',
+            _place_blocks({'x': crossing['A_x'], 'w': crossing['A_w'], 'cross': crossing['A_y']},
+                          offsets, column_count),
+            np.full(rows, -np.inf),
+            crossing['rhs']
+        ))
+
+    # 最小化延迟成本
+    objective = np.zeros(column_count)
+    objective[offsets['w']:offsets['w'] + block_size] = np.repeat(delay_cost(car_array[:, 1], config), total_time)
+
+    return {
+        'car_count': car_count,
+        'total_time': total_time,
+        'variables': variables,
+        'offsets': offsets,
+        'constraints': constraints,
+        'objective': objective,
+        'crossing': crossing
+    }
+
+
+def _place_blocks(blocks: Dict[str, sp.spmatrix],
+                  offsets: Dict[str, int],
+                  column_count: int) -> sp.csr_matrix:
+    """
+    将按变量块给出的子矩阵放置到覆盖全部变量列的矩阵中
+
+    :param blocks: 以变量块名称为键的子矩阵, 行数相同
+    :param offsets: 各变量块的起始列
+    :param column_count: 总列数
+    :return: 拼接后的稀疏矩阵
+    """
+    row_count = next(iter(blocks.values())).shape[0]
+    rows, columns, values = [], [], []
+    for name, block in blocks.items():
+        block = sp.coo_matrix(block)
+        rows.append(block.row)
+        columns.append(block.col + offsets[name])
+        values.append(block.data)
+
+    return sp.csr_matrix(
+        (np.concatenate(values), (np.concatenate(rows), np.concatenate(columns))),
+        shape=(row_count, column_count)
+    )
@@ -0,0 +1,186 @@
+import numpy as np
+from typing import List, Dict, Any
+
+from src.core.intersection import (
+    route_approach,
+    route_length,
+    route_zones,
+    vehicle_limits,
+    crossing_steps,
+    headway_steps,
+    earliest_arrival
+)
+from src.core.conflicts import arrival_windows, approach_successors
+
+
+class TrajectoryHeuristics:
+    @staticmethod
+    def fcfs_reservation(car_list: List[List[int]],
+                         config: Dict[str, Any],
+                         reserved: np.ndarray = None) -> Dict[str, np.ndarray]:
+        """
+        先到先服务(FCFS)的交叉口预约启发式, 生成可行的初始轨迹
+
+        车辆按最早到达停车线的时刻依次预约通过时刻: 通过期间占用的冲突区不得与
+        已预约车辆重叠, 且与同一进口道前车保持最小车头时距, 通过时刻不晚于
+        模型中的通过时间窗口。随后为每辆车生成
+        恰好在预约时刻到达停车线的匀加速(或匀减速)速度曲线
+
+        :param car_list: 车辆信息列表 [发车时间, 车辆类型, 道路编号]
+        :param config: 配置参数
+        :param reserved: 已确定的通过时刻, 见 reserve_crossings
+        :return: (车辆, 时间) 形状的 x/v/w/theta 数组, 以及每辆车的通过时刻 cross_time
+                 (在时域内无法通过时为 -1)
+        """
+        car_array = np.asarray(car_list, dtype=int).reshape(-1, 3)
+        _, latest = arrival_windows(car_array, config)
+        cross_time = TrajectoryHeuristics.reserve_crossings(car_array, config, latest=latest, reserved=reserved)
+
+        return TrajectoryHeuristics.trajectories_for_crossings(car_array, cross_time, config)
+
+    @staticmethod
+    def reserve_crossings(car_array: np.ndarray,
+                          config: Dict[str, Any],
+                          priority: np.ndarray = None,
+                          latest: np.ndarray = None,
+                          reserved: np.ndarray = None) -> np.ndarray:
+        """
+        按优先顺序为车辆预约冲突区, 返回每辆车通过停车线的时刻
+
+        同一进口道的车辆不能超车: 后车的优先级不会高于前车, 前车无法通过时后车也不再预约。
+        reserved 中已确定通过时刻的车辆先占用冲突区, 其余车辆在此基础上按顺序预约
+
+        :param car_array: (车辆, 3) 形状的车辆信息数组
+        :param config: 配置参数
+        :param priority: 预约顺序的排序键, 默认按最早到达时刻
+        :param latest: 每辆车允许的最晚通过时刻, 默认为时域结束
+        :param reserved: 已确定的通过时刻, NaN 表示尚待预约, -1 表示在时域内不通过
+        :return: 通过时刻数组, 在时域内无法通过时为 -1
+        """
+        total_time = config.get('total_time', 80)
+        initial_time, car_type, car_route = car_array[:, 0], car_array[:, 1], car_array[:, 2]
+
+        earliest = earliest_arrival(car_array, config)
+        zones = route_zones(car_route, config)
+        approach = route_approach(car_route, config)
+        duration = crossing_steps(car_type, config)
+        headway = headway_steps(car_type, config)
+        if latest is None:
+            latest = np.full(len(car_array), total_time - 1)
+
+        if priority is None:
+            priority = earliest
+        priority = np.asarray(priority, dtype=float).copy()
+
+        # 按发车顺序对每条进口道的优先级取累计最大值, 保证前车先于后车预约
+        leader, follower = approach_successors(approach, initial_time)
+        for c_leader, c_follower in zip(leader, follower):
+            priority[c_follower] = max(priority[c_follower], priority[c_leader])
+        order = np.lexsort((np.arange(len(car_array)), initial_time, priority))
+
+        occupied = np.zeros((zones.shape[1], total_time + int(duration.max(initial=1))), dtype=bool)
+        last_crossing = np.full(zones.shape[1], -np.inf)
+        blocked = np.zeros(zones.shape[1], dtype=bool)
+        cross_time = np.full(len(car_array), -1)
+
+        fixed = np.zeros(len(car_array), dtype=bool)
+        if reserved is not None:
+            reserved = np.asarray(reserved, dtype=float)
+            fixed = ~np.isnan(reserved)
+            for c in np.flatnonzero(fixed):
+                if reserved[c] < 0:
+                    blocked[approach[c]] = True
+                    continue
+                slot = int(reserved[c])
+                occupied[zones[c], slot:slot + duration[c]] = True
+                last_crossing[approach[c]] = max(last_crossing[approach[c]], slot)
+                cross_time[c] = slot
+
+        for c in order:
+            if fixed[c] or blocked[approach[c]]:
+                continue
+
+            limit = min(total_time - 1, latest[c])
+            slot = int(max(earliest[c], last_crossing[approach[c]] + headway[c]))
+            while slot <= limit and occupied[zones[c], slot:slot + duration[c]].any():
+                slot += 1
+
+            if slot > limit:
+                blocked[approach[c]] = True
+                continue
+
+            occupied[zones[c], slot:slot + duration[c]] = True
+            last_crossing[approach[c]] = slot
+            cross_time[c] = slot
+
+        return cross_time
+
+    @staticmethod
+    def trajectories_for_crossings(car_array: np.ndarray,
+                                   cross_time: np.ndarray,
+                                   config: Dict[str, Any],
+                                   iterations: int = 60) -> Dict[str, np.ndarray]:
+        """
+        为给定通过时刻生成匀加速(速度在上下限处截断)的速度曲线及对应的位置与状态变量
+
+        加速度由二分法确定: 取使车辆在通过时刻恰好到达停车线的最小加速度;
+        时域内不通过的车辆取使其在时域结束前不越过停车线的最大加速度
+
+        :param car_array: (车辆, 3) 形状的车辆信息数组
+        :param cross_time: 通过时刻数组, -1 表示在时域内不通过
+        :param config: 配置参数
+        :param iterations: 二分迭代次数
+        :return: (车辆, 时间) 形状的 x/v/w/theta 数组及 cross_time
+        """
+        total_time = config.get('total_time', 80)
+        time_step = config.get('time_step', 1)
+        initial_velocity = config.get('initial_velocity', 6)
+        initial_time, car_type, car_route = car_array[:, 0], car_array[:, 1], car_array[:, 2]
+
+        limits = vehicle_limits(car_type, config)
+        length = route_length(car_route, config)
+
+        steps = np.arange(total_time)
+        elapsed = steps[None, :] - initial_time[:, None]
+        entered = elapsed >= 0
+        crossing = cross_time >= 0
+
+        # 通过的车辆在 tau 步后到达停车线, 不通过的车辆在时域最后一步仍未越过
+        tau = np.where(crossing, cross_time - initial_time, total_time - 1 - initial_time)
+
+        def profile(acceleration):
+            velocity = initial_velocity + acceleration[:, None] * np.maximum(elapsed, 0) * time_step
+            velocity = np.clip(velocity, limits['v_min'][:, None], limits['v_max'][:, None])
+            return np.where(entered, velocity, 0.0)
+
+        def distance(acceleration):
+            velocity = profile(acceleration)
+            travelled = (elapsed >= 0) & (elapsed < tau[:, None])
+            return np.sum(np.where(travelled, velocity, 0.0), axis=1) * time_step
+
+        # distance 随加速度单调不减
+        low, high = limits['a_min'].copy(), limits['a_max'].copy()
+        for _ in range(iterations):
+            middle = (low + high) / 2
+            reached = distance(middle) >= length
+            high = np.where(reached, middle, high)
+            low = np.where(reached, low, middle)
+        acceleration = np.where(crossing, high, low)
+
+        velocity = profile(acceleration)
+        position = np.concatenate(
+            [np.zeros((len(car_array), 1)), np.cumsum(velocity * time_step, axis=1)[:, :-1]],
+            axis=1
+        )
+        position = np.where(entered, position, 0.0)
+
+        # 进入路网后至通过停车线前位于有效区域
+        crossed = crossing[:, None] & (steps[None, :] >= cross_time[:, None])
+
+        return {
+            'x': position,
+            'v': velocity,
+            'w': (entered & ~crossed).astype(float),
+            'theta': entered.astype(float),
+            'cross_time': cross_time
+        }
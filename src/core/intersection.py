@@ -0,0 +1,177 @@
+import numpy as np
+from typing import Dict, Any
+
+
+def routes_per_road(config: Dict[str, Any]) -> int:
+    """
+    每条进口道对应的路线数(左转、直行、右转)
+
+    :param config: 配置参数
+    :return: 每条进口道的路线数
+    """
+    return config.get('intersection', {}).get('routes_per_road', 3)
+
+
+def route_approach(car_route, config: Dict[str, Any]) -> np.ndarray:
+    """
+    将路线编号映射为进口道编号, 即 road_length 中的下标
+
+    路线按进口道依次编号: 路线 1..k 属于进口道 0, 路线 k+1..2k 属于进口道 1, 以此类推
+
+    :param car_route: 车辆路线编号(从1开始)
+    :param config: 配置参数
+    :return: 进口道编号数组
+    """
+    road_count = len(config.get('road_length', [154, 145, 154, 145]))
+    route_index = np.asarray(car_route, dtype=int) - 1
+
+    return (route_index // routes_per_road(config)) % road_count
+
+
+def route_length(car_route, config: Dict[str, Any]) -> np.ndarray:
+    """
+    车辆所在进口道的长度
+
+    :param car_route: 车辆路线编号(从1开始)
+    :param config: 配置参数
+    :return: 进口道长度数组
+    """
+    road_length = np.asarray(config.get('road_length', [154, 145, 154, 145]), dtype=float)
+
+    return road_length[route_approach(car_route, config)]
+
+
+def route_movement(car_route, config: Dict[str, Any]) -> np.ndarray:
+    """
+    路线在所属进口道内的转向编号, 0:左转, 1:直行, 2:右转
+
+    :param car_route: 车辆路线编号(从1开始)
+    :param config: 配置参数
+    :return: 转向编号数组
+    """
+    return (np.asarray(car_route, dtype=int) - 1) % routes_per_road(config)
+
+
+def route_zones(car_route, config: Dict[str, Any]) -> np.ndarray:
+    """
+    车辆通过交叉口时占用的冲突区
+
+    交叉口划分为与进口道数量相同的冲突区, 进口道 a 的车辆从冲突区 a 驶入:
+    右转仅占用冲突区 a, 直行占用 a、a+1, 左转占用 a、a+1、a+2(按进口道数取模)
+
+    :param car_route: 车辆路线编号(从1开始)
+    :param config: 配置参数
+    :return: (车辆, 冲突区) 形状的布尔数组
+    """
+    zone_count = len(config.get('road_length', [154, 145, 154, 145]))
+    approach = route_approach(car_route, config)
+
+    # 转向编号越小, 穿越的冲突区越多
+    crossed = routes_per_road(config) - route_movement(car_route, config)
+
+    offset = (np.arange(zone_count)[None, :] - approach[:, None]) % zone_count
+    return offset < crossed[:, None]
+
+
+def vehicle_limits(car_type, config: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """
+    按车辆类型展开每辆车的速度、加速度、车头间距与反应时间
+
+    :param car_type: 车辆类型(0:小汽车, 1:公交车)
+    :param config: 配置参数
+    :return: 以参数名称为键的每车数组
+    """
+    is_bus = np.asarray(car_type, dtype=bool)
+    vehicle_types = config['vehicle_types']
+    constraints = config.get('constraints', {})
+
+    limits = {
+        key: np.where(is_bus,
+                      float(vehicle_types['bus'][key]),
+                      float(vehicle_types['car'][key]))
+        for key in ('v_min', 'v_max', 'a_min', 'a_max')
+    }
+    for key, default in (('vehicle_gap', 0.0), ('reaction_time', 0.0)):
+        values = constraints.get(key, {})
+        limits[key] = np.where(is_bus,
+                               float(values.get('bus', default)),
+                               float(values.get('car', default)))
+
+    return limits
+
+
+def crossing_steps(car_type, config: Dict[str, Any]) -> np.ndarray:
+    """
+    车辆以最高速度通过冲突区所需的时间步数(至少为1)
+
+    :param car_type: 车辆类型(0:小汽车, 1:公交车)
+    :param config: 配置参数
+    :return: 时间步数数组
+    """
+    zone_length = config.get('intersection', {}).get('zone_length', 10)
+    time_step = config.get('time_step', 1)
+    v_max = vehicle_limits(car_type, config)['v_max']
+
+    return np.maximum(1, np.ceil(zone_length / (v_max * time_step))).astype(int)
+
+
+def headway_steps(car_type, config: Dict[str, Any]) -> np.ndarray:
+    """
+    同一进口道后车与前车通过停车线的最小时间步间隔
+
+    由后车的反应时间与以最高速度驶过最小车距所需时间组成
+
+    :param car_type: 后车类型(0:小汽车, 1:公交车)
+    :param config: 配置参数
+    :return: 时间步数数组
+    """
+    limits = vehicle_limits(car_type, config)
+    time_step = config.get('time_step', 1)
+    headway = limits['reaction_time'] + limits['vehicle_gap'] / limits['v_max']
+
+    return np.maximum(1, np.ceil(headway / time_step - 1e-9)).astype(int)
+
+
+def earliest_arrival(car_list,
+                     config: Dict[str, Any],
+                     initial_velocity=None,
+                     initial_position=None) -> np.ndarray:
+    """
+    车辆以最大加速度加速至最高速度时, 最早到达停车线的时刻
+
+    位置按离散运动学 x[t] = x[t-1] + v[t-1] * dt 推进, 与优化模型一致
+
+    :param car_list: 车辆信息列表 [发车时间, 车辆类型, 道路编号]
+    :param config: 配置参数
+    :param initial_velocity: 每辆车在初始时刻的速度, 默认取配置中的initial_velocity
+    :param initial_position: 每辆车在初始时刻已行驶的距离, 默认为0
+    :return: 最早到达时刻数组(全局时间步)
+    """
+    car_array = np.asarray(car_list, dtype=int).reshape(-1, 3)
+    initial_time, car_type, car_route = car_array[:, 0], car_array[:, 1], car_array[:, 2]
+
+    limits = vehicle_limits(car_type, config)
+    time_step = config.get('time_step', 1)
+    if initial_velocity is None:
+        initial_velocity = config.get('initial_velocity', 6)
+    initial_velocity = np.broadcast_to(np.asarray(initial_velocity, dtype=float), initial_time.shape)
+    if initial_position is None:
+        initial_position = 0.0
+    remaining = np.maximum(route_length(car_route, config) - initial_position, 0.0)
+
+    # 加速至最高速度后匀速, 所需步数不超过加速段步数加匀速段步数
+    accelerate = np.ceil(np.maximum(limits['v_max'] - initial_velocity, 0)
+                         / (limits['a_max'] * time_step))
+    horizon = int(np.max(accelerate + np.ceil(remaining / (limits['v_max'] * time_step)),
+                         initial=0)) + 2
+
+    steps = np.arange(horizon)
+    velocity = np.minimum(initial_velocity[:, None]
+                          + limits['a_max'][:, None] * steps[None, :] * time_step,
+                          limits['v_max'][:, None])
+    position = np.concatenate(
+        [np.zeros((len(car_array), 1)), np.cumsum(velocity * time_step, axis=1)[:, :-1]],
+        axis=1
+    )
+
+    return initial_time + np.argmax(position >= remaining[:, None], axis=1)
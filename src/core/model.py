@@ -1,6 +1,18 @@
 import gurobipy
 import numpy as np
-from typing import List, Dict, Any
+import scipy.sparse as sp
+from typing import List, Dict, Any, Optional
+
+from src.core.heuristics import TrajectoryHeuristics
+from src.core.conflicts import build_crossing_constraints, crossing_start, reserved_crossing_mask
+from src.core.backends import add_gurobi_constraints
+from src.core.formulation import variable_bounds, vehicle_constraint_blocks, delay_cost
+from src.core.intersection import route_length
+from src.core.progress import SolverProgress
+
+
+# 模型中按 (车辆, 时间) 组织的变量块
+VARIABLE_BLOCKS = ('x', 'v', 'w', 'theta')
 
 
 class TrafficOptimizationModel:
@@ -20,11 +32,39 @@ class TrafficOptimizationModel:
             'bus': {'v_min': 0, 'v_max': 10, 'a_min': -2, 'a_max': 2}
         })
 
+        # 模型构建方式: 'matrix' 使用矩阵API批量构建, 'loop' 为逐车辆构建
+        self.build_mode = config.get('build_mode', 'matrix')
+        if self.build_mode not in ('matrix', 'loop'):
+            raise ValueError(f"未知的模型构建方式: {self.build_mode}")
+
+        # 模型形式: 'bilinear'(默认)保留 x[t] = x[t-1] + v[t-1]*theta[t-1]*dt 的双线性约束, 需要非凸求解;
+        # 'linear' 位置按 x[t] = x[t-1] + v[t-1]*dt 线性更新, 整体为MILP, 需在配置中显式选择
+        self.formulation = config.get('formulation', 'bilinear')
+        if self.formulation not in ('linear', 'bilinear'):
+            raise ValueError(f"未知的模型形式: {self.formulation}")
+
         # 初始化Gurobi模型
         self.model = gurobipy.Model()
-        self.model.Params.NonConvex = 2
-        self.model.Params.MIPGap = 0.001
-        self.model.Params.TimeLimit = 1500
+        if self.formulation == 'bilinear':
+            self.model.Params.NonConvex = 2
+        self.configure_solver(config.get('solver', {}))
+
+    def configure_solver(self, solver_config: Dict[str, Any]):
+        """
+        按求解器配置设置Gurobi参数与求解过程记录, 复用模型时每次求解前可重新设置
+
+        :param solver_config: 配置中的 solver 部分
+        """
+        self.config = dict(self.config, solver=solver_config)
+        self.model.Params.MIPGap = solver_config.get('mip_gap', 0.001)
+        self.model.Params.TimeLimit = solver_config.get('time_limit', 1500)
+        # 未指定时恢复为0, 由Gurobi自动决定线程数; 参数未变时不重复设置, 避免多余的日志
+        threads = solver_config.get('threads') or 0
+        if self.model.Params.Threads != threads:
+            self.model.Params.Threads = threads
+
+        # 求解过程记录, 每隔 progress_interval 秒记录一次目标值、界与节点数
+        self.progress = SolverProgress(solver_config.get('progress_interval', 1.0))
 
     def create_variables(self, car_count: int):
         """
@@ -32,6 +72,15 @@ class TrafficOptimizationModel:
 
         :param car_count: 车辆数量
         """
+        self.car_count = car_count
+
+        # 结果分析时通过优化器的变量句柄提取解
+        self.model._optimizer = self
+
+        if self.build_mode == 'matrix':
+            self._create_variables_matrix(car_count)
+            return
+
         # 位置变量
         self.x = self.model.addVars(car_count, self.total_time, name='x')
 
@@ -50,7 +99,9 @@ class TrafficOptimizationModel:
                         car_count: int,
                         car_type: List[int],
                         car_route: List[int],
-                        initial_time: List[int]):
+                        initial_time: List[int],
+                        initial_velocity: Optional[List[float]] = None,
+                        initial_position: Optional[List[float]] = None):
         """
         添加约束条件
 
@@ -58,10 +109,39 @@ class TrafficOptimizationModel:
         :param car_type: 车辆类型列表
         :param car_route: 车辆路线列表
         :param initial_time: 车辆初始时间列表
+        :param initial_velocity: 每辆车的初始速度, 默认均取配置中的initial_velocity
+        :param initial_position: 每辆车在初始时间已行驶的距离, 默认为0
         """
+        if initial_velocity is None:
+            initial_velocity = [self.config.get('initial_velocity', 6)] * car_count
+
+        # 交叉口冲突区与车头时距约束
+        conflicts = self.config.get('intersection', {}).get('conflicts', True)
+        if conflicts:
+            self._add_crossing_constraints(car_type, car_route, initial_time,
+                                           initial_velocity, initial_position)
+
+        if initial_position is None:
+            initial_position = [0.0] * car_count
+
+        # 记录车辆信息, 供增量添加车辆时重新生成交叉口约束
+        self.car_array = np.column_stack([initial_time, car_type, car_route]).astype(int).reshape(-1, 3)
+        self.initial_velocity = np.asarray(initial_velocity, dtype=float).reshape(-1)
+        self.initial_position = np.asarray(initial_position, dtype=float).reshape(-1)
+
+        if self.build_mode == 'matrix':
+            self._add_vehicle_blocks(self.car_array, self.initial_velocity, self.initial_position,
+                                     {name: getattr(self, name) for name in VARIABLE_BLOCKS},
+                                     area_link=not conflicts)
+            return
+
+        # 位置运动学约束
+        self._add_kinematic_constraints(car_route, initial_time, initial_position,
+                                        area_link=not conflicts)
+
         # 初始速度约束
         self.model.addConstrs(
-            self.v[c, initial_time[c]] == self.config.get('initial_velocity', 6)
+            self.v[c, initial_time[c]] == initial_velocity[c]
             for c in range(car_count)
         )
 
@@ -92,6 +172,157 @@ class TrafficOptimizationModel:
                 for t in range(initial_time[c] + 1, self.total_time)
             )
 
+    def _add_crossing_constraints(self,
+                                  car_type: List[int],
+                                  car_route: List[int],
+                                  initial_time: List[int],
+                                  initial_velocity: List[float],
+                                  initial_position: Optional[List[float]]):
+        """
+        添加通过时刻变量及交叉口冲突区、车头时距约束
+
+        仅为路线共享冲突区且通过时间窗口重叠的车辆对生成冲突约束,
+        同一进口道仅约束相邻前后车的车头时距, 约束矩阵见 build_crossing_constraints
+
+        :param car_type: 车辆类型列表
+        :param car_route: 车辆路线列表
+        :param initial_time: 车辆初始时间列表
+        :param initial_velocity: 每辆车的初始速度
+        :param initial_position: 每辆车在初始时间已行驶的距离
+        """
+        car_list = np.column_stack([initial_time, car_type, car_route]).astype(int)
+        self.crossing = build_crossing_constraints(car_list, self.config,
+                                                   initial_velocity, initial_position)
+
+        A_x, A_w, A_y = self.crossing['A_x'], self.crossing['A_w'], self.crossing['A_y']
+        # 通过时刻变量在 x/v/w/theta 之后创建, 不影响按块提取解
+        self.cross = self.model.addMVar(A_y.shape[1], vtype=gurobipy.GRB.BINARY, name='cross')
+        self.crossing_constraints = None
+
+        if A_w.shape[0] == 0:
+            return
+
+        if self.build_mode == 'matrix':
+            # 变量块可能多于车辆数(见 ModelTemplate), 约束仅作用于前 len(car_list) 辆车
+            car_count = len(car_list)
+            self.crossing_constraints = self.model.addConstr(
+                A_x @ self.x[:car_count].reshape(-1) + A_w @ self.w[:car_count].reshape(-1)
+                + A_y @ self.cross <= self.crossing['rhs'],
+                name='crossing'
+            )
+        else:
+            variables = list(self.x.values()) + list(self.w.values()) + self.cross.tolist()
+            self.crossing_constraints = self.model.addMConstr(
+                sp.hstack([A_x, A_w, A_y], format='csr'), variables, '<', self.crossing['rhs']
+            )
+
+    def _add_kinematic_constraints(self,
+                                   car_route: List[int],
+                                   initial_time: List[int],
+                                   initial_position: List[float],
+                                   area_link: bool):
+        """
+        逐车辆添加位置更新、进入状态 theta 以及位置与有效区域 w 的关联约束
+
+        车辆进入前位置为0, 进入时位置为 initial_position。未添加交叉口约束时,
+        以道路长度为大M关联位置与有效区域: L * w[c, t] + x[c, t] >= L
+
+        :param car_route: 车辆路线列表
+        :param initial_time: 车辆初始时间列表
+        :param initial_position: 每辆车在初始时间已行驶的距离
+        :param area_link: 是否添加位置与有效区域的关联约束
+        """
+        time_step = self.config.get('time_step', 1)
+        length = route_length(car_route, self.config)
+        initial_time = np.asarray(initial_time, dtype=int).reshape(-1)
+        initial_position = np.asarray(initial_position, dtype=float).reshape(-1)
+
+        for c in range(len(initial_time)):
+            init = initial_time[c]
+
+            # 进入前位置为0, 进入时位置固定
+            self.model.addConstrs(self.x[c, t] == 0 for t in range(init))
+            self.model.addConstr(self.x[c, init] == initial_position[c])
+
+            if self.formulation == 'linear':
+                self.model.addConstrs(self.theta[c, t] == int(t >= init)
+                                      for t in range(self.total_time))
+                self.model.addConstrs(
+                    self.x[c, t] == self.x[c, t - 1] + time_step * self.v[c, t - 1]
+                    for t in range(init + 1, self.total_time)
+                )
+            else:
+                self.model.addConstrs(self.theta[c, t] == 0 for t in range(init))
+                self.model.addConstr(self.theta[c, init] == 1)
+                self.model.addConstrs(self.theta[c, t] >= self.theta[c, t - 1]
+                                      for t in range(1, self.total_time))
+                self.model.addConstrs(
+                    self.x[c, t] == self.x[c, t - 1]
+                    + time_step * self.v[c, t - 1] * self.theta[c, t - 1]
+                    for t in range(1, self.total_time)
+                )
+
+            if area_link:
+                self.model.addConstrs(
+                    length[c] * self.w[c, t] + self.x[c, t] >= length[c]
+                    for t in range(init, self.total_time)
+                )
+
+    def _create_variables_matrix(self, car_count: int):
+        """
+        使用矩阵API批量创建优化变量, 每类变量为 (车辆, 时间) 形状的MVar
+
+        :param car_count: 车辆数量
+        """
+        shape = (car_count, self.total_time)
+
+        self.x = self.model.addMVar(shape, name='x')
+        self.v = self.model.addMVar(shape, name='v')
+        self.w = self.model.addMVar(shape, vtype=gurobipy.GRB.BINARY, name='w')
+        self.theta = self.model.addMVar(shape, vtype=gurobipy.GRB.BINARY, name='theta')
+
+    def _add_vehicle_blocks(self,
+                            car_array: np.ndarray,
+                            initial_velocity: np.ndarray,
+                            initial_position: np.ndarray,
+                            variables: Dict[str, gurobipy.MVar],
+                            area_link: bool):
+        """
+        使用矩阵API为一组车辆设置变量界, 并添加车辆自身的加速度、位置更新与有效区域约束
+
+        变量界与约束块由 variable_bounds 与 vehicle_constraint_blocks 生成, 与
+        build_matrix_problem 交给求解后端的模型相同; 双线性(bilinear)形式另外添加
+        含变量乘积的位置更新约束
+
+        :param car_array: 车辆信息数组 [发车时间, 车辆类型, 道路编号]
+        :param initial_velocity: 每辆车的初始速度
+        :param initial_position: 每辆车在初始时间已行驶的距离
+        :param variables: 这些车辆的 (车辆, 时间) 形状变量块
+        :param area_link: 是否添加位置与有效区域的关联约束
+        """
+        config = dict(self.config, vehicle_types=self.vehicle_types)
+
+        bounds = variable_bounds(car_array, config, initial_velocity, initial_position)
+        for name, (lb, ub) in bounds.items():
+            variables[name].lb = lb
+            variables[name].ub = np.where(np.isinf(ub), gurobipy.GRB.INFINITY, ub)
+
+        for name, blocks, lower, upper in vehicle_constraint_blocks(car_array, config, area_link):
+            add_gurobi_constraints(
+                self.model, name,
+                sp.hstack(list(blocks.values()), format='csr'),
+                gurobipy.hstack([variables[block].reshape(-1) for block in blocks]),
+                lower, upper
+            )
+
+        if self.formulation == 'bilinear':
+            x, v, theta = variables['x'], variables['v'], variables['theta']
+            self.model.addConstr(theta[:, 1:] >= theta[:, :-1], name='theta')
+            self.model.addConstr(
+                x[:, 1:] == x[:, :-1] + self.config.get('time_step', 1) * (v[:, :-1] * theta[:, :-1]),
+                name='kinematics'
+            )
+
     def set_objective(self, car_count: int, car_type: List[int]):
         """
         设置目标函数
@@ -103,6 +334,13 @@ class TrafficOptimizationModel:
         cost_car = self.config.get('cost_car', 1)
         cost_bus = self.config.get('cost_bus', 1)
 
+        if self.build_mode == 'matrix':
+            self.model.setObjective(
+                np.repeat(delay_cost(car_type, self.config), self.total_time) @ self.w.reshape(-1),
+                sense=gurobipy.GRB.MINIMIZE
+            )
+            return
+
         self.model.setObjective(
             gurobipy.quicksum(
                 (cost_car * (1 - car_type[c]) + cost_bus * car_type[c]) * self.w[c, t]
@@ -112,20 +350,239 @@ class TrafficOptimizationModel:
             sense=gurobipy.GRB.MINIMIZE
         )
 
+    def add_vehicle(self, car: List[int]) -> int:
+        """
+        向已构建的模型中追加一辆新到达的车辆, 见 add_vehicles
+
+        :param car: 新车信息 [发车时间, 车辆类型, 道路编号]
+        :return: 新车的编号
+        """
+        return self.add_vehicles([car])[0]
+
+    def add_vehicles(self, cars: List[List[int]]) -> List[int]:
+        """
+        向已构建的模型中追加一批新到达的车辆
+
+        新车的变量追加在已有变量之后, x/v/w/theta 仍为 (车辆, 时间) 形状的MVar;
+        交叉口约束只添加涉及新车的行, 即新车的通过窗口、与其他车辆的冲突对
+        以及与同一进口道前车的车头时距。车辆须按发车时间顺序到达,
+        已有车辆的通过窗口与约束行不受影响。仅支持矩阵构建方式
+
+        :param cars: 按发车时间排序的新车信息 [发车时间, 车辆类型, 道路编号]
+        :return: 新车的编号
+        """
+        if self.build_mode != 'matrix':
+            raise ValueError("增量添加车辆仅支持矩阵构建方式(matrix)")
+
+        new_cars = np.asarray(cars, dtype=int).reshape(-1, 3)
+        initial_time, car_type = new_cars[:, 0], new_cars[:, 1]
+        previous_time = self.car_array[:, 0].max(initial=0)
+        if np.any(np.diff(np.concatenate([[previous_time], initial_time])) < 0):
+            raise ValueError("新车须按发车时间顺序到达, 且不早于已有车辆")
+
+        first = len(self.car_array)
+        count = len(new_cars)
+        initial_velocity = np.full(count, float(self.config.get('initial_velocity', 6)))
+        conflicts = self.config.get('intersection', {}).get('conflicts', True)
+
+        # 为新车的变量块添加约束, 之后再与已有变量块拼接
+        shape = (count, self.total_time)
+        rows = {
+            'x': self.model.addMVar(shape, name=f'x_{first}'),
+            'v': self.model.addMVar(shape, name=f'v_{first}'),
+            'w': self.model.addMVar(shape, vtype=gurobipy.GRB.BINARY, name=f'w_{first}'),
+            'theta': self.model.addMVar(shape, vtype=gurobipy.GRB.BINARY, name=f'theta_{first}')
+        }
+        self._add_vehicle_blocks(new_cars, initial_velocity, np.zeros(count), rows, area_link=not conflicts)
+        for name in VARIABLE_BLOCKS:
+            setattr(self, name, gurobipy.vstack([getattr(self, name), rows[name]]))
+
+        rows['w'].Obj = np.repeat(delay_cost(car_type, self.config)[:, None], self.total_time, axis=1)
+
+        self.car_array = np.vstack([self.car_array, new_cars])
+        self.initial_velocity = np.concatenate([self.initial_velocity, initial_velocity])
+        self.initial_position = np.concatenate([self.initial_position, np.zeros(count)])
+        self.car_count = first + count
+
+        if conflicts:
+            self._append_crossing_constraints(first)
+
+        return list(range(first, first + count))
+
+    def _append_crossing_constraints(self, first: int):
+        """
+        为新车添加通过时刻变量, 并添加交叉口约束中涉及新车的行
+
+        :param first: 第一辆新车的编号
+        """
+        crossing = build_crossing_constraints(self.car_array, self.config,
+                                              self.initial_velocity, self.initial_position)
+        A_x, A_w, A_y = crossing['A_x'], crossing['A_w'], crossing['A_y']
+
+        # 已有车辆的通过变量列保持不变, 新车的列排在最后
+        first_column = crossing['offset'][first]
+        cross = self.model.addMVar(A_y.shape[1] - first_column, vtype=gurobipy.GRB.BINARY,
+                                   name=f'cross_{first}')
+        self.cross = gurobipy.concatenate([self.cross, cross])
+        self.crossing = crossing
+
+        columns = slice(first * self.total_time, None)
+        involved = (A_x[:, columns].getnnz(axis=1) > 0) | (A_w[:, columns].getnnz(axis=1) > 0) \
+            | (A_y[:, first_column:].getnnz(axis=1) > 0)
+        if not involved.any():
+            return
+
+        self.model.addConstr(
+            A_x[involved] @ self.x.reshape(-1) + A_w[involved] @ self.w.reshape(-1)
+            + A_y[involved] @ self.cross <= crossing['rhs'][involved],
+            name=f'crossing_{first}'
+        )
+
+    def commit_trajectories(self, solution: Dict[str, np.ndarray], until: Optional[int] = None):
+        """
+        将已有车辆的轨迹固定为给定的解
+
+        在线控制中, 新车到达时刻之前的轨迹已经执行, 固定后只重新规划之后的时段;
+        until 为None时固定整个时域的轨迹与通过时刻, 重新求解只优化新车
+
+        :param solution: get_solution 的结果, 可包含通过变量的取值 cross
+        :param until: 固定 until 之前的时刻, None 表示固定整个时域
+        """
+        steps = np.arange(self.total_time)
+        committed = steps < (self.total_time if until is None else until)
+
+        for name in VARIABLE_BLOCKS:
+            values = np.asarray(solution[name], dtype=float)
+            if name in ('w', 'theta'):
+                values = np.round(values)
+            self.fix_variables(name, np.where(committed[None, :], values, np.nan))
+
+        if until is None and 'cross' in solution and getattr(self, 'cross', None) is not None:
+            values = np.round(np.asarray(solution['cross'], dtype=float))
+            self.cross[:len(values)].lb = values
+            self.cross[:len(values)].ub = values
+
+    def reserve_crossings(self, reserved_list: List[List[int]], reserved_time: np.ndarray):
+        """
+        禁止与模型外已确定通过时刻的车辆冲突的通过时刻
+
+        滚动时域中已离开窗口的车辆仍可能在下一窗口内占用冲突区, 或约束同一进口道后车的
+        车头时距, 与之冲突的通过变量固定为0, 见 reserved_crossing_mask
+
+        :param reserved_list: 已确定车辆的信息列表 [发车时间, 车辆类型, 道路编号]
+        :param reserved_time: 已确定车辆的通过时刻, 与模型使用同一时间轴
+        """
+        if getattr(self, 'crossing', None) is None or len(reserved_list) == 0:
+            return
+
+        blocked = reserved_crossing_mask(self.car_array, self.crossing, self.config,
+                                         reserved_list, reserved_time)
+        if blocked.any():
+            self.model.update()
+            self.cross.ub = np.where(blocked, 0.0, self.cross.ub)
+
+    def fix_variables(self, name: str, values: np.ndarray):
+        """
+        将指定变量固定为给定取值, NaN 表示该位置保持自由
+
+        :param name: 变量名称 ('x', 'v', 'w', 'theta')
+        :param values: (车辆, 时间) 形状的取值数组
+        """
+        values = np.asarray(values, dtype=float)
+        variables = getattr(self, name)
+
+        if self.build_mode == 'matrix':
+            # 读取变量界之前需要同步Gurobi的延迟更新
+            self.model.update()
+            fixed = ~np.isnan(values)
+            variables.lb = np.where(fixed, values, variables.lb)
+            variables.ub = np.where(fixed, values, variables.ub)
+            return
+
+        for (c, t), value in np.ndenumerate(values):
+            if not np.isnan(value):
+                variables[c, t].lb = value
+                variables[c, t].ub = value
+
+    def set_start(self, solution: Dict[str, np.ndarray]):
+        """
+        设置MIP初始解, NaN 表示该位置不提供初始值
+
+        :param solution: 以变量名称为键的 (车辆, 时间) 形状数组, 可包含每辆车的通过时刻 cross_time
+                         或通过变量的取值 cross
+        """
+        for name in VARIABLE_BLOCKS:
+            if name not in solution:
+                continue
+
+            start = np.asarray(solution[name], dtype=float)
+            start = np.where(np.isnan(start), gurobipy.GRB.UNDEFINED, start)
+            variables = getattr(self, name)
+
+            if self.build_mode == 'matrix':
+                variables.Start = start
+            else:
+                self.model.setAttr('Start', list(variables.values()), start.ravel().tolist())
+
+        # 启发式解给出的通过时刻
+        if 'cross_time' in solution and getattr(self, 'crossing', None) is not None:
+            self.cross.Start = crossing_start(self.crossing, solution['cross_time'])
+
+        # 上一次求解的通过变量取值, 增量添加车辆后新增的通过变量不提供初始值
+        if 'cross' in solution and getattr(self, 'cross', None) is not None:
+            start = np.full(self.cross.shape[0], gurobipy.GRB.UNDEFINED)
+            start[:len(solution['cross'])] = solution['cross']
+            self.cross.Start = start
+
+    def get_solution(self) -> Dict[str, np.ndarray]:
+        """
+        提取当前解中各类变量的取值
+
+        :return: 以变量名称为键的 (车辆, 时间) 形状数组, 模型模板按容量返回全部行
+        """
+        if self.model.SolCount == 0:
+            raise RuntimeError(f"模型无可用解, 求解状态: {self.model.status}")
+
+        solution = {}
+
+        for name in VARIABLE_BLOCKS:
+            variables = getattr(self, name)
+
+            if self.build_mode == 'matrix':
+                solution[name] = np.asarray(variables.X)
+            else:
+                values = self.model.getAttr('X', variables)
+                solution[name] = np.fromiter(values.values(), dtype=float,
+                                             count=len(values)).reshape(-1, self.total_time)
+
+        return solution
+
     def solve(self):
         """
         求解优化模型
+
+        求解过程由 SolverProgress 回调记录, 保存在 model._progress;
+        找到首个可行解(含MIP初始解)的时间保存在 model._first_incumbent_time
+
+        :return: Gurobi模型
         """
-        self.model.optimize()
+        self.progress.start(self.model)
+        self.model.optimize(self.progress)
+        self.progress.finish(self.model)
+        self.model._progress = self.progress
         return self.model
 
 
-def run_traffic_optimization(config: Dict[str, Any]):
+def build_traffic_optimization(config: Dict[str, Any],
+                               start: Optional[Dict[str, np.ndarray]] = None) -> TrafficOptimizationModel:
     """
-    运行交通优化
+    根据配置构建交通优化模型(不求解)
+
+    未给定初始解且配置 solver.warm_start 为 'heuristic' 时, 使用FCFS预约启发式轨迹作为MIP初始解
 
     :param config: 配置参数
-    :return: 优化结果
+    :param start: MIP初始解(如上一次求解的解), 以变量名称为键的 (车辆, 时间) 形状数组
+    :return: 已构建的优化模型
     """
     # 车辆信息生成
     car_list = config.get('car_list', [])
@@ -155,8 +612,24 @@ def run_traffic_optimization(config: Dict[str, Any]):
         car_type=car_type
     )
 
+    # 设置MIP初始解
+    if start is None and config.get('solver', {}).get('warm_start') == 'heuristic':
+        start = TrajectoryHeuristics.fcfs_reservation(car_list, config)
+    if start is not None:
+        optimizer.set_start(start)
+
+    return optimizer
+
+
+def run_traffic_optimization(config: Dict[str, Any]):
+    """
+    运行交通优化
+
+    :param config: 配置参数
+    :return: 优化结果
+    """
     # 求解并返回结果
-    return optimizer.solve()
+    return build_traffic_optimization(config).solve()
 
 
 # 使用示例
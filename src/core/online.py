@@ -0,0 +1,154 @@
+import time
+import logging
+import numpy as np
+from typing import List, Dict, Any, Optional
+
+from src.core.model import TrafficOptimizationModel, build_traffic_optimization, VARIABLE_BLOCKS
+from src.core.conflicts import crossing_start
+
+
+class OnlineOptimizer:
+    def __init__(self, config: Dict[str, Any]):
+        """
+        初始化在线优化器
+
+        车辆逐辆到达, 每次到达时向已有模型追加新车的变量与约束, 固定已执行的轨迹,
+        并以当前解作为MIP初始解重新求解, 而不是从头构建整个模型
+
+        :param config: 模型配置参数
+        """
+        self.config = config
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        online_config = config.get('online', {})
+        self.latency_target = online_config.get('latency_target', 1.0)
+        self.replan = online_config.get('replan', True)
+
+        self.optimizer: Optional[TrafficOptimizationModel] = None
+        self.incumbent: Optional[Dict[str, np.ndarray]] = None
+
+    def on_arrival(self, car: List[int]) -> Dict[str, Any]:
+        """
+        处理一辆车的到达并重新求解
+
+        :param car: 新车信息 [发车时间, 车辆类型, 道路编号]
+        :return: 本次决策的时延、求解状态与目标值
+        """
+        return self.on_arrivals([car])
+
+    def on_arrivals(self, cars: List[List[int]], time_limit: Optional[float] = None) -> Dict[str, Any]:
+        """
+        处理同一批到达的车辆, 全部加入模型后只求解一次
+
+        重新求解的时间上限默认为时延目标减去模型更新已用的时间
+
+        :param cars: 按发车时间排序的新车信息 [发车时间, 车辆类型, 道路编号]
+        :param time_limit: 求解时间上限(秒), 默认由时延目标确定
+        :return: 本次决策的时延、求解状态、目标值以及是否得到可行解
+        """
+        start = time.perf_counter()
+
+        cars = list(cars)
+        arrival_time = int(cars[-1][0])
+        if self.optimizer is None:
+            self.optimizer = build_traffic_optimization(dict(self.config, car_list=cars[:1]))
+            self.optimizer.model.Params.OutputFlag = 0
+            cars = cars[1:]
+        if cars:
+            # 发车时刻之前的轨迹已经执行; 不重新规划时固定已有车辆的全部轨迹
+            if self.incumbent is not None:
+                self.optimizer.commit_trajectories(self._pad_incumbent(),
+                                                   until=cars[0][0] if self.replan else None)
+            self.optimizer.add_vehicles(cars)
+            if self.incumbent is not None:
+                self.optimizer.set_start(self._pad_incumbent())
+
+        model = self.optimizer.model
+        if time_limit is None:
+            time_limit = self.latency_target - (time.perf_counter() - start)
+        model.Params.TimeLimit = max(time_limit, 1e-3)
+        self.optimizer.solve()
+
+        solved = model.SolCount > 0
+        if solved:
+            self.incumbent = self.optimizer.get_solution()
+            if getattr(self.optimizer, 'cross', None) is not None:
+                self.incumbent['cross'] = self.optimizer.cross.X
+        latency = time.perf_counter() - start
+
+        return {
+            'car_count': self.optimizer.car_count,
+            'initial_time': arrival_time,
+            'latency': latency,
+            'within_target': latency <= self.latency_target,
+            'status': model.status,
+            'solved': solved,
+            'objective_value': model.ObjVal if solved else np.nan
+        }
+
+    def adopt_solution(self, solution: Dict[str, np.ndarray]):
+        """
+        以模型之外得到的方案(如启发式回退轨迹)作为当前解, 之后的求解按该方案固定已有车辆的轨迹
+
+        :param solution: 覆盖模型中全部车辆的 x/v/w/theta 数组, 可包含每辆车的通过时刻 cross_time
+        """
+        self.incumbent = {name: np.asarray(solution[name], dtype=float) for name in VARIABLE_BLOCKS}
+        if 'cross_time' in solution and getattr(self.optimizer, 'crossing', None) is not None:
+            self.incumbent['cross'] = crossing_start(self.optimizer.crossing, solution['cross_time'])
+
+    def _pad_incumbent(self) -> Dict[str, np.ndarray]:
+        """
+        将上一次的解扩展到当前车辆数, 尚无解的车辆取NaN
+
+        :return: 可传给 set_start 与 commit_trajectories 的解
+        """
+        start = {}
+        for name in VARIABLE_BLOCKS:
+            values = np.full((self.optimizer.car_count, self.optimizer.total_time), np.nan)
+            values[:len(self.incumbent[name])] = self.incumbent[name]
+            start[name] = values
+        if 'cross' in self.incumbent:
+            start['cross'] = self.incumbent['cross']
+
+        return start
+
+    def replay(self, car_list: List[List[int]]) -> List[Dict[str, Any]]:
+        """
+        按发车时间顺序回放一组车辆的到达
+
+        :param car_list: 车辆信息列表 [发车时间, 车辆类型, 道路编号]
+        :return: 每次到达的决策记录
+        """
+        order = np.argsort([car[0] for car in car_list], kind='stable')
+        decisions = []
+
+        for index in order:
+            decision = self.on_arrival(car_list[index])
+            decisions.append(decision)
+            if not decision['within_target']:
+                self.logger.warning(
+                    f"第 {decision['car_count']} 辆车的决策时延 {decision['latency']:.3f} 秒超出目标"
+                )
+
+        return decisions
+
+    def get_solution(self) -> Dict[str, np.ndarray]:
+        """
+        :return: 按到达顺序排列的各车辆最新轨迹
+        """
+        return self.optimizer.get_solution()
+
+
+def latency_percentiles(latencies, percentiles=(50, 90, 99)) -> Dict[str, float]:
+    """
+    计算决策时延的分位数
+
+    :param latencies: 每次到达的决策时延
+    :param percentiles: 分位点
+    :return: 以 p50 等为键的分位数, 以及最大值 max
+    """
+    latencies = np.asarray(latencies, dtype=float)
+    result = {f'p{p}': float(np.percentile(latencies, p)) for p in percentiles}
+    result['max'] = float(latencies.max())
+
+    return result
@@ -0,0 +1,216 @@
+import gurobipy
+from typing import List, Dict, Any, Optional
+
+
+GRB = gurobipy.GRB
+
+# 较早的 gurobipy 版本没有工作量(work units)的回调字段与模型属性, 此时以求解时间代替
+WORK_CALLBACK = getattr(GRB.Callback, 'WORK', None)
+
+
+class SolverProgress:
+    def __init__(self, interval: float = 1.0):
+        """
+        初始化求解过程记录器, 作为 Gurobi 回调传给 optimize
+
+        按时间间隔记录当前最优目标值、最优界、间隙、已探索节点数与工作量(work units),
+        每次找到新的可行解时额外记录一次; 同时记录预处理删除的行列数等统计量,
+        以及预处理、根节点松弛、根节点割平面与启发式、分支定界各阶段的起止时间
+
+        :param interval: 两次记录之间的最小间隔(秒)
+        """
+        self.interval = interval
+        self.reset()
+
+    def reset(self):
+        """
+        清空已有记录
+        """
+        self.timeline: List[Dict[str, Any]] = []
+        self.presolve: Dict[str, int] = {}
+        self.first_incumbent_time: Optional[float] = None
+        self.presolve_end: Optional[float] = None
+        self.root_end: Optional[float] = None
+        self.branching_start: Optional[float] = None
+        self.end_time: Optional[float] = None
+        self.sense = GRB.MINIMIZE
+        self._last_record = float('-inf')
+
+    def __call__(self, model, where):
+        """
+        Gurobi回调入口
+        """
+        if where == GRB.Callback.PRESOLVE:
+            self.presolve = {
+                'removed_columns': model.cbGet(GRB.Callback.PRE_COLDEL),
+                'removed_rows': model.cbGet(GRB.Callback.PRE_ROWDEL),
+                'changed_senses': model.cbGet(GRB.Callback.PRE_SENCHG),
+                'changed_bounds': model.cbGet(GRB.Callback.PRE_BNDCHG),
+                'changed_coefficients': model.cbGet(GRB.Callback.PRE_COECHG)
+            }
+            return
+
+        if where not in (GRB.Callback.SIMPLEX, GRB.Callback.BARRIER, GRB.Callback.MIP,
+                         GRB.Callback.MIPNODE, GRB.Callback.MIPSOL):
+            return
+
+        runtime = model.cbGet(GRB.Callback.RUNTIME)
+        # MIP初始解可能在预处理之前被接受, 不作为预处理结束的标志
+        if self.presolve_end is None and where != GRB.Callback.MIPSOL:
+            self.presolve_end = runtime
+
+        if where == GRB.Callback.MIPSOL:
+            objective = model.cbGet(GRB.Callback.MIPSOL_OBJ)
+            best = model.cbGet(GRB.Callback.MIPSOL_OBJBST)
+            if self.sense * objective < self.sense * best:
+                best = objective
+            if self.first_incumbent_time is None:
+                self.first_incumbent_time = runtime
+                model._first_incumbent_time = runtime
+            self._record(model, runtime, 'incumbent', best,
+                         model.cbGet(GRB.Callback.MIPSOL_OBJBND),
+                         model.cbGet(GRB.Callback.MIPSOL_NODCNT))
+        elif where == GRB.Callback.MIPNODE:
+            nodes = model.cbGet(GRB.Callback.MIPNODE_NODCNT)
+            if self.root_end is None:
+                self.root_end = runtime
+            self._mark_branching(runtime, nodes)
+        elif where == GRB.Callback.MIP:
+            nodes = model.cbGet(GRB.Callback.MIP_NODCNT)
+            self._mark_branching(runtime, nodes)
+            if runtime - self._last_record >= self.interval:
+                self._record(model, runtime, 'progress',
+                             model.cbGet(GRB.Callback.MIP_OBJBST),
+                             model.cbGet(GRB.Callback.MIP_OBJBND),
+                             nodes)
+
+    def _mark_branching(self, runtime: float, nodes: float):
+        """
+        探索的节点数首次超过根节点时记为进入分支定界
+        """
+        if self.branching_start is None and nodes >= 1:
+            self.branching_start = runtime
+            if self.root_end is None:
+                self.root_end = runtime
+
+    def _record(self, model, runtime: float, event: str, objective: float, bound: float, nodes: float):
+        """
+        追加一条记录, 尚无可行解时目标值与间隙为 None
+        """
+        has_incumbent = abs(objective) < GRB.INFINITY
+        self.timeline.append({
+            'time': float(runtime),
+            'work': float(model.cbGet(WORK_CALLBACK) if WORK_CALLBACK is not None else runtime),
+            'event': event,
+            'objective': float(objective) if has_incumbent else None,
+            'bound': float(bound) if abs(bound) < GRB.INFINITY else None,
+            'gap': _relative_gap(objective, bound) if has_incumbent else None,
+            'nodes': int(nodes)
+        })
+        self._last_record = runtime
+
+    def start(self, model):
+        """
+        求解开始前重置记录
+
+        :param model: Gurobi模型
+        """
+        self.reset()
+        self.sense = model.ModelSense
+        model._first_incumbent_time = None
+
+    def finish(self, model):
+        """
+        求解结束后补充最终状态
+
+        :param model: Gurobi模型
+        """
+        self.end_time = float(model.Runtime)
+        if self.presolve_end is None:
+            self.presolve_end = self.end_time
+
+        final = {
+            'time': self.end_time,
+            'work': _model_work(model),
+            'event': 'final',
+            'objective': None,
+            'bound': None,
+            'gap': None,
+            'nodes': 0
+        }
+        if model.IsMIP:
+            final['nodes'] = int(model.NodeCount)
+            final['bound'] = float(model.ObjBound) if abs(model.ObjBound) < GRB.INFINITY else None
+        if model.SolCount > 0:
+            final['objective'] = float(model.ObjVal)
+            final['gap'] = float(model.MIPGap) if model.IsMIP else 0.0
+        self.timeline.append(final)
+
+    def phase_times(self) -> Dict[str, float]:
+        """
+        各求解阶段的耗时(秒)
+
+        - presolve: 开始到首次进入单纯形法、内点法或MIP回调
+        - root_relaxation: 预处理结束到根节点松弛求解完成
+        - heuristics: 根节点割平面与启发式, 到开始分支为止
+        - branching: 分支定界
+
+        :return: 以阶段名称为键的耗时
+        """
+        end = self.end_time if self.end_time is not None else 0.0
+        presolve_end = self.presolve_end if self.presolve_end is not None else end
+        root_end = self.root_end if self.root_end is not None else end
+        branching_start = self.branching_start if self.branching_start is not None else end
+
+        return {
+            'presolve': presolve_end,
+            'root_relaxation': max(0.0, root_end - presolve_end),
+            'heuristics': max(0.0, branching_start - root_end),
+            'branching': max(0.0, end - branching_start)
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        :return: 阶段耗时、预处理统计、首个可行解时间与最终状态
+        """
+        final = self.timeline[-1] if self.timeline else {}
+        return {
+            'phase_times': self.phase_times(),
+            'presolve': dict(self.presolve),
+            'first_incumbent_time': self.first_incumbent_time,
+            'incumbents': sum(record['event'] == 'incumbent' for record in self.timeline),
+            'nodes': final.get('nodes', 0),
+            'work': final.get('work', 0.0),
+            'final_gap': final.get('gap')
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        :return: 可直接保存为YAML的汇总与逐条记录
+        """
+        return {
+            'summary': self.summary(),
+            'timeline': list(self.timeline)
+        }
+
+
+def _model_work(model) -> float:
+    """
+    求解消耗的工作量, Gurobi 版本不提供 Work 属性时以求解时间代替
+    """
+    try:
+        return float(model.Work)
+    except AttributeError:
+        return float(model.Runtime)
+
+
+def _relative_gap(objective: float, bound: float) -> Optional[float]:
+    """
+    与Gurobi MIPGap 相同定义的相对间隙 |objective - bound| / |objective|
+    """
+    if abs(bound) >= GRB.INFINITY:
+        return None
+    if objective == 0:
+        return 0.0 if bound == 0 else float('inf')
+
+    return float(abs(objective - bound) / abs(objective))
@@ -0,0 +1,285 @@
+import time
+import logging
+import gurobipy
+import numpy as np
+from typing import List, Dict, Any
+
+from src.core.model import TrafficOptimizationModel, VARIABLE_BLOCKS
+from src.core.intersection import route_length
+
+
+class RollingHorizonSolver:
+    def __init__(self, config: Dict[str, Any]):
+        """
+        初始化滚动时域求解器
+
+        每个窗口求解 window 个时间步, 仅提交前 commit 个时间步的结果,
+        下一窗口从已提交轨迹的最后一个时间步出发并以上一窗口的解热启动
+
+        :param config: 模型配置参数
+        """
+        self.config = config
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self.total_time = config.get('total_time', 80)
+
+        rolling_config = config.get('rolling_horizon', {})
+        self.window = rolling_config.get('window', 20)
+        self.commit = rolling_config.get('commit', 10)
+        self.window_time_limit = rolling_config.get('window_time_limit', 60)
+
+        if self.window < 2 or not 1 <= self.commit < self.window:
+            raise ValueError(
+                f"滚动时域参数无效: window={self.window}, commit={self.commit}"
+            )
+
+    def solve(self, car_list: List[List[int]]) -> Dict[str, Any]:
+        """
+        逐窗口求解并拼接为完整时域的轨迹
+
+        :param car_list: 车辆信息列表 [发车时间, 车辆类型, 道路编号]
+        :return: 拼接后的轨迹及求解信息
+        """
+        car_count = len(car_list)
+        car_array = np.asarray(car_list, dtype=int).reshape(car_count, 3)
+        initial_time, car_type, car_route = car_array[:, 0], car_array[:, 1], car_array[:, 2]
+
+        trajectory = {
+            name: np.full((car_count, self.total_time), np.nan)
+            for name in VARIABLE_BLOCKS
+        }
+        retired = np.zeros(car_count, dtype=bool)
+        previous = None
+        windows = []
+        status = gurobipy.GRB.OPTIMAL
+        start_clock = time.perf_counter()
+
+        commit_start = 0
+        while commit_start < self.total_time:
+            # 除首个窗口外, 窗口第0步与上一次提交的最后一步重叠并被固定
+            window_start = max(commit_start - 1, 0)
+            window_end = min(window_start + self.window, self.total_time)
+            commit_end = window_end if window_end == self.total_time \
+                else min(commit_start + self.commit, window_end)
+
+            cars = np.flatnonzero(~retired & (initial_time < window_end))
+            optimizer = self._build_window(
+                cars, car_type, car_route, initial_time,
+                window_start, window_end, commit_start, trajectory
+            )
+
+            # 已离开的车辆可能仍在冲突区内, 其占用延续到本窗口
+            reserved = np.flatnonzero(retired)
+            if len(reserved) > 0:
+                optimizer.reserve_crossings(
+                    car_array[reserved],
+                    self._crossing_times(reserved, initial_time, trajectory) - window_start
+                )
+
+            if previous is not None:
+                optimizer.set_start(
+                    self._shift_solution(previous, cars, window_start, window_end)
+                )
+
+            optimizer.solve()
+
+            windows.append({
+                'start': window_start,
+                'end': window_end,
+                'commit_end': commit_end,
+                'vehicles': len(cars),
+                'status': optimizer.model.status,
+                'runtime': optimizer.model.Runtime
+            })
+
+            if optimizer.model.SolCount == 0:
+                status = optimizer.model.status
+                self.logger.error(
+                    f"窗口 [{window_start}, {window_end}) 无可行解, 求解状态: {status}"
+                )
+                optimizer.model.dispose()
+                break
+
+            if optimizer.model.status != gurobipy.GRB.OPTIMAL:
+                status = optimizer.model.status
+
+            solution = optimizer.get_solution()
+            optimizer.model.dispose()
+
+            # 提交窗口前段的结果
+            local = slice(commit_start - window_start, commit_end - window_start)
+            for name in VARIABLE_BLOCKS:
+                trajectory[name][cars, commit_start:commit_end] = solution[name][:, local]
+
+            self._retire_vehicles(cars, car_route, initial_time, commit_end, trajectory, retired)
+
+            previous = (cars, window_start, solution)
+            commit_start = commit_end
+
+        # 车辆进入路网前的时段不属于任何窗口
+        pre_entry = np.arange(self.total_time)[None, :] < initial_time[:, None]
+        for name in VARIABLE_BLOCKS:
+            trajectory[name][pre_entry & np.isnan(trajectory[name])] = 0.0
+
+        cost = np.where(car_type == 1,
+                        self.config.get('cost_bus', 1),
+                        self.config.get('cost_car', 1))
+
+        return {
+            'status': status,
+            'objective_value': float(np.nansum(cost[:, None] * trajectory['w'])),
+            'solve_time': time.perf_counter() - start_clock,
+            'windows': windows,
+            **trajectory
+        }
+
+    def _build_window(self,
+                      cars: np.ndarray,
+                      car_type: np.ndarray,
+                      car_route: np.ndarray,
+                      initial_time: np.ndarray,
+                      window_start: int,
+                      window_end: int,
+                      commit_start: int,
+                      trajectory: Dict[str, np.ndarray]) -> TrafficOptimizationModel:
+        """
+        构建单个窗口的优化模型
+
+        :param cars: 窗口内车辆的全局编号
+        :param car_type: 车辆类型数组
+        :param car_route: 车辆路线数组
+        :param initial_time: 车辆初始时间数组
+        :param window_start: 窗口起始时间
+        :param window_end: 窗口结束时间(不含)
+        :param commit_start: 本窗口提交段的起始时间
+        :param trajectory: 已提交的轨迹
+        :return: 窗口优化模型
+        """
+        window_config = dict(
+            self.config,
+            total_time=window_end - window_start,
+            solver=dict(self.config.get('solver', {}), time_limit=self.window_time_limit)
+        )
+
+        # 已在前序窗口中进入路网的车辆, 从已提交状态出发
+        carried = (initial_time[cars] <= window_start) & (commit_start > 0)
+        initial_velocity = np.where(
+            carried,
+            trajectory['v'][cars, window_start],
+            self.config.get('initial_velocity', 6)
+        )
+        initial_position = np.where(carried, trajectory['x'][cars, window_start], 0.0)
+
+        optimizer = TrafficOptimizationModel(window_config)
+        optimizer.model.Params.OutputFlag = 0
+        optimizer.create_variables(len(cars))
+        optimizer.add_constraints(
+            car_count=len(cars),
+            car_type=car_type[cars].tolist(),
+            car_route=car_route[cars].tolist(),
+            initial_time=np.maximum(initial_time[cars] - window_start, 0).tolist(),
+            initial_velocity=initial_velocity.tolist(),
+            initial_position=initial_position.tolist()
+        )
+        optimizer.set_objective(len(cars), car_type[cars].tolist())
+
+        if carried.any():
+            for name in VARIABLE_BLOCKS:
+                fixed = np.full((len(cars), window_end - window_start), np.nan)
+                fixed[carried, 0] = trajectory[name][cars[carried], window_start]
+                optimizer.fix_variables(name, fixed)
+
+        return optimizer
+
+    @staticmethod
+    def _shift_solution(previous: tuple,
+                        cars: np.ndarray,
+                        window_start: int,
+                        window_end: int) -> Dict[str, np.ndarray]:
+        """
+        将上一窗口的解平移到当前窗口, 作为热启动初始值
+
+        :param previous: (上一窗口车辆编号, 上一窗口起始时间, 上一窗口的解)
+        :param cars: 当前窗口车辆的全局编号
+        :param window_start: 当前窗口起始时间
+        :param window_end: 当前窗口结束时间(不含)
+        :return: 当前窗口的初始值, 无对应值的位置为 NaN
+        """
+        previous_cars, previous_start, previous_solution = previous
+        previous_end = previous_start + next(iter(previous_solution.values())).shape[1]
+
+        overlap_end = min(previous_end, window_end)
+        shared, current_rows, previous_rows = np.intersect1d(
+            cars, previous_cars, assume_unique=True, return_indices=True
+        )
+
+        start = {}
+        for name, values in previous_solution.items():
+            shifted = np.full((len(cars), window_end - window_start), np.nan)
+            shifted[current_rows, :overlap_end - window_start] = \
+                values[previous_rows, window_start - previous_start:overlap_end - previous_start]
+            start[name] = shifted
+
+        return start
+
+    @staticmethod
+    def _crossing_times(cars: np.ndarray,
+                        initial_time: np.ndarray,
+                        trajectory: Dict[str, np.ndarray]) -> np.ndarray:
+        """
+        已离开车辆的通过时刻, 即进入后首个离开有效区域(w 为0)的时刻, 与模型中通过变量的取值一致
+
+        :param cars: 已离开车辆的全局编号
+        :param initial_time: 车辆初始时间数组
+        :param trajectory: 已提交的轨迹, 离开车辆在离开后的 w 为0
+        :return: 通过时刻数组(全局时间步)
+        """
+        steps = np.arange(trajectory['w'].shape[1])
+        left = (trajectory['w'][cars] < 0.5) & (steps[None, :] >= initial_time[cars, None])
+        return np.argmax(left, axis=1)
+
+    def _retire_vehicles(self,
+                         cars: np.ndarray,
+                         car_route: np.ndarray,
+                         initial_time: np.ndarray,
+                         commit_end: int,
+                         trajectory: Dict[str, np.ndarray],
+                         retired: np.ndarray):
+        """
+        已驶过进口道全长且离开有效区域(w 为0)的车辆不再进入后续窗口
+
+        恰好停在停车线上(x 等于道路长度)但尚未通过的车辆仍留在窗口中, 否则其通过时刻
+        会被提前到离开时刻, 与已预约的冲突区占用重叠。离开的车辆在剩余时段保持离开时的速度匀速行驶, 位置按 x[t] = x[t-1] + v[t-1]*dt 继续推进,
+        拼接后的轨迹在全时域满足运动学关系
+
+        :param cars: 当前窗口车辆的全局编号
+        :param car_route: 车辆路线数组
+        :param initial_time: 车辆初始时间数组
+        :param commit_end: 已提交时段的结束时间(不含)
+        :param trajectory: 已提交的轨迹
+        :param retired: 车辆是否已离开的标记, 原地更新
+        """
+        last = commit_end - 1
+        lengths = route_length(car_route[cars], self.config)
+        leaving = cars[(initial_time[cars] <= last) & (trajectory['x'][cars, last] >= lengths - 1e-6)
+                       & (trajectory['w'][cars, last] < 0.5)]
+        if len(leaving) == 0 or commit_end >= self.total_time:
+            return
+
+        retired[leaving] = True
+        steps = np.arange(1, self.total_time - last) * self.config.get('time_step', 1)
+        velocity = trajectory['v'][leaving, last]
+        trajectory['x'][leaving, commit_end:] = trajectory['x'][leaving, last][:, None] + velocity[:, None] * steps
+        trajectory['v'][leaving, commit_end:] = velocity[:, None]
+        trajectory['theta'][leaving, commit_end:] = trajectory['theta'][leaving, last][:, None]
+        trajectory['w'][leaving, commit_end:] = 0.0
+
+
+def run_rolling_horizon_optimization(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    使用滚动时域方式运行交通优化
+
+    :param config: 配置参数
+    :return: 拼接后的轨迹及求解信息
+    """
+    return RollingHorizonSolver(config).solve(config.get('car_list', []))
@@ -0,0 +1,301 @@
+import json
+import time
+import asyncio
+import logging
+import numpy as np
+from typing import List, Dict, Any, Optional, Tuple
+
+from src.core.model import VARIABLE_BLOCKS
+from src.core.online import OnlineOptimizer
+from src.core.heuristics import TrajectoryHeuristics
+from src.core.simulator import TrajectorySimulator
+
+
+class ControlService:
+    def __init__(self, config: Dict[str, Any]):
+        """
+        初始化实时控制服务
+
+        服务在本机监听TCP连接, 每行一个JSON请求 {"id": ..., "car": [发车时间, 车辆类型, 道路编号]},
+        为每辆车返回一行JSON应答, 包含从发车时刻起的速度曲线。短时间窗口内到达的请求
+        合并为一次求解, 每次求解以 solver 的 TimeLimit 限定时间预算; 预算耗尽仍没有可行解时,
+        在已有车辆的通过时刻之后以FCFS预约启发式轨迹作为回退方案应答。
+        发车时间早于已加入车辆的请求返回 error 字段
+
+        :param config: 模型配置参数
+        """
+        self.config = config
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        service_config = config.get('service', {})
+        self.host = service_config.get('host', '127.0.0.1')
+        self.port = service_config.get('port', 8765)
+        self.batch_window = service_config.get('batch_window', 0.005)
+        self.max_batch = service_config.get('max_batch', 16)
+        self.time_budget = service_config.get('time_budget', 0.05)
+
+        # 应答只发送一次, 已应答车辆的整条轨迹都已确定, 新请求到达时不再重新规划
+        self.online = OnlineOptimizer(dict(config, online=dict(config.get('online', {}), replan=False)))
+        self.simulator = TrajectorySimulator(config)
+        self.car_list: List[List[int]] = []
+        # 已加入车辆当前方案的通过时刻, -1 表示时域内不通过
+        self.cross_time = np.zeros(0)
+        self.queue: Optional[asyncio.Queue] = None
+        self.server: Optional[asyncio.AbstractServer] = None
+        self._batcher: Optional[asyncio.Task] = None
+
+    async def start(self) -> int:
+        """
+        启动监听与批处理任务
+
+        :return: 实际监听的端口, 配置端口为0时由系统分配
+        """
+        self.queue = asyncio.Queue()
+        self._batcher = asyncio.create_task(self._batch_loop())
+        self.server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.logger.info(f"实时控制服务已启动: {self.host}:{self.port}")
+
+        return self.port
+
+    async def close(self):
+        """
+        停止监听并结束批处理任务
+        """
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+
+    async def plan(self, car: List[int]) -> Dict[str, Any]:
+        """
+        提交一辆车的请求并等待其速度曲线
+
+        :param car: 车辆信息 [发车时间, 车辆类型, 道路编号]
+        :return: 应答内容
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put(([int(value) for value in car], future, time.perf_counter()))
+        return await future
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        处理一个连接: 逐行读取请求, 各请求的应答完成后按完成顺序写回
+        """
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                task = asyncio.create_task(self._respond(line, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            writer.close()
+
+    async def _respond(self, line: bytes, writer: asyncio.StreamWriter):
+        """
+        解析单个请求并写回应答, 请求无效或求解出错时返回 error 字段
+        """
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get('id')
+            response = await self.plan(request['car'])
+        except Exception as e:
+            response = {'error': str(e)}
+        response['id'] = request_id
+
+        writer.write((json.dumps(response) + '\n').encode('utf-8'))
+        await writer.drain()
+
+    async def _batch_loop(self):
+        """
+        收集 batch_window 内到达的请求(至多 max_batch 个), 在线程池中合并求解
+        """
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.batch_window
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            cars = [car for car, _, _ in batch]
+            try:
+                plans = await loop.run_in_executor(None, self._plan_batch, cars)
+            except Exception as e:
+                self.logger.error(f"批次求解失败: {e}")
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future, received), plan in zip(batch, plans):
+                if future.done():
+                    continue
+                if isinstance(plan, Exception):
+                    future.set_exception(plan)
+                else:
+                    future.set_result(dict(plan, latency=time.perf_counter() - received))
+
+    def _plan_batch(self, cars: List[List[int]]) -> List[Any]:
+        """
+        将一批车辆按发车时间加入在线模型并求解, 返回与输入顺序一致的速度曲线
+
+        发车时间早于已加入车辆的请求无法插入已执行的轨迹, 对应位置返回 ValueError,
+        不影响同批其他请求。求解出错或失败时保留已有车辆的通过时刻, 只为新车预约启发式轨迹,
+        并将其写入在线模型的当前解, 之后的求解同样固定这些已应答的轨迹
+
+        :param cars: 车辆信息列表
+        :return: 每辆车的应答内容, 被拒绝的请求为异常
+        """
+        committed = self.car_list[-1][0] if self.car_list else -np.inf
+        plans: List[Any] = [
+            ValueError(f"发车时间 {car[0]} 早于已加入车辆的发车时间 {committed}") if car[0] < committed else None
+            for car in cars
+        ]
+        accepted = [index for index, plan in enumerate(plans) if plan is None]
+        if not accepted:
+            return plans
+
+        order = [accepted[i] for i in np.argsort([cars[index][0] for index in accepted], kind='stable')]
+        first = len(self.car_list)
+        try:
+            decision = self.online.on_arrivals([cars[i] for i in order], time_limit=self.time_budget)
+        except Exception as e:
+            self.logger.error(f"批次求解出错: {e}")
+            optimizer = self.online.optimizer
+            decision = {'solved': False, 'status': optimizer.model.status if optimizer is not None else 1}
+
+        # 车辆逐辆加入模型, 出错时只有部分车辆已加入; car_list 与模型中的车辆保持一致
+        added = (self.online.optimizer.car_count if self.online.optimizer is not None else 0) - first
+        for index in order[added:]:
+            plans[index] = RuntimeError(f"车辆 {cars[index]} 未能加入在线模型")
+        order = order[:added]
+        self.car_list.extend(cars[i] for i in order)
+        if not order:
+            return plans
+
+        if decision['solved']:
+            velocity, source = self.online.incumbent['v'], 'optimizer'
+            self.cross_time = self.simulator.crossing_times(self.online.incumbent, self.car_list).astype(float)
+        else:
+            reserved = np.concatenate([self.cross_time, np.full(len(order), np.nan)])
+            heuristic = TrajectoryHeuristics.fcfs_reservation(self.car_list, self.config, reserved=reserved)
+            velocity, source = heuristic['v'], 'heuristic'
+            self.cross_time = heuristic['cross_time'].astype(float)
+            self.logger.warning(f"求解预算 {self.time_budget} 秒内没有可行解, 使用启发式方案")
+
+            # 已有车辆沿用已应答的轨迹, 新车取启发式轨迹
+            incumbent = self.online.incumbent
+            solution = {
+                name: heuristic[name] if incumbent is None
+                else np.vstack([incumbent[name][:first], heuristic[name][first:]])
+                for name in VARIABLE_BLOCKS
+            }
+            self.online.adopt_solution(dict(solution, cross_time=heuristic['cross_time']))
+
+        for position, index in enumerate(order):
+            car_index = first + position
+            initial_time = cars[index][0]
+            plans[index] = {
+                'velocity': velocity[car_index, initial_time:].tolist(),
+                'source': source,
+                'status': int(decision['status']),
+                'batch_size': len(cars)
+            }
+
+        return plans
+
+
+async def request_plans(host: str,
+                        port: int,
+                        car_list: List[List[int]],
+                        interval: float = 0.0) -> List[Dict[str, Any]]:
+    """
+    模拟车辆到达: 通过一个连接按间隔依次发送请求, 收集全部应答
+
+    :param host: 服务地址
+    :param port: 服务端口
+    :param car_list: 按发车时间排序的车辆信息列表
+    :param interval: 相邻两次请求的发送间隔(秒)
+    :return: 按请求顺序排列的应答
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for index, car in enumerate(car_list):
+            writer.write((json.dumps({'id': index, 'car': car}) + '\n').encode('utf-8'))
+            await writer.drain()
+            if interval > 0:
+                await asyncio.sleep(interval)
+
+        responses = {}
+        while len(responses) < len(car_list):
+            line = await reader.readline()
+            if not line:
+                break
+            response = json.loads(line)
+            responses[response['id']] = response
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+    return [responses.get(index) for index in range(len(car_list))]
+
+
+async def simulate_arrivals(config: Dict[str, Any],
+                            car_list: List[List[int]],
+                            interval: float = 0.0) -> Tuple[List[Dict[str, Any]], Dict[str, float]]:
+    """
+    在本机启动控制服务并回放一组车辆到达, 用于端到端测试
+
+    :param config: 模型配置参数, service.port 为0时使用系统分配的端口
+    :param car_list: 车辆信息列表
+    :param interval: 相邻两次请求的发送间隔(秒)
+    :return: (按请求顺序排列的应答, 应答时延的分位数)
+    """
+    from src.core.online import latency_percentiles
+
+    service = ControlService(config)
+    port = await service.start()
+    try:
+        ordered = sorted(car_list, key=lambda car: car[0])
+        responses = await request_plans(service.host, port, ordered, interval)
+    finally:
+        await service.close()
+
+    latencies = [response['latency'] for response in responses if response and 'latency' in response]
+    return responses, latency_percentiles(latencies) if latencies else {}
+
+
+def main():
+    import yaml
+
+    with open('configs/default_config.yaml', 'r') as file:
+        config = yaml.safe_load(file)
+
+    async def serve():
+        service = ControlService(config)
+        await service.start()
+        await service.server.serve_forever()
+
+    asyncio.run(serve())
+
+
+if __name__ == '__main__':
+    main()
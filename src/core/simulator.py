@@ -0,0 +1,214 @@
+import numpy as np
+from typing import List, Dict, Any, Optional, Callable
+
+from src.core.conflicts import approach_successors
+from src.core.intersection import (
+    route_approach,
+    route_length,
+    route_zones,
+    vehicle_limits,
+    crossing_steps,
+    headway_steps
+)
+from src.visualization.performance_metrics import PerformanceAnalyzer
+
+
+# 闭环控制策略: (时刻 t, 各车 t 时刻位置, 各车 t-1 时刻速度) -> 各车 t 时刻的速度变化量
+Policy = Callable[[int, np.ndarray, np.ndarray], np.ndarray]
+
+
+class TrajectorySimulator:
+    def __init__(self, config: Dict[str, Any], tolerance: float = 1e-5):
+        """
+        初始化离散时间轨迹仿真器
+
+        与优化模型采用相同的离散运动学: x[t] = x[t-1] + v[t-1] * dt, 速度变化量
+        v[t] - v[t-1] 限制在 [a_min, a_max], 速度限制在 [v_min, v_max]。所有车辆按
+        时间步同时推进, 不依赖Gurobi, 可用于校验求得的轨迹与评估启发式控制策略
+
+        :param config: 包含 vehicle_types、road_length 与 intersection 的配置
+        :param tolerance: 校验约束时的数值容差
+        """
+        self.config = config
+        self.tolerance = tolerance
+
+        self.total_time = config.get('total_time', 80)
+        self.time_step = config.get('time_step', 1)
+        self.initial_velocity = float(config.get('initial_velocity', 6))
+
+    def simulate(self,
+                 car_list: List[List[int]],
+                 acceleration: Optional[np.ndarray] = None,
+                 policy: Optional[Policy] = None) -> Dict[str, np.ndarray]:
+        """
+        推进全部车辆的轨迹
+
+        车辆在初始时间以初始速度从位置0进入, 之前的状态为0。给定 (车辆, 时间) 形状的
+        速度变化量时按开环执行, 给定策略时每步由策略根据当前状态决定, 两者均缺省时匀速行驶;
+        超出加速度与速度限制的部分被截断。车辆越过停车线(x > L)后离开有效区域,
+        停在停车线上的车辆仍位于有效区域
+
+        :param car_list: 车辆信息列表 [发车时间, 车辆类型, 道路编号]
+        :param acceleration: (车辆, 时间) 形状的速度变化量, t 列作用于 v[t] - v[t-1]
+        :param policy: 闭环控制策略
+        :return: 与 PerformanceAnalyzer.extract_solution 相同格式的 x/v/w/theta 数组
+        """
+        car_array = np.asarray(car_list, dtype=int).reshape(-1, 3)
+        initial_time, car_type, car_route = car_array[:, 0], car_array[:, 1], car_array[:, 2]
+        car_count = len(car_array)
+        limits = vehicle_limits(car_type, self.config)
+
+        x = np.zeros((car_count, self.total_time))
+        v = np.zeros((car_count, self.total_time))
+
+        for t in range(self.total_time):
+            if t > 0:
+                moving = initial_time < t
+                x[:, t] = np.where(moving, x[:, t - 1] + self.time_step * v[:, t - 1], 0.0)
+
+                if policy is not None:
+                    change = np.asarray(policy(t, x[:, t], v[:, t - 1]), dtype=float)
+                elif acceleration is not None:
+                    change = acceleration[:, t]
+                else:
+                    change = np.zeros(car_count)
+                change = np.clip(change, limits['a_min'], limits['a_max'])
+                velocity = np.clip(v[:, t - 1] + change, limits['v_min'], limits['v_max'])
+                v[:, t] = np.where(moving, velocity, 0.0)
+
+            v[initial_time == t, t] = self.initial_velocity
+
+        steps = np.arange(self.total_time)
+        active = steps[None, :] >= initial_time[:, None]
+        length = route_length(car_route, self.config)
+
+        return {
+            'x': x,
+            'v': v,
+            'w': (active & (x <= length[:, None] + self.tolerance)).astype(float),
+            'theta': active.astype(float)
+        }
+
+    def crossing_times(self, solution: Dict[str, np.ndarray], car_list: List[List[int]]) -> np.ndarray:
+        """
+        每辆车越过停车线的时刻, 即进入后首个离开有效区域(w 为0)的时刻
+
+        :param solution: 包含 w 的解数组
+        :param car_list: 车辆信息列表
+        :return: 通过时刻数组, -1 表示时域内未通过
+        """
+        initial_time = np.asarray(car_list, dtype=int).reshape(-1, 3)[:, 0]
+        steps = np.arange(solution['w'].shape[1])
+        left = (np.asarray(solution['w']) < 0.5) & (steps[None, :] >= initial_time[:, None])
+
+        return np.where(left.any(axis=1), left.argmax(axis=1), -1)
+
+    def validate(self, solution: Dict[str, np.ndarray], car_list: List[List[int]]) -> Dict[str, Any]:
+        """
+        校验轨迹是否满足运动学、速度与加速度限制, 以及交叉口安全要求
+
+        - kinematics: 进入后 x[t] != x[t-1] + v[t-1] * dt 的时间步数
+        - velocity / acceleration: 超出车型限制的时间步数(含初始速度)
+        - position: 离开有效区域时仍未到达停车线, 或位于停车线之前却不在有效区域的时间步数
+        - conflict: 同一冲突区同一时刻被多辆车占用的 (冲突区, 时刻) 数
+        - headway: 同一进口道相邻前后车通过时刻间隔不足(或后车先于前车通过)的车辆对数
+
+        模型不约束同一路线的车距, 车距不足只作为参考指标 gap_shortfall 单独给出, 不计入 valid:
+        同一路线相邻前后车均在有效区域内且车距小于后车最小车距的时间步数
+
+        :param solution: 包含 x/v/w 的 (车辆, 时间) 解数组
+        :param car_list: 车辆信息列表 [发车时间, 车辆类型, 道路编号]
+        :return: 各类违反次数、是否全部满足 valid、车距不足的时间步数以及每辆车的通过时刻
+        """
+        car_array = np.asarray(car_list, dtype=int).reshape(-1, 3)
+        initial_time, car_type, car_route = car_array[:, 0], car_array[:, 1], car_array[:, 2]
+        x, v = np.asarray(solution['x'], dtype=float), np.asarray(solution['v'], dtype=float)
+        tol = self.tolerance
+
+        limits = vehicle_limits(car_type, self.config)
+        length = route_length(car_route, self.config)
+        steps = np.arange(x.shape[1])
+        active = steps[None, :] >= initial_time[:, None]
+        moving = active[:, 1:] & (steps[None, 1:] > initial_time[:, None])
+        start = steps[None, :] == initial_time[:, None]
+
+        change = v[:, 1:] - v[:, :-1]
+        in_area = (np.asarray(solution['w']) > 0.5) & active
+        cross_time = self.crossing_times(solution, car_array)
+        crossed = cross_time >= 0
+
+        violations = {
+            'kinematics': int(np.sum(
+                moving & (np.abs(x[:, 1:] - x[:, :-1] - self.time_step * v[:, :-1]) > tol)
+            )),
+            'velocity': int(np.sum(active & (
+                (v < limits['v_min'][:, None] - tol) | (v > limits['v_max'][:, None] + tol)
+            )) + np.sum(start & (np.abs(v - self.initial_velocity) > tol))),
+            'acceleration': int(np.sum(moving & (
+                (change < limits['a_min'][:, None] - tol) | (change > limits['a_max'][:, None] + tol)
+            ))),
+            'position': int(np.sum(active & ~in_area & (x < length[:, None] - tol))
+                            + np.sum(in_area & (x > length[:, None] + tol)))
+        }
+
+        # 冲突区: 通过后 duration 个时间步内占用路线经过的冲突区
+        duration = crossing_steps(car_type, self.config)
+        horizon = x.shape[1] + int(duration.max(initial=1))
+        occupy = np.arange(horizon)
+        occupying = crossed[:, None] & (occupy[None, :] >= cross_time[:, None]) \
+            & (occupy[None, :] < (cross_time + duration)[:, None])
+        zones = route_zones(car_route, self.config)
+        occupancy = zones.T.astype(float) @ occupying.astype(float)
+        violations['conflict'] = int(np.sum(occupancy > 1))
+
+        # 车头时距: 后车通过时前车须已通过至少 headway 个时间步
+        leader, follower = approach_successors(route_approach(car_route, self.config), initial_time)
+        headway = headway_steps(car_type[follower], self.config)
+        follower_crossed = crossed[follower]
+        violations['headway'] = int(np.sum(follower_crossed & (
+            ~crossed[leader] | (cross_time[follower] - cross_time[leader] < headway)
+        )))
+
+        # 车距: 同一路线上前后车同时位于有效区域时保持最小车距
+        leader, follower = approach_successors(car_route, initial_time)
+        gap = x[leader] - x[follower]
+        both = in_area[leader] & in_area[follower]
+        gap_shortfall = int(np.sum(both & (gap < limits['vehicle_gap'][follower][:, None] - tol)))
+
+        return {
+            'valid': not any(violations.values()),
+            'violations': violations,
+            'gap_shortfall': gap_shortfall,
+            'cross_time': cross_time
+        }
+
+    def evaluate(self, solution: Dict[str, np.ndarray], car_list: List[List[int]]) -> Dict[str, Any]:
+        """
+        校验轨迹并计算延误指标
+
+        :param solution: 包含 x/v/w 的 (车辆, 时间) 解数组
+        :param car_list: 车辆信息列表
+        :return: 校验结果与汇总指标(通过车辆数、总延误、平均延误、停车次数、加权在网时间)
+        """
+        car_array = np.asarray(car_list, dtype=int).reshape(-1, 3)
+        result = self.validate(solution, car_array)
+        metrics = PerformanceAnalyzer.calculate_vehicle_metrics(
+            solution, dict(self.config, car_list=car_array)
+        )
+
+        cost = np.where(car_array[:, 1] == 1,
+                        self.config.get('cost_bus', 1),
+                        self.config.get('cost_car', 1))
+        in_area = (np.asarray(solution['w']) > 0.5) \
+            & (np.arange(solution['w'].shape[1])[None, :] >= car_array[:, 0][:, None])
+
+        result.update({
+            'vehicles': int(len(car_array)),
+            'crossed': int(np.sum(result['cross_time'] >= 0)),
+            'objective_value': float(np.sum(cost[:, None] * in_area)),
+            'total_delay': float(metrics['delay'].sum()),
+            'average_delay': float(metrics['delay'].mean()) if len(car_array) else 0.0,
+            'total_stops': int(metrics['stops'].sum())
+        })
+
+        return result
@@ -0,0 +1,190 @@
+import gurobipy
+import numpy as np
+from typing import List, Dict, Any, Optional
+
+from src.core.model import TrafficOptimizationModel
+from src.core.heuristics import TrajectoryHeuristics
+from src.core.formulation import acceleration_difference_matrix, kinematic_matrices
+from src.core.intersection import route_length, vehicle_limits
+from src.visualization.performance_metrics import PerformanceAnalyzer, SOLUTION_BLOCKS
+
+
+class ModelTemplate(TrafficOptimizationModel):
+    def __init__(self, config: Dict[str, Any], capacity: int):
+        """
+        初始化可复用的模型模板
+
+        模板按给定的车辆容量一次性创建 x/v/w/theta 变量、全部时刻的加速度与
+        位置更新约束。场景之间仅车辆的进入时刻、类型与路线不同, 这些差异通过
+        变量界、约束右端项与目标系数写入, 交叉口约束按场景重建。同一模板上
+        依次求解一组场景时无需重新构建模型, 并可沿用Gurobi的求解器状态
+
+        仅支持矩阵构建方式与线性化(linear)模型
+
+        :param config: 模型配置参数
+        :param capacity: 模板可容纳的最大车辆数
+        """
+        super().__init__(config)
+        if self.build_mode != 'matrix' or self.formulation != 'linear':
+            raise ValueError("模型模板仅支持矩阵构建方式(matrix)与线性化(linear)模型")
+
+        self.capacity = capacity
+        self.conflicts = config.get('intersection', {}).get('conflicts', True)
+        self.crossing = None
+        self.cross = None
+        self.crossing_constraints = None
+        self.scenario_count = 0
+
+        self.create_variables(capacity)
+        self.model.ModelSense = gurobipy.GRB.MINIMIZE
+
+        # 以所有车辆均在时刻0进入的结构生成覆盖 t >= 1 全部时刻的约束行,
+        # 车辆进入前的行由变量界(位置、速度为0)满足或按场景放宽右端项
+        initial_time = np.zeros(capacity, dtype=int)
+        v_flat = self.v.reshape(-1)
+
+        difference, self._acceleration_car = acceleration_difference_matrix(initial_time, self.total_time)
+        self._acceleration_time = np.tile(np.arange(1, self.total_time), capacity)
+        self.acceleration_lower = self.model.addMConstr(difference, v_flat, '>',
+                                                        np.zeros(difference.shape[0]))
+        self.acceleration_upper = self.model.addMConstr(difference, v_flat, '<',
+                                                        np.zeros(difference.shape[0]))
+
+        difference, previous = kinematic_matrices(initial_time, self.total_time,
+                                                  config.get('time_step', 1))
+        self.model.addConstr(
+            difference @ self.x.reshape(-1) + previous @ self.v.reshape(-1) == 0,
+            name='kinematics'
+        )
+
+        # 不添加交叉口约束时, 以最长路线长度为系数关联位置与有效区域:
+        # L_max * w + x >= L * active, 每辆车的路线长度只出现在右端项中
+        if not self.conflicts:
+            max_length = float(max(config.get('road_length', [154, 145, 154, 145])))
+            self.area_constraints = self.model.addConstr(
+                max_length * self.w + self.x >= np.zeros((capacity, self.total_time)),
+                name='area'
+            )
+
+    def apply_scenario(self, car_list: List[List[int]]):
+        """
+        将场景的车辆信息写入模板
+
+        前 len(car_list) 个车辆位置对应场景中的车辆, 其余位置的变量固定为0
+
+        :param car_list: 车辆信息列表 [发车时间, 车辆类型, 道路编号]
+        """
+        car_array = np.asarray(car_list, dtype=int).reshape(-1, 3)
+        car_count = len(car_array)
+        if car_count > self.capacity:
+            raise ValueError(f"场景车辆数 {car_count} 超出模板容量 {self.capacity}")
+
+        # 未使用的位置视为在时域末尾之后进入
+        initial_time = np.full(self.capacity, self.total_time)
+        initial_time[:car_count] = car_array[:, 0]
+        car_type = np.zeros(self.capacity, dtype=int)
+        car_type[:car_count] = car_array[:, 1]
+        used = np.arange(self.capacity) < car_count
+
+        limits = vehicle_limits(car_type, self.config)
+        steps = np.arange(self.total_time)
+        active = steps[None, :] >= initial_time[:, None]
+        start = steps[None, :] == initial_time[:, None]
+
+        # 速度上下限与初始速度写入变量界, 进入前速度为0
+        initial_velocity = float(self.config.get('initial_velocity', 6))
+        v_lb = np.where(active, limits['v_min'][:, None], 0.0)
+        v_ub = np.where(active, limits['v_max'][:, None], 0.0)
+        self.v.lb = np.where(start, np.maximum(v_lb, initial_velocity), v_lb)
+        self.v.ub = np.where(start, np.minimum(v_ub, initial_velocity), v_ub)
+
+        # 进入前与进入时位置为0, 进入状态由初始时间确定
+        self.x.lb = np.zeros((self.capacity, self.total_time))
+        self.x.ub = np.where(active & ~start, gurobipy.GRB.INFINITY, 0.0)
+        self.theta.lb = active.astype(float)
+        self.theta.ub = active.astype(float)
+        self.w.ub = np.repeat(used[:, None], self.total_time, axis=1).astype(float)
+
+        # 加速度约束仅在车辆进入后生效; 进入前的行放宽到速度的取值范围,
+        # 避免以无穷大作为右端项
+        entered = self._acceleration_time > initial_time[self._acceleration_car]
+        row_car = self._acceleration_car
+        relaxed = max(float(limits['v_max'].max(initial=0.0)), initial_velocity)
+        self.acceleration_lower.RHS = np.where(entered, limits['a_min'][row_car], -relaxed)
+        self.acceleration_upper.RHS = np.where(entered, limits['a_max'][row_car], relaxed)
+
+        cost = np.where(car_type == 1, self.config.get('cost_bus', 1), self.config.get('cost_car', 1))
+        self.w.Obj = np.where(used[:, None], cost[:, None], 0.0) * np.ones(self.total_time)
+
+        if self.conflicts:
+            self._replace_crossing_constraints(car_array)
+        else:
+            length = np.zeros(self.capacity)
+            length[:car_count] = route_length(car_array[:, 2], self.config)
+            self.area_constraints.RHS = length[:, None] * active
+
+        self.car_count = car_count
+        self.scenario_count += 1
+
+    def _replace_crossing_constraints(self, car_array: np.ndarray):
+        """
+        删除上一场景的通过时刻变量与交叉口约束, 按当前场景重新添加
+
+        :param car_array: (车辆, 3) 形状的车辆信息数组
+        """
+        if self.crossing_constraints is not None:
+            self.model.remove(self.crossing_constraints)
+        if self.cross is not None:
+            self.model.remove(self.cross)
+
+        car_count = len(car_array)
+        self._add_crossing_constraints(
+            car_array[:, 1], car_array[:, 2], car_array[:, 0],
+            [self.config.get('initial_velocity', 6)] * car_count, None
+        )
+
+    def set_start(self, solution: Optional[Dict[str, np.ndarray]]):
+        """
+        设置MIP初始解, 场景车辆之外的位置取0; 为None时清除上一场景的初始解
+
+        :param solution: 以变量名称为键的 (车辆, 时间) 形状数组, 可包含通过时刻 cross_time
+        """
+        if solution is None:
+            for name in SOLUTION_BLOCKS:
+                getattr(self, name).Start = np.full((self.capacity, self.total_time),
+                                                    gurobipy.GRB.UNDEFINED)
+            return
+
+        padded = {}
+        for name in SOLUTION_BLOCKS:
+            if name in solution:
+                values = np.zeros((self.capacity, self.total_time))
+                values[:self.car_count] = solution[name]
+                padded[name] = values
+        if 'cross_time' in solution:
+            padded['cross_time'] = solution['cross_time']
+
+        super().set_start(padded)
+
+    def solve_scenario(self, car_list: List[List[int]]) -> Dict[str, Any]:
+        """
+        写入场景并求解
+
+        配置 solver.warm_start 为 'heuristic' 时使用FCFS预约启发式轨迹作为MIP初始解
+
+        :param car_list: 车辆信息列表 [发车时间, 车辆类型, 道路编号]
+        :return: 与 PerformanceAnalyzer.extract_solution 格式一致、按场景车辆数截取的解
+        """
+        self.apply_scenario(car_list)
+
+        start = None
+        if self.config.get('solver', {}).get('warm_start') == 'heuristic':
+            start = TrajectoryHeuristics.fcfs_reservation(car_list, self.config)
+        self.set_start(start)
+
+        solution = PerformanceAnalyzer.extract_solution(self.solve())
+        for name in SOLUTION_BLOCKS:
+            if name in solution:
+                solution[name] = solution[name][:self.car_count]
+
+        return solution
@@ -0,0 +1,211 @@
+import logging
+import numpy as np
+from scipy import stats
+from typing import Dict, Any, List, Optional, Sequence
+
+from src.experiment.parameter_sweep import ParameterSweep
+
+
+class AdaptiveDensitySweep:
+    def __init__(self,
+                 low: float = 0.1,
+                 high: float = 0.5,
+                 min_spacing: float = 0.05,
+                 metric: str = 'total_delay',
+                 thresholds: Optional[Sequence[float]] = None,
+                 initial_points: int = 5,
+                 refine_tolerance: float = 0.1,
+                 min_replicates: int = 2,
+                 max_replicates: int = 6,
+                 confidence: float = 0.95,
+                 ci_tolerance: float = 0.1,
+                 ci_abs_tolerance: float = 0.0,
+                 max_solves: int = 60,
+                 seed: int = 0):
+        """
+        初始化车流密度的自适应采样
+
+        先在 [low, high] 上取 initial_points 个等距密度点, 每轮根据已有结果决定下一批实验:
+        置信区间过宽的点增加一次重复; 相邻两点的指标均值变化超过指标范围的 refine_tolerance
+        且超出两点置信区间半宽之和, 或均值跨越 thresholds 中的某个阈值时, 在两点中点加密,
+        间距不小于 min_spacing。没有新实验或求解次数达到 max_solves 时停止
+
+        置信区间半宽的容差取 ci_tolerance 倍均值、ci_abs_tolerance 与
+        refine_tolerance 倍指标范围的一半三者中的最大值, 即噪声小于需要分辨的变化即可。
+        各密度点的第 r 次重复使用相同的场景种子, 相邻密度的差值受随机波动的影响较小
+
+        :param low: 密度下限
+        :param high: 密度上限
+        :param min_spacing: 加密后相邻密度点的最小间距
+        :param metric: 性能指标, 嵌套指标以点分隔, 如 equity.travel_time_ratio
+        :param thresholds: 需要定位的指标阈值
+        :param initial_points: 初始密度点数
+        :param refine_tolerance: 触发加密的指标变化(占指标范围的比例)
+        :param min_replicates: 每个密度点的最少重复次数
+        :param max_replicates: 每个密度点的最多重复次数
+        :param confidence: 置信水平
+        :param ci_tolerance: 置信区间半宽相对均值的容差
+        :param ci_abs_tolerance: 置信区间半宽的绝对容差
+        :param max_solves: 求解次数上限
+        :param seed: 场景随机种子
+        """
+        self.low = low
+        self.high = high
+        self.min_spacing = min_spacing
+        self.metric = metric
+        self.thresholds = list(thresholds or [])
+        self.initial_points = max(2, int(initial_points))
+        self.refine_tolerance = refine_tolerance
+        self.min_replicates = max(1, int(min_replicates))
+        self.max_replicates = max(self.min_replicates, int(max_replicates))
+        self.confidence = confidence
+        self.ci_tolerance = ci_tolerance
+        self.ci_abs_tolerance = ci_abs_tolerance
+        self.max_solves = max_solves
+        self.sweep = ParameterSweep(seed=seed)
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        # 每个密度点的指标观测值, 失败的实验记为NaN
+        self.observations: Dict[float, List[float]] = {}
+        self.solves = 0
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'AdaptiveDensitySweep':
+        """
+        根据配置中的 experiments.adaptive 创建自适应采样, 密度范围与最小间距取 experiments.density_range;
+        equity.* 指标未给定阈值时以 1 ± performance_thresholds.equity_factor 为阈值
+
+        :param config: 配置参数
+        :return: 自适应采样
+        """
+        experiments_config = config.get('experiments', {})
+        adaptive_config = experiments_config.get('adaptive') or {}
+        density_range = experiments_config.get('density_range', {'min': 0.1, 'max': 0.5, 'step': 0.05})
+
+        metric = adaptive_config.get('metric', 'total_delay')
+        thresholds = adaptive_config.get('thresholds')
+        if thresholds is None and metric.startswith('equity.'):
+            equity_factor = config.get('performance_thresholds', {}).get('equity_factor', 0.2)
+            thresholds = [1 - equity_factor, 1 + equity_factor]
+
+        return cls(
+            low=density_range['min'],
+            high=density_range['max'],
+            min_spacing=adaptive_config.get('min_spacing', density_range['step']),
+            metric=metric,
+            thresholds=thresholds,
+            initial_points=adaptive_config.get('initial_points', 5),
+            refine_tolerance=adaptive_config.get('refine_tolerance', 0.1),
+            min_replicates=adaptive_config.get('min_replicates', 2),
+            max_replicates=adaptive_config.get('max_replicates', 6),
+            confidence=adaptive_config.get('confidence', 0.95),
+            ci_tolerance=adaptive_config.get('ci_tolerance', 0.1),
+            ci_abs_tolerance=adaptive_config.get('ci_abs_tolerance', 0.0),
+            max_solves=adaptive_config.get('max_solves', 60),
+            seed=adaptive_config.get('seed', 0)
+        )
+
+    def metric_value(self, performance: Dict[str, Any]) -> float:
+        """
+        :param performance: 性能指标
+        :return: 指标值, 缺失或实验失败时为NaN
+        """
+        value = performance
+        for key in self.metric.split('.'):
+            if not isinstance(value, dict) or value.get(key) is None:
+                return np.nan
+            value = value[key]
+
+        return float(value)
+
+    def observe(self, results: Sequence[Dict[str, Any]]):
+        """
+        记录一批实验结果
+
+        :param results: 带有 parameters 的性能指标或失败记录
+        """
+        for performance in results:
+            density = performance['parameters']['density']
+            self.observations.setdefault(density, []).append(self.metric_value(performance))
+            self.solves += 1
+
+    def curve(self) -> List[Dict[str, Any]]:
+        """
+        :return: 按密度排列的各点指标均值、置信区间半宽、有效重复次数与已运行次数
+        """
+        curve = []
+        for density in sorted(self.observations):
+            values = np.asarray(self.observations[density], dtype=float)
+            values = values[~np.isnan(values)]
+            count = len(values)
+            half_width = np.inf
+            if count >= 2:
+                half_width = float(
+                    stats.t.ppf((1 + self.confidence) / 2, count - 1) * values.std(ddof=1) / np.sqrt(count)
+                )
+            curve.append({
+                'density': density,
+                'mean': float(values.mean()) if count else np.nan,
+                'half_width': half_width,
+                'count': count,
+                'attempts': len(self.observations[density])
+            })
+
+        return curve
+
+    def next_tasks(self) -> List[Dict[str, Any]]:
+        """
+        根据已有结果决定下一批实验, 超出求解次数上限的部分按优先级截断:
+        先补充重复, 再按指标变化从大到小加密
+
+        :return: ParameterSweep.tasks 格式的实验, 为空时采样结束
+        """
+        budget = self.max_solves - self.solves
+        if budget <= 0:
+            return []
+
+        if not self.observations:
+            densities = np.linspace(self.low, self.high, self.initial_points)
+            return [
+                self._task(density, replicate)
+                for replicate in range(self.min_replicates)
+                for density in densities
+            ][:budget]
+
+        curve = self.curve()
+        means = np.array([point['mean'] for point in curve])
+        valid = means[~np.isnan(means)]
+        span = float(valid.max() - valid.min()) if len(valid) else 0.0
+
+        tasks = []
+        for point in curve:
+            tolerance = max(self.ci_tolerance * abs(point['mean']) if point['count'] else 0.0,
+                            self.ci_abs_tolerance, self.refine_tolerance * span / 2)
+            if point['attempts'] < self.max_replicates and (
+                    point['count'] < self.min_replicates or point['half_width'] > tolerance
+            ):
+                tasks.append(self._task(point['density'], point['attempts']))
+
+        refinements = []
+        for left, right in zip(curve, curve[1:]):
+            midpoint = round((left['density'] + right['density']) / 2, 10)
+            if midpoint - left['density'] < self.min_spacing - 1e-9 or np.isnan(left['mean'] + right['mean']):
+                continue
+            change = abs(right['mean'] - left['mean'])
+            crosses = any(
+                (left['mean'] - threshold) * (right['mean'] - threshold) < 0 for threshold in self.thresholds
+            )
+            # 只有一次有效重复的点没有置信区间, 不计入噪声
+            noise = sum(point['half_width'] for point in (left, right) if np.isfinite(point['half_width']))
+            significant = change > max(self.refine_tolerance * span, noise)
+            if crosses or significant:
+                refinements.append((not crosses, -change, midpoint))
+
+        for _, _, midpoint in sorted(refinements):
+            tasks.extend(self._task(midpoint, replicate) for replicate in range(self.min_replicates))
+
+        return tasks[:budget]
+
+    def _task(self, density: float, replicate: int) -> Dict[str, Any]:
+        density = round(float(density), 10)
+        return self.sweep.task(f'{density:g}', {'density': density}, replicate)
@@ -1,12 +1,25 @@
 import os
 import yaml
 import logging
-from typing import Dict, Any, List
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple, Iterable, Union, Sequence
+import numpy as np
 import pandas as pd
 
-from src.core.model import run_traffic_optimization
-from src.utils.traffic_generator import TrafficGenerator
-from src.visualization.performance_metrics import PerformanceAnalyzer
+from src.core.model import build_traffic_optimization
+from src.core.backends import solve_with_backend, OPTIMAL
+from src.core.template import ModelTemplate
+from src.core.controllers import run_controller
+from src.experiment.sweep_checkpoint import SweepCheckpoint
+from src.experiment.parameter_sweep import ParameterSweep
+from src.experiment.adaptive_sweep import AdaptiveDensitySweep
+from src.utils.traffic_generator import TrafficGenerator, NO_VEHICLE
+from src.utils.result_cache import ResultCache
+from src.utils.results_store import ResultsStore
+from src.utils.trajectory_archive import TrajectoryArchive
+from src.visualization.performance_metrics import PerformanceAnalyzer, SOLUTION_BLOCKS
 
 
 class ExperimentManager:
@@ -29,6 +42,11 @@ class ExperimentManager:
         # 创建输出目录
         self.create_output_directories()
 
+        # 按列存储的实验结果库与轨迹存档, 每次运行实验时打开
+        self.run_id: Optional[str] = None
+        self.results_store: Optional[ResultsStore] = None
+        self.trajectory_archive: Optional[TrajectoryArchive] = None
+
     def load_config(self, config_path: str):
         """
         加载配置文件
@@ -59,98 +77,624 @@ class ExperimentManager:
 
     def run_density_experiments(
             self,
-            base_density: float = 0.3,
-            num_experiments: int = 6
+            base_density: Optional[float] = None,
+            num_experiments: Optional[int] = None,
+            workers: Optional[int] = None,
+            threads_per_worker: Optional[int] = None,
+            seed: Optional[int] = None,
+            controllers: Optional[Sequence[str]] = None,
+            sweep_dir: Optional[str] = None
     ):
         """
         运行不同车流密度的系列实验
 
-        :param base_density: 基础车流密度
-        :param num_experiments: 实验组数
-        :return: 实验结果列表
+        场景按需逐个生成并转换, 内存占用不随实验组数增长。每个场景依次以各控制策略求解,
+        optimal 表示优化模型, 其余为 fixed_time、actuated、fcfs 等基准控制策略。
+        运行出错的实验以 status 为 Failed 的记录保留在结果中
+
+        给定 sweep_dir 时在该目录写入实验计划并逐个记录完成或失败的实验; 中断后以相同参数与目录
+        再次调用时跳过已完成的实验, 只运行失败或尚未运行的实验, 返回计划中全部实验的结果。
+        未指定的随机种子与控制策略取计划中保存的值, 恢复时生成相同的场景
+
+        :param base_density: 基础车流密度, 默认读取配置 experiments.base_density
+        :param num_experiments: 实验组数, 默认读取配置 experiments.num_experiments
+        :param workers: 并行进程数, 默认读取配置 experiments.parallel.workers
+        :param threads_per_worker: 每个进程的Gurobi线程数, 默认按CPU核数平均分配
+        :param seed: 场景生成的随机种子
+        :param controllers: 控制策略名称列表, 默认读取配置 experiments.controllers
+        :param sweep_dir: 检查点目录, 默认不记录检查点
+        :return: 实验结果列表(按场景与控制策略顺序)
         """
-        results = []
+        experiments_config = self.config.get('experiments', {})
+        if base_density is None:
+            base_density = experiments_config.get('base_density', 0.3)
+        if num_experiments is None:
+            num_experiments = experiments_config.get('num_experiments', 6)
 
-        # 生成车流场景
-        scenarios = TrafficGenerator.generate_experiment_scenarios(
+        results = []
+        checkpoint = None
+        if sweep_dir is not None:
+            checkpoint = SweepCheckpoint(sweep_dir)
+            # 首次运行且未指定随机种子时随机确定种子, 恢复时按计划重新生成相同的场景
+            planned = {
+                'base_density': base_density,
+                'num_experiments': num_experiments,
+                'seed': seed,
+                'controllers': None if controllers is None else list(controllers)
+            }
+            if not os.path.exists(checkpoint.manifest_path):
+                if seed is None:
+                    planned['seed'] = int(np.random.SeedSequence().generate_state(1)[0])
+                planned['controllers'] = list(
+                    controllers or self.config.get('experiments', {}).get('controllers', ['optimal'])
+                )
+                planned['run_id'] = ResultsStore.new_run_id()
+            tasks = [
+                _sweep_task(base_density, exp_index, controller)
+                for exp_index in range(1, num_experiments + 1)
+                for controller in planned['controllers'] or []
+            ]
+            planned = checkpoint.plan(planned, tasks, ResultCache.make_key(self.config, []))
+            base_density, num_experiments = planned['base_density'], planned['num_experiments']
+            seed, controllers = planned['seed'], planned['controllers']
+
+        if controllers is None:
+            controllers = self.config.get('experiments', {}).get('controllers', ['optimal'])
+
+        # 每次调用写入结果库中一个新的运行分区, 轨迹存档以运行编号区分场景;
+        # 从检查点恢复时沿用原运行编号
+        self.run_id = planned['run_id'] if checkpoint is not None else ResultsStore.new_run_id()
+        self.results_store = ResultsStore.from_config(self.config, run_id=self.run_id)
+        self.trajectory_archive = TrajectoryArchive.from_config(self.config)
+        self.logger.info(f"运行编号: {self.run_id}")
+
+        # 逐个生成车流场景
+        scenarios = TrafficGenerator.iter_experiment_scenarios(
             base_density=base_density,
-            num_experiments=num_experiments
+            num_experiments=num_experiments,
+            rng=seed
         )
 
-        for exp_index, scenario in enumerate(scenarios, 1):
-            self.logger.info(f"开始第 {exp_index} 组实验")
+        workers, threads_per_worker = self._resolve_parallelism(workers, threads_per_worker)
+
+        # 准备实验配置
+        def experiments():
+            for exp_index, scenario in enumerate(scenarios, 1):
+                car_list = self._convert_scenario_to_car_list(scenario)
+                for controller in controllers:
+                    task = _sweep_task(base_density, exp_index, controller)
+                    if checkpoint is not None and checkpoint.is_completed(task['id']):
+                        continue
+                    exp_config = self.config.copy()
+                    exp_config['car_list'] = car_list
+                    exp_config['controller'] = controller
+                    if threads_per_worker is not None:
+                        exp_config['solver'] = dict(self.config.get('solver', {}),
+                                                    threads=threads_per_worker)
+                    yield (exp_index, scenario, controller), exp_config
+
+        for (exp_index, scenario, controller), result, error in self._execute_experiments(
+                experiments(), workers
+        ):
+            task = _sweep_task(base_density, exp_index, controller)
+            if error is not None:
+                self.logger.error(f"实验 {exp_index} ({controller}) 失败: {error}")
+                if checkpoint is not None:
+                    checkpoint.record(task, error=error)
+                results.append({
+                    'status': 'Failed',
+                    'controller': controller,
+                    'message': f'{type(error).__name__}: {error}'
+                })
+                continue
+
+            performance, solution = result
+
+            # 保存结果
+            self._save_experiment_results(exp_index, scenario, performance, solution, controller)
+            if self.results_store is not None:
+                self._store_experiment_results(
+                    task['density'], exp_index, scenario, performance, solution, controller
+                )
+
+            if checkpoint is not None:
+                checkpoint.record(task, performance)
+            results.append(performance)
+
+        if checkpoint is not None:
+            return [
+                record.get('performance') or {
+                    'status': 'Failed', 'controller': record['controller'], 'message': record.get('error')
+                }
+                for record in checkpoint.results()
+            ]
 
-            try:
-                # 准备实验配置
-                exp_config = self.config.copy()
-                exp_config['car_list'] = self._convert_scenario_to_car_list(scenario)
+        return results
+
+    def run_parameter_sweep(
+            self,
+            sweep: Optional[ParameterSweep] = None,
+            workers: Optional[int] = None,
+            threads_per_worker: Optional[int] = None,
+            controllers: Optional[Sequence[str]] = None,
+            sweep_dir: Optional[str] = None
+    ):
+        """
+        按参数网格或随机抽样运行系列实验
+
+        每个实验点的每次重复按场景参数(车流密度、各道路密度、公交发车间隔、total_time)与
+        重复序号生成车流场景, 只在配置参数(成本系数、车辆类型限制、求解器参数等)上不同的实验点
+        共用同一场景, 每个场景只生成一次; 其余参数写入该实验点的配置副本。
+        实验依次编号, 各结果带有实验点参数 parameters 与重复序号 replicate。
+        sweep_dir 的含义同 run_density_experiments
+
+        :param sweep: 参数扫描, 默认读取配置 experiments.sweep, 未配置时按 experiments.density_range 扫描车流密度
+        :param workers: 并行进程数, 默认读取配置 experiments.parallel.workers
+        :param threads_per_worker: 每个进程的Gurobi线程数, 默认按CPU核数平均分配
+        :param controllers: 控制策略名称列表, 默认读取配置 experiments.controllers
+        :param sweep_dir: 检查点目录, 默认不记录检查点
+        :return: 实验结果列表(按实验与控制策略顺序)
+        """
+        experiments_config = self.config.get('experiments', {})
+        if sweep is None:
+            sweep = ParameterSweep.from_config(self.config)
+        if controllers is None:
+            controllers = experiments_config.get('controllers', ['optimal'])
+        controllers = list(controllers)
+
+        sweep_tasks = sweep.tasks()
+        planned_tasks = [
+            dict(task, id=f"{task['id']}/{controller}", exp_index=exp_index, controller=controller)
+            for exp_index, task in enumerate(sweep_tasks, 1)
+            for controller in controllers
+        ]
+
+        checkpoint = None
+        self.run_id = ResultsStore.new_run_id()
+        if sweep_dir is not None:
+            checkpoint = SweepCheckpoint(sweep_dir)
+            # 恢复时沿用计划中的运行编号
+            planned = checkpoint.plan(
+                {'sweep': sweep.to_dict(), 'controllers': controllers,
+                 'run_id': None if os.path.exists(checkpoint.manifest_path) else self.run_id},
+                planned_tasks,
+                ResultCache.make_key(self.config, [])
+            )
+            self.run_id = planned['run_id']
+
+        self.results_store = ResultsStore.from_config(self.config, run_id=self.run_id)
+        self.trajectory_archive = TrajectoryArchive.from_config(self.config)
+        if self.trajectory_archive is not None and 'total_time' in set(sweep.grid) | set(sweep.sample):
+            # 轨迹存档的时间步数固定, 扫描 total_time 时改为逐个保存 .npz 文件
+            self.logger.warning("参数扫描改变 total_time, 轨迹解不写入存档")
+            self.trajectory_archive = None
+        self.logger.info(f"运行编号: {self.run_id}, 实验点 {len(sweep_tasks)} 个")
+
+        workers, threads_per_worker = self._resolve_parallelism(workers, threads_per_worker)
+        results = list(self._run_sweep_tasks(
+            sweep, sweep_tasks, controllers, workers, threads_per_worker, checkpoint=checkpoint
+        ))
+
+        if checkpoint is not None:
+            return [
+                record.get('performance') or {
+                    'status': 'Failed', 'controller': record['controller'], 'message': record.get('error'),
+                    'parameters': record['parameters'], 'replicate': record['replicate']
+                }
+                for record in checkpoint.results()
+            ]
+
+        return results
+
+    def run_adaptive_density_sweep(
+            self,
+            sampler: Optional[AdaptiveDensitySweep] = None,
+            controller: str = 'optimal',
+            workers: Optional[int] = None,
+            threads_per_worker: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        自适应地选取车流密度运行系列实验
+
+        每轮由采样器根据已有结果给出一批实验(加密指标变化剧烈或跨越阈值的区间、
+        为置信区间过宽的点增加重复), 同一批实验可并行运行, 结果保存方式同 run_parameter_sweep
+
+        :param sampler: 自适应采样, 默认读取配置 experiments.adaptive
+        :param controller: 控制策略名称
+        :param workers: 并行进程数, 默认读取配置 experiments.parallel.workers
+        :param threads_per_worker: 每个进程的Gurobi线程数, 默认按CPU核数平均分配
+        :return: 包含各密度点指标曲线 curve、全部实验结果 results 与求解次数 solves 的字典
+        """
+        if sampler is None:
+            sampler = AdaptiveDensitySweep.from_config(self.config)
+
+        self.run_id = ResultsStore.new_run_id()
+        self.results_store = ResultsStore.from_config(self.config, run_id=self.run_id)
+        self.trajectory_archive = TrajectoryArchive.from_config(self.config)
+        self.logger.info(f"运行编号: {self.run_id}, 自适应采样指标: {sampler.metric}")
+
+        workers, threads_per_worker = self._resolve_parallelism(workers, threads_per_worker)
+
+        results = []
+        tasks = sampler.next_tasks()
+        while tasks:
+            batch = list(self._run_sweep_tasks(
+                sampler.sweep, tasks, [controller], workers, threads_per_worker,
+                start_index=len(results) + 1
+            ))
+            sampler.observe(batch)
+            results.extend(batch)
+            self.logger.info(f"已求解 {sampler.solves} 次, 密度点 {len(sampler.observations)} 个")
+            tasks = sampler.next_tasks()
+
+        return {'curve': sampler.curve(), 'results': results, 'solves': sampler.solves}
+
+    def _run_sweep_tasks(
+            self,
+            sweep: ParameterSweep,
+            tasks: List[Dict[str, Any]],
+            controllers: Sequence[str],
+            workers: int,
+            threads_per_worker: Optional[int],
+            checkpoint: Optional[SweepCheckpoint] = None,
+            start_index: int = 1
+    ):
+        """
+        运行一批参数扫描实验, 保存结果并逐个返回
+
+        连续且场景相同的实验共用同一场景, 只在场景变化时重新生成
+
+        :param sweep: 生成场景的参数扫描
+        :param tasks: ParameterSweep.tasks 格式的实验
+        :param controllers: 控制策略名称列表
+        :param workers: 并行进程数
+        :param threads_per_worker: 每个进程的Gurobi线程数
+        :param checkpoint: 检查点, 跳过其中已完成的实验并记录新结果
+        :param start_index: 第一个实验的编号
+        :return: 带有 parameters 与 replicate 的性能指标或失败记录的迭代器
+        """
+        base_density = self.config.get('experiments', {}).get('base_density', 0.3)
+
+        def experiments():
+            scenario_key, scenario, car_list = None, None, None
+            for exp_index, task in enumerate(tasks, start_index):
+                pending = [
+                    controller for controller in controllers
+                    if checkpoint is None or not checkpoint.is_completed(f"{task['id']}/{controller}")
+                ]
+                if not pending:
+                    continue
+
+                # 只保留当前场景
+                if sweep.scenario_key(task) != scenario_key:
+                    scenario_key = sweep.scenario_key(task)
+                    scenario = sweep.scenario(task, self.config)
+                    car_list = self._convert_scenario_to_car_list(scenario)
+
+                for controller in pending:
+                    exp_config = ParameterSweep.apply(self.config, task['parameters'])
+                    exp_config['car_list'] = car_list
+                    exp_config['controller'] = controller
+                    if threads_per_worker is not None:
+                        exp_config['solver'] = dict(exp_config.get('solver', {}), threads=threads_per_worker)
+                    yield (exp_index, task, scenario, controller), exp_config
+
+        for (exp_index, task, scenario, controller), result, error in self._execute_experiments(
+                experiments(), workers
+        ):
+            planned_task = dict(task, id=f"{task['id']}/{controller}", exp_index=exp_index, controller=controller)
+            labels = {'parameters': task['parameters'], 'replicate': task['replicate']}
+            if error is not None:
+                self.logger.error(f"实验 {exp_index} {task['parameters']} ({controller}) 失败: {error}")
+                if checkpoint is not None:
+                    checkpoint.record(planned_task, error=error)
+                yield dict(labels, status='Failed', controller=controller,
+                           message=f'{type(error).__name__}: {error}')
+                continue
+
+            performance, solution = result
+            performance.update(labels)
+
+            self._save_experiment_results(exp_index, scenario, performance, solution, controller)
+            if self.results_store is not None:
+                self._store_experiment_results(
+                    task['parameters'].get('density', base_density),
+                    exp_index, scenario, performance, solution, controller,
+                    exp_config=ParameterSweep.apply(self.config, task['parameters'])
+                )
+
+            if checkpoint is not None:
+                checkpoint.record(planned_task, performance)
+            yield performance
+
+    def _resolve_parallelism(
+            self,
+            workers: Optional[int],
+            threads_per_worker: Optional[int]
+    ) -> Tuple[int, Optional[int]]:
+        """
+        确定并行进程数与每个进程的Gurobi线程数, 保证总线程数不超过CPU核数
 
-                # 运行优化模型
-                model_result = run_traffic_optimization(exp_config)
+        :param workers: 并行进程数
+        :param threads_per_worker: 每个进程的Gurobi线程数
+        :return: (并行进程数, 每个进程的线程数), 串行且未指定线程数时后者为None
+        """
+        parallel_config = self.config.get('experiments', {}).get('parallel', {})
+        if workers is None:
+            workers = parallel_config.get('workers', 1)
+        if threads_per_worker is None:
+            threads_per_worker = parallel_config.get('threads_per_worker')
+
+        cpu_count = os.cpu_count() or 1
+        workers = max(1, min(int(workers), cpu_count))
+
+        if workers == 1:
+            return workers, threads_per_worker
+
+        thread_budget = max(1, cpu_count // workers)
+        if threads_per_worker is None:
+            threads_per_worker = thread_budget
+        elif threads_per_worker > thread_budget:
+            self.logger.warning(
+                f"每进程线程数 {threads_per_worker} 超出预算, 调整为 {thread_budget}"
+            )
+            threads_per_worker = thread_budget
 
-                # 分析性能
-                performance = PerformanceAnalyzer.analyze_model_results(model_result)
+        self.logger.info(f"并行运行实验: {workers} 个进程, 每进程 {threads_per_worker} 个线程")
 
-                # 保存结果
-                self._save_experiment_results(exp_index, scenario, performance)
+        return workers, threads_per_worker
 
-                results.append(performance)
+    @staticmethod
+    def _execute_experiments(experiments: Iterable[Tuple[Any, Dict[str, Any]]], workers: int):
+        """
+        运行实验并按场景顺序逐个返回结果, 单个实验失败不影响其他实验
+
+        并行运行时最多同时提交 2 * workers 个实验, 实验按需从输入中读取
 
+        :param experiments: (标签, 实验配置) 的可迭代对象, 标签原样返回
+        :param workers: 并行进程数, 为1时在当前进程中串行运行
+        :return: (标签, (性能指标, 解), 异常) 的迭代器, 成功时异常为None
+        """
+        if workers <= 1:
+            for tag, exp_config in experiments:
+                try:
+                    yield tag, _run_experiment(exp_config), None
+                except Exception as e:
+                    yield tag, None, e
+            return
+
+        def collect(tag, future):
+            try:
+                return tag, future.result(), None
             except Exception as e:
-                self.logger.error(f"实验 {exp_index} 失败: {e}")
+                return tag, None, e
 
-        return results
+        # Gurobi环境不能跨fork共享, 使用spawn启动子进程
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            pending = deque()
+
+            for tag, exp_config in experiments:
+                pending.append((tag, executor.submit(_run_experiment, exp_config)))
+                if len(pending) >= 2 * workers:
+                    yield collect(*pending.popleft())
 
-    def _convert_scenario_to_car_list(self, scenario: pd.DataFrame) -> List[List[int]]:
+            while pending:
+                yield collect(*pending.popleft())
+
+    def _convert_scenario_to_car_list(
+            self,
+            scenario: Union[np.ndarray, pd.DataFrame]
+    ) -> List[List[int]]:
         """
         将场景转换为车辆列表
 
-        :param scenario: 车流场景DataFrame
-        :return: 车辆信息列表
+        :param scenario: (时段, 道路) 形状的车流数组, 或无车辆时段为NaN的DataFrame
+        :return: 车辆信息列表 [发车时间, 车辆类型(0:小汽车, 1:公交车), 道路编号]
         """
-        car_list = []
+        if isinstance(scenario, pd.DataFrame):
+            scenario = scenario.fillna(NO_VEHICLE).to_numpy(dtype=np.int8)
 
-        for road in range(scenario.shape[1]):
-            for time, vehicle_type in enumerate(scenario.iloc[:, road]):
-                if pd.notna(vehicle_type):
-                    car_list.append([
-                        time * 2,  # 发车时间
-                        int(vehicle_type),  # 车辆类型(0:小汽车, 1:公交车)
-                        road + 1  # 道路编号
-                    ])
-
-        return car_list
+        return TrafficGenerator.flows_to_car_list(scenario)
 
     def _save_experiment_results(
             self,
             exp_index: int,
-            scenario: pd.DataFrame,
-            performance: Dict[str, Any]
+            scenario: np.ndarray,
+            performance: Dict[str, Any],
+            solution: Optional[Dict[str, Any]] = None,
+            controller: str = 'optimal'
     ):
         """
         保存实验结果
 
+        性能指标汇总与求解过程记录保存为YAML, 轨迹解数组保存为压缩的 .npz 文件,
+        启用轨迹存档时改为追加到存档, 场景键为 '运行编号/实验编号/控制策略';
+        基准控制策略的结果文件名带有策略名称后缀
+
         :param exp_index: 实验编号
         :param scenario: 车流场景
         :param performance: 性能指标
+        :param solution: 包含解数组的字典
+        :param controller: 控制策略名称
         """
+        suffix = '' if controller == 'optimal' else f'_{controller}'
+
         # 保存车流场景
         scenario_path = os.path.join(
             self.config.get('output_dir', 'outputs'),
             'experiments',
             f'scenario_{exp_index}.csv'
         )
-        scenario.to_csv(scenario_path, index=False)
+        TrafficGenerator.to_dataframe(scenario).to_csv(scenario_path, index=False)
 
         # 保存性能指标
         performance_path = os.path.join(
             self.config.get('output_dir', 'outputs'),
             'experiments',
-            f'performance_{exp_index}.yaml'
+            f'performance_{exp_index}{suffix}.yaml'
         )
         with open(performance_path, 'w') as f:
             yaml.dump(performance, f)
 
+        # 保存求解过程记录
+        if solution is not None and 'progress' in solution:
+            progress_path = os.path.join(
+                self.config.get('output_dir', 'outputs'),
+                'experiments',
+                f'progress_{exp_index}{suffix}.yaml'
+            )
+            with open(progress_path, 'w') as f:
+                yaml.dump(solution['progress'], f, sort_keys=False)
+
+        # 保存轨迹解
+        if solution is not None and 'x' in solution and self.trajectory_archive is not None:
+            self.trajectory_archive.append(
+                solution,
+                self._convert_scenario_to_car_list(scenario),
+                key=f'{self.run_id}/{exp_index}/{controller}'
+            )
+        elif solution is not None and 'x' in solution:
+            solution_path = os.path.join(
+                self.config.get('output_dir', 'outputs'),
+                'experiments',
+                f'solution_{exp_index}{suffix}.npz'
+            )
+            PerformanceAnalyzer.save_solution(solution_path, solution)
+
+    def _store_experiment_results(
+            self,
+            density: float,
+            exp_index: int,
+            scenario: np.ndarray,
+            performance: Dict[str, Any],
+            solution: Optional[Dict[str, Any]] = None,
+            controller: str = 'optimal',
+            exp_config: Optional[Dict[str, Any]] = None
+    ):
+        """
+        将实验汇总与每车指标追加到结果库
+
+        :param density: 实验的车流密度
+        :param exp_index: 实验编号
+        :param scenario: 车流场景
+        :param performance: 性能指标
+        :param solution: 包含解数组的字典
+        :param controller: 控制策略名称
+        :param exp_config: 实验配置, 默认为基础配置
+        """
+        vehicle_metrics, initial_time = None, None
+        if solution is not None and 'w' in solution:
+            car_list = self._convert_scenario_to_car_list(scenario)
+            vehicle_metrics = PerformanceAnalyzer.calculate_vehicle_metrics(
+                solution, dict(exp_config or self.config, car_list=car_list)
+            )
+            initial_time = np.asarray(car_list, dtype=int).reshape(-1, 3)[:, 0]
+
+        self.results_store.append_experiment(
+            density, exp_index, performance,
+            controller=controller,
+            vehicle_metrics=vehicle_metrics,
+            initial_time=initial_time
+        )
+
+
+def _sweep_task(base_density: float, exp_index: int, controller: str) -> Dict[str, Any]:
+    """
+    系列实验计划中的一个实验
+
+    :param base_density: 基础车流密度
+    :param exp_index: 实验编号
+    :param controller: 控制策略名称
+    :return: 包含唯一 id 的实验描述
+    """
+    return {
+        'id': f'{exp_index}/{controller}',
+        'exp_index': exp_index,
+        'controller': controller,
+        'density': TrafficGenerator.experiment_density(base_density, exp_index - 1)
+    }
+
+
+# 每个进程保留最近使用的模型模板, 键为模型相关配置的缓存键
+_TEMPLATES: Dict[str, ModelTemplate] = {}
+
+
+def _get_template(exp_config: Dict[str, Any], car_count: int) -> ModelTemplate:
+    """
+    获取可容纳 car_count 辆车的模型模板, 模型相关配置变化或容量不足时重新构建
+
+    容量不足时按1.5倍扩容, 车流密度递增的实验序列无需每组都重建模板。
+    求解器配置不影响模型结构, 不计入模板的键, 每次取用时按实验配置重新设置
+
+    :param exp_config: 实验配置
+    :param car_count: 场景车辆数
+    :return: 模型模板
+    """
+    key = ResultCache.make_key(dict(exp_config, solver=None), [])
+    template = _TEMPLATES.get(key)
+    if template is not None and template.capacity >= car_count:
+        template.configure_solver(exp_config.get('solver', {}))
+        return template
+
+    capacity = car_count if template is None else max(car_count, int(1.5 * template.capacity))
+    for previous in _TEMPLATES.values():
+        previous.model.dispose()
+    _TEMPLATES.clear()
+    _TEMPLATES[key] = ModelTemplate(exp_config, capacity)
+
+    return _TEMPLATES[key]
+
+
+def _run_experiment(exp_config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    运行单组实验并分析性能, 可在子进程中执行
+
+    启用结果缓存时, 相同配置与车辆列表的场景直接读取已缓存的解, 只缓存求解状态为最优的解;
+    配置 experiments.reuse_model 为 true 时, 同一进程内的场景复用模型模板求解。
+    controller 不是 optimal 时以对应的基准控制策略生成轨迹, 不经过缓存
+
+    :param exp_config: 包含车辆列表与控制策略名称的实验配置
+    :return: (性能指标, 求解信息与解数组)
+    """
+    controller = exp_config.get('controller', 'optimal')
+    if controller != 'optimal':
+        solution = run_controller(controller, exp_config)
+        return PerformanceAnalyzer.analyze_solution(solution, exp_config), solution
+
+    cache = ResultCache.from_config(exp_config)
+    if cache is not None:
+        cache_key = ResultCache.make_key(exp_config, exp_config.get('car_list', []))
+        cached = cache.get(cache_key)
+        if cached is not None:
+            performance = PerformanceAnalyzer.analyze_solution(cached, exp_config)
+            performance['cached'] = True
+            return performance, cached
+
+    # 运行优化模型, 非Gurobi后端由矩阵形式的模型描述求解
+    backend = exp_config.get('solver', {}).get('backend', 'gurobi')
+    if backend == 'gurobi' and exp_config.get('experiments', {}).get('reuse_model', False):
+        car_list = exp_config.get('car_list', [])
+        solution = _get_template(exp_config, len(car_list)).solve_scenario(car_list)
+    elif backend == 'gurobi':
+        model_result = build_traffic_optimization(exp_config).solve()
+        solution = PerformanceAnalyzer.extract_solution(model_result)
+    else:
+        solution = solve_with_backend(exp_config, backend)
+
+    # 达到时间上限等非最优状态的可行解不缓存, 放宽限制后重新求解可得到更好的解
+    if cache is not None and 'x' in solution and solution['status'] == OPTIMAL:
+        cache.put(
+            cache_key,
+            {name: solution[name] for name in SOLUTION_BLOCKS},
+            objective_value=solution['objective_value'],
+            status=solution['status'],
+            solve_time=solution['solve_time']
+        )
+
+    # 分析性能
+    return PerformanceAnalyzer.analyze_solution(solution, exp_config), solution
+
 
 def main():
     # 运行实验管理器示例
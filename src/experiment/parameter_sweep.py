@@ -0,0 +1,223 @@
+import copy
+import itertools
+import numpy as np
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+from src.utils.traffic_generator import TrafficGenerator
+
+
+# 影响车流场景生成的参数, road_density.{i} 为第 i 条道路(从0开始)的密度, scenario_time 为发车时间范围,
+# total_time 同时是配置项, 场景只保留发车时间小于 total_time 的车辆;
+# 其余参数均为以点分隔的配置路径(如 cost_bus、vehicle_types.bus.v_max、solver.mip_gap), 只影响模型与求解
+SCENARIO_PARAMETERS = ('density', 'bus_interval', 'bus_start_time', 'scenario_time', 'total_time')
+ROAD_DENSITY_PREFIX = 'road_density.'
+
+
+class ParameterSweep:
+    def __init__(self,
+                 grid: Optional[Dict[str, Sequence[Any]]] = None,
+                 sample: Optional[Dict[str, Any]] = None,
+                 samples: int = 0,
+                 replicates: int = 1,
+                 seed: int = 0,
+                 num_roads: int = 12):
+        """
+        初始化参数扫描
+
+        实验点为 grid 中各参数取值的笛卡尔积; 给定 sample 时另外随机抽取 samples 组参数,
+        与网格点逐一组合。sample 中每个参数为 [下限, 上限](两端均为整数时抽取整数, 否则均匀抽取实数)
+        或取值列表 {'choices': [...]}。每个实验点重复 replicates 次, 第 r 次重复在所有实验点上
+        使用相同的场景随机种子(公共随机数), 便于比较不同参数
+
+        :param grid: 参数名称到取值列表的映射
+        :param sample: 参数名称到抽样范围的映射
+        :param samples: 随机抽取的参数组数
+        :param replicates: 每个实验点的重复次数
+        :param seed: 抽样与场景生成的随机种子
+        :param num_roads: 道路数量
+        """
+        self.grid = {name: list(values) for name, values in (grid or {}).items()}
+        self.sample = dict(sample or {})
+        self.samples = int(samples) if self.sample else 0
+        self.replicates = max(1, int(replicates))
+        self.seed = int(seed)
+        self.num_roads = num_roads
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'ParameterSweep':
+        """
+        根据配置中的 experiments.sweep 创建参数扫描, 未配置时按 experiments.density_range
+        在各道路统一的车流密度上扫描
+
+        :param config: 配置参数
+        :return: 参数扫描
+        """
+        experiments_config = config.get('experiments', {})
+        sweep_config = experiments_config.get('sweep') or {}
+        grid = sweep_config.get('grid')
+        if not grid and not sweep_config.get('sample'):
+            density_range = experiments_config.get('density_range', {'min': 0.1, 'max': 0.5, 'step': 0.05})
+            grid = {'density': density_values(density_range)}
+
+        return cls(
+            grid=grid,
+            sample=sweep_config.get('sample'),
+            samples=sweep_config.get('samples', 0),
+            replicates=sweep_config.get('replicates', 1),
+            seed=sweep_config.get('seed', 0)
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        :return: 可写入检查点计划的扫描定义
+        """
+        return {
+            'grid': self.grid,
+            'sample': self.sample,
+            'samples': self.samples,
+            'replicates': self.replicates,
+            'seed': self.seed
+        }
+
+    def points(self) -> List[Dict[str, Any]]:
+        """
+        :return: 全部实验点的参数
+        """
+        names = list(self.grid)
+        grid_points = [dict(zip(names, values)) for values in itertools.product(*self.grid.values())]
+        if not self.samples:
+            return grid_points
+
+        rng = np.random.default_rng([self.seed, 1])
+        sampled = [
+            {name: _draw(spec, rng) for name, spec in self.sample.items()}
+            for _ in range(self.samples)
+        ]
+        return [dict(point, **draw) for draw in sampled for point in grid_points]
+
+    def tasks(self) -> List[Dict[str, Any]]:
+        """
+        全部实验, 生成相同场景的实验相邻排列, 运行时每个场景只生成一次
+
+        :return: 包含 id、parameters、replicate 与场景随机种子 seed 的实验列表
+        """
+        tasks = [
+            self.task(str(index), point, replicate)
+            for index, point in enumerate(self.points())
+            for replicate in range(self.replicates)
+        ]
+        order = {}
+        for task in tasks:
+            order.setdefault(self.scenario_key(task), len(order))
+
+        return sorted(tasks, key=lambda task: order[self.scenario_key(task)])
+
+    def task(self, point_id: str, parameters: Dict[str, Any], replicate: int) -> Dict[str, Any]:
+        """
+        :param point_id: 实验点标识
+        :param parameters: 实验点参数
+        :param replicate: 重复序号
+        :return: 实验, id 为 '实验点标识/重复序号'
+        """
+        return {
+            'id': f'{point_id}/{replicate}',
+            'parameters': parameters,
+            'replicate': replicate,
+            'seed': self.replicate_seed(replicate)
+        }
+
+    def replicate_seed(self, replicate: int) -> int:
+        """
+        :param replicate: 重复序号
+        :return: 该次重复的场景随机种子
+        """
+        return int(np.random.SeedSequence([self.seed, replicate]).generate_state(1)[0])
+
+    def scenario_key(self, task: Dict[str, Any]) -> Tuple:
+        """
+        :param task: 实验
+        :return: 决定车流场景的参数取值, 相同时可共用同一场景
+        """
+        parameters = task['parameters']
+        return tuple(sorted(
+            (name, repr(value)) for name, value in parameters.items()
+            if name in SCENARIO_PARAMETERS or name.startswith(ROAD_DENSITY_PREFIX)
+        )) + (('seed', task['seed']),)
+
+    def scenario(self, task: Dict[str, Any], config: Dict[str, Any]) -> np.ndarray:
+        """
+        生成实验的车流场景
+
+        :param task: 实验
+        :param config: 基础配置, 提供未扫描参数的取值
+        :return: (时段, 道路) 形状的车流数组
+        """
+        parameters = task['parameters']
+        density = parameters.get('density', config.get('experiments', {}).get('base_density', 0.3))
+        p_list = [density] * self.num_roads
+        for name, value in parameters.items():
+            if name.startswith(ROAD_DENSITY_PREFIX):
+                p_list[int(name[len(ROAD_DENSITY_PREFIX):])] = value
+
+        flows = TrafficGenerator.generate_vehicle_flows(
+            p_list=p_list,
+            total_time=parameters.get('scenario_time', 50),
+            bus_start_time=parameters.get('bus_start_time', 2),
+            bus_interval=parameters.get('bus_interval', 8),
+            rng=task['seed']
+        )
+
+        # 每个时段2个时间单位, 保留发车时间小于 total_time 的时段;
+        # 随机数按时段顺序生成, 同一种子下较短的场景是较长场景的前若干时段
+        total_time = parameters.get('total_time', config.get('total_time', 80))
+        return flows[:-(-total_time // 2)]
+
+    @staticmethod
+    def apply(config: Dict[str, Any], parameters: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        将实验点的配置参数写入配置副本, 场景参数中只有 total_time 同时是配置项
+
+        :param config: 基础配置
+        :param parameters: 实验点参数
+        :return: 新的配置, 嵌套字典沿路径复制, 不修改原配置
+        """
+        config = dict(config)
+        for name, value in parameters.items():
+            if name in SCENARIO_PARAMETERS and name != 'total_time' or name.startswith(ROAD_DENSITY_PREFIX):
+                continue
+            keys = name.split('.')
+            node = config
+            for key in keys[:-1]:
+                node[key] = copy.copy(node.get(key) or {})
+                node = node[key]
+            node[keys[-1]] = value
+
+        return config
+
+
+def density_values(density_range: Dict[str, float]) -> List[float]:
+    """
+    按 density_range 的 min、max、step 展开车流密度取值(包含两端)
+
+    :param density_range: 车流密度范围
+    :return: 车流密度列表
+    """
+    low, high, step = density_range['min'], density_range['max'], density_range['step']
+    count = int(np.floor((high - low) / step + 1e-9)) + 1
+
+    return [round(low + i * step, 10) for i in range(count)]
+
+
+def _draw(spec: Any, rng: np.random.Generator) -> Any:
+    """
+    按抽样范围抽取一个参数值
+    """
+    if isinstance(spec, dict):
+        choices = spec['choices']
+        return choices[int(rng.integers(len(choices)))]
+
+    low, high = spec
+    if isinstance(low, int) and isinstance(high, int):
+        return int(rng.integers(low, high + 1))
+
+    return float(rng.uniform(low, high))
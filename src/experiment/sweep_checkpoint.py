@@ -0,0 +1,174 @@
+import os
+import json
+import time
+import tempfile
+import logging
+import numpy as np
+from typing import Dict, Any, List, Optional
+
+
+class SweepCheckpoint:
+    COMPLETED = 'completed'
+    FAILED = 'failed'
+
+    def __init__(self, sweep_dir: str):
+        """
+        初始化系列实验的检查点
+
+        manifest.json 记录系列实验的参数与计划的全部实验, records.jsonl 逐行追加每个实验的
+        完成或失败记录, 每条记录写入后立即落盘。重新运行同一目录时跳过已完成的实验,
+        只重新运行失败或尚未运行的实验; 同一实验以最后一条记录为准
+
+        :param sweep_dir: 检查点目录
+        """
+        self.sweep_dir = sweep_dir
+        self.manifest_path = os.path.join(sweep_dir, 'manifest.json')
+        self.records_path = os.path.join(sweep_dir, 'records.jsonl')
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self.manifest: Optional[Dict[str, Any]] = None
+        self.records: Dict[str, Dict[str, Any]] = {}
+
+        os.makedirs(sweep_dir, exist_ok=True)
+
+    def plan(self,
+             parameters: Dict[str, Any],
+             tasks: List[Dict[str, Any]],
+             config_key: str) -> Dict[str, Any]:
+        """
+        写入或校验实验计划
+
+        目录中已有计划时, 给定的非None参数与模型配置须与计划一致, 为None的参数取计划中的值
+
+        :param parameters: 系列实验的参数(车流密度、实验组数、随机种子等)
+        :param tasks: 计划的实验, 每项至少包含唯一的 id
+        :param config_key: 模型相关配置的摘要, 如 ResultCache.make_key(config, [])
+        :return: 计划中的参数
+        """
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, 'r') as f:
+                self.manifest = json.load(f)
+
+            conflicts = [
+                name for name, value in parameters.items()
+                if value is not None and _normalize(value) != self.manifest['parameters'].get(name)
+            ]
+            if self.manifest['config_key'] != config_key:
+                conflicts.append('config')
+            if conflicts:
+                raise ValueError(f"检查点 {self.sweep_dir} 的实验计划与当前参数不一致: {conflicts}")
+
+            self.records = self._load_records()
+            self.logger.info(
+                f"从检查点恢复: 已完成 {len(self.completed_ids())}/{len(self.manifest['tasks'])} 个实验"
+            )
+        else:
+            self.manifest = {
+                'parameters': _normalize(parameters),
+                'config_key': config_key,
+                'tasks': _normalize(tasks),
+                'created_at': time.time()
+            }
+            self._write_manifest()
+
+        return dict(self.manifest['parameters'])
+
+    def _write_manifest(self):
+        """
+        先写临时文件再原子替换实验计划
+        """
+        descriptor, temp_path = tempfile.mkstemp(dir=self.sweep_dir, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'w') as f:
+                json.dump(self.manifest, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.manifest_path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def _load_records(self) -> Dict[str, Dict[str, Any]]:
+        """
+        读取已有记录, 忽略写入中断留下的不完整行
+
+        :return: 以实验 id 为键的最后一条记录
+        """
+        records = {}
+        if not os.path.exists(self.records_path):
+            return records
+
+        with open(self.records_path, 'r') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                records[record['id']] = record
+
+        return records
+
+    def completed_ids(self) -> set:
+        """
+        :return: 已完成实验的 id
+        """
+        return {task_id for task_id, record in self.records.items() if record['status'] == self.COMPLETED}
+
+    def is_completed(self, task_id: str) -> bool:
+        return task_id in self.records and self.records[task_id]['status'] == self.COMPLETED
+
+    def record(self,
+               task: Dict[str, Any],
+               performance: Optional[Dict[str, Any]] = None,
+               error: Optional[BaseException] = None):
+        """
+        追加一个实验的记录并落盘
+
+        抛出异常或没有可行解(性能指标的 status 为 Infeasible)的实验记为失败, 记录异常信息与求解状态码;
+        达到时间上限但已有可行解(status 为 Feasible)的实验记为完成, 同样保留求解状态码
+
+        :param task: 计划中的实验
+        :param performance: 性能指标
+        :param error: 运行实验时抛出的异常
+        :return: 写入的记录
+        """
+        failed = error is not None or performance is None or performance.get('status') == 'Infeasible'
+        record = dict(_normalize(task), status=self.FAILED if failed else self.COMPLETED,
+                      finished_at=time.time())
+        if performance is not None:
+            record['performance'] = _normalize(performance)
+            if 'solver_status' in performance:
+                record['solver_status'] = int(performance['solver_status'])
+        if error is not None:
+            record['error'] = f'{type(error).__name__}: {error}'
+
+        with open(self.records_path, 'a') as f:
+            f.write(json.dumps(record) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        self.records[record['id']] = record
+
+        return record
+
+    def results(self) -> List[Dict[str, Any]]:
+        """
+        :return: 按计划顺序排列的各实验最后一条记录, 尚未运行的实验不包含在内
+        """
+        return [self.records[task['id']] for task in self.manifest['tasks'] if task['id'] in self.records]
+
+
+def _normalize(value):
+    """
+    将 numpy 标量与数组及元组转换为可写入JSON的类型
+    """
+    if isinstance(value, dict):
+        return {str(key): _normalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+
+    return value
@@ -0,0 +1,216 @@
+import os
+import json
+import hashlib
+import logging
+import tempfile
+import numpy as np
+from typing import Dict, Any, List, Optional
+
+
+class ResultCache:
+    # 影响模型结构与最优解的配置项, 作为缓存键的一部分
+    MODEL_CONFIG_KEYS = (
+        'vehicle_types',
+        'total_time',
+        'time_step',
+        'road_length',
+        'intersection',
+        'constraints',
+        'formulation',
+        'initial_velocity',
+        'cost_car',
+        'cost_bus'
+    )
+
+    # 影响求解结果的求解器配置项(求解后端、时间上限、MIP间隙与初始解), 线程数等不改变解的精度要求, 不计入
+    SOLVER_CONFIG_KEYS = (
+        'backend',
+        'time_limit',
+        'mip_gap',
+        'warm_start'
+    )
+
+    def __init__(self,
+                 cache_dir: str = 'outputs/cache',
+                 max_size_mb: float = 1024,
+                 max_entries: Optional[int] = None):
+        """
+        初始化求解结果缓存
+
+        每个场景的解存储为一个压缩的 .npz 文件, 文件修改时间记录最近访问时间,
+        超出容量上限时按最近最少使用(LRU)的顺序淘汰
+
+        :param cache_dir: 缓存目录
+        :param max_size_mb: 缓存总大小上限(MB)
+        :param max_entries: 缓存条目数上限, None 表示不限制
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self.max_entries = max_entries
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> Optional['ResultCache']:
+        """
+        根据配置中的 cache 部分创建缓存
+
+        :param config: 配置参数
+        :return: 结果缓存, 未启用时返回None
+        """
+        cache_config = config.get('cache', {})
+        if not cache_config.get('enabled', False):
+            return None
+
+        return cls(
+            cache_dir=cache_config.get(
+                'dir', os.path.join(config.get('output_dir', 'outputs'), 'cache')
+            ),
+            max_size_mb=cache_config.get('max_size_mb', 1024),
+            max_entries=cache_config.get('max_entries')
+        )
+
+    @classmethod
+    def make_key(cls, config: Dict[str, Any], car_list: List[List[int]]) -> str:
+        """
+        根据模型与求解器相关配置及车辆列表计算稳定的缓存键
+
+        :param config: 配置参数
+        :param car_list: 车辆信息列表
+        :return: 十六进制SHA-256摘要
+        """
+        payload = {key: config.get(key) for key in cls.MODEL_CONFIG_KEYS}
+        solver_config = config.get('solver') or {}
+        payload['solver'] = {key: solver_config.get(key) for key in cls.SOLVER_CONFIG_KEYS}
+        payload['car_list'] = np.asarray(car_list, dtype=int).tolist()
+
+        encoded = json.dumps(payload, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f'{key}.npz')
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        读取缓存的解
+
+        :param key: 缓存键
+        :return: 包含解向量、目标值和求解状态的字典, 未命中时返回None
+        """
+        path = self._entry_path(key)
+
+        try:
+            with np.load(path) as data:
+                entry = {name: data[name] for name in data.files}
+            # 更新访问时间, 用于LRU淘汰
+            os.utime(path)
+        except (FileNotFoundError, OSError, ValueError):
+            return None
+
+        for name in ('objective_value', 'solve_time'):
+            entry[name] = float(entry[name])
+        entry['status'] = int(entry['status'])
+
+        return entry
+
+    def put(self,
+            key: str,
+            solution: Dict[str, np.ndarray],
+            objective_value: float,
+            status: int,
+            solve_time: float = 0.0):
+        """
+        写入一个场景的解, 写入后按容量上限淘汰旧条目
+
+        :param key: 缓存键
+        :param solution: 以变量名称为键的解数组
+        :param objective_value: 目标函数值
+        :param status: Gurobi求解状态
+        :param solve_time: 求解耗时(秒)
+        """
+        # 先写临时文件再原子替换, 并行进程不会读到写了一半的条目
+        descriptor, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'wb') as f:
+                np.savez_compressed(
+                    f,
+                    objective_value=objective_value,
+                    status=status,
+                    solve_time=solve_time,
+                    **solution
+                )
+            os.replace(temp_path, self._entry_path(key))
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        self._evict()
+
+    def invalidate(self, key: str) -> bool:
+        """
+        删除指定缓存条目
+
+        :param key: 缓存键
+        :return: 条目是否存在
+        """
+        try:
+            os.remove(self._entry_path(key))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def clear(self) -> int:
+        """
+        清空全部缓存
+
+        :return: 删除的条目数
+        """
+        removed = 0
+        for path, _, _ in self._entries():
+            try:
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+
+        return removed
+
+    def _entries(self):
+        """
+        列出缓存条目, 按最近访问时间从旧到新排序
+
+        :return: (路径, 访问时间, 文件大小) 列表
+        """
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.npz'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((path, stat.st_mtime, stat.st_size))
+
+        return sorted(entries, key=lambda entry: entry[1])
+
+    def _evict(self):
+        """
+        按LRU顺序淘汰条目, 直到满足大小与条目数上限
+        """
+        entries = self._entries()
+        total_bytes = sum(size for _, _, size in entries)
+
+        while entries and (
+                total_bytes > self.max_bytes
+                or (self.max_entries is not None and len(entries) > self.max_entries)
+        ):
+            path, _, size = entries.pop(0)
+            try:
+                os.remove(path)
+                self.logger.info(f"淘汰缓存条目: {os.path.basename(path)}")
+            except FileNotFoundError:
+                pass
+            total_bytes -= size
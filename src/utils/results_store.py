@@ -0,0 +1,260 @@
+import os
+import json
+import time
+import uuid
+import logging
+import tempfile
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, List, Optional, Sequence
+
+
+# 实验汇总表的列及类型, 每组实验一行; run_id 与 density 为分区列, 保存在目录名中。
+# 求解失败的实验只有状态, 整数列使用可为空的 Int64; parameters 为参数扫描实验点参数的JSON
+EXPERIMENT_COLUMNS = {
+    'exp_index': 'Int64',
+    'controller': 'string',
+    'status': 'string',
+    'objective_value': 'float64',
+    'solve_time': 'float64',
+    'mip_gap': 'float64',
+    'first_incumbent_time': 'float64',
+    'total_vehicles': 'Int64',
+    'total_travel_time': 'float64',
+    'total_delay': 'float64',
+    'average_delay': 'float64',
+    'total_stops': 'Int64',
+    'cached': 'bool',
+    'replicate': 'Int64',
+    'parameters': 'string',
+    'created_at': 'float64'
+}
+
+# 车辆表的列及类型, 每辆车一行
+VEHICLE_COLUMNS = {
+    'exp_index': 'int64',
+    'controller': 'string',
+    'vehicle': 'int64',
+    'initial_time': 'int64',
+    'car_type': 'int64',
+    'car_route': 'int64',
+    'travel_time': 'float64',
+    'free_flow_time': 'float64',
+    'delay': 'float64',
+    'stops': 'int64'
+}
+
+PARTITION_COLUMNS = ('run_id', 'density')
+
+
+class ResultsStore:
+    def __init__(self, root: str = 'outputs/results', run_id: Optional[str] = None, read_only: bool = False):
+        """
+        初始化按列存储的实验结果库
+
+        结果以Parquet文件追加写入, 按 run_id 与车流密度分区:
+        {root}/{table}/run_id=.../density=.../part-....parquet, table 为 experiments
+        (每组实验一行)或 vehicles(每辆车一行)。每次写入生成新文件, 先写临时文件再原子替换,
+        已有文件不会被覆盖, 读取时可按分区裁剪并只读取需要的列
+
+        :param root: 结果库根目录
+        :param run_id: 本次运行的编号, 默认由时间戳与随机后缀生成
+        :param read_only: 只读打开, 用于查询已有结果, 不生成运行编号、不创建目录, 也不能写入
+        """
+        self.root = root
+        self.read_only = read_only
+        self.run_id = None if read_only else run_id or self.new_run_id()
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        if not read_only:
+            os.makedirs(self.root, exist_ok=True)
+
+    @staticmethod
+    def new_run_id() -> str:
+        """
+        :return: 由时间戳与随机后缀组成的运行编号
+        """
+        return f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], run_id: Optional[str] = None) -> Optional['ResultsStore']:
+        """
+        根据配置中的 results_store 部分创建结果库
+
+        :param config: 配置参数
+        :param run_id: 本次运行的编号
+        :return: 结果库, 未启用时返回None
+        """
+        store_config = config.get('results_store', {})
+        if not store_config.get('enabled', True):
+            return None
+
+        return cls(
+            root=store_config.get(
+                'dir', os.path.join(config.get('output_dir', 'outputs'), 'results')
+            ),
+            run_id=run_id
+        )
+
+    def append_experiment(self,
+                          density: float,
+                          exp_index: int,
+                          performance: Dict[str, Any],
+                          controller: str = 'optimal',
+                          vehicle_metrics: Optional[Dict[str, np.ndarray]] = None,
+                          initial_time: Optional[np.ndarray] = None):
+        """
+        追加一组实验的汇总行, 以及可选的车辆表
+
+        :param density: 车流密度(分区值)
+        :param exp_index: 实验编号
+        :param performance: analyze_solution 返回的性能指标
+        :param controller: 控制策略名称
+        :param vehicle_metrics: calculate_vehicle_metrics 返回的每车指标
+        :param initial_time: 每辆车的发车时间
+        """
+        row = {name: performance.get(name) for name in EXPERIMENT_COLUMNS}
+        row.update({
+            'exp_index': exp_index,
+            'controller': controller,
+            'cached': bool(performance.get('cached', False)),
+            'parameters': None if performance.get('parameters') is None
+            else json.dumps(performance['parameters'], sort_keys=True, default=lambda value: value.item()),
+            'created_at': time.time()
+        })
+        self._write('experiments', density, pd.DataFrame([row]), EXPERIMENT_COLUMNS)
+
+        if vehicle_metrics is not None:
+            vehicle_count = len(vehicle_metrics['delay'])
+            vehicles = pd.DataFrame({
+                name: vehicle_metrics[name]
+                for name in ('car_type', 'car_route', 'travel_time', 'free_flow_time', 'delay', 'stops')
+            })
+            vehicles['exp_index'] = exp_index
+            vehicles['controller'] = controller
+            vehicles['vehicle'] = np.arange(vehicle_count)
+            vehicles['initial_time'] = initial_time if initial_time is not None else -1
+            self._write('vehicles', density, vehicles, VEHICLE_COLUMNS)
+
+    def _write(self, table: str, density: float, frame: pd.DataFrame, columns: Dict[str, str]):
+        """
+        将一个数据块写为分区下的新Parquet文件
+
+        :param table: 表名
+        :param density: 车流密度
+        :param frame: 数据块
+        :param columns: 列及类型
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if self.read_only:
+            raise RuntimeError(f"结果库以只读方式打开, 不能写入: {self.root}")
+
+        frame = frame.reindex(columns=list(columns)).astype(columns)
+        partition = os.path.join(
+            self.root, table, f'run_id={self.run_id}', f'density={_format_density(density)}'
+        )
+        os.makedirs(partition, exist_ok=True)
+
+        # 先写临时文件再原子替换, 读取方不会看到写了一半的文件
+        descriptor, temp_path = tempfile.mkstemp(dir=partition, prefix='.', suffix='.tmp')
+        os.close(descriptor)
+        try:
+            pq.write_table(pa.Table.from_pandas(frame, preserve_index=False), temp_path)
+            os.replace(temp_path, os.path.join(partition, f'part-{uuid.uuid4().hex}.parquet'))
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def load_experiments(self,
+                         columns: Optional[Sequence[str]] = None,
+                         run_ids: Optional[Sequence[str]] = None,
+                         densities: Optional[Sequence[float]] = None,
+                         controllers: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        读取实验汇总表
+
+        :param columns: 需要的列(分区列总是包含), 默认全部
+        :param run_ids: 只读取这些运行
+        :param densities: 只读取这些车流密度
+        :param controllers: 只读取这些控制策略
+        :return: 每组实验一行的DataFrame
+        """
+        return self._read('experiments', EXPERIMENT_COLUMNS, columns, run_ids, densities, controllers)
+
+    def load_vehicles(self,
+                      columns: Optional[Sequence[str]] = None,
+                      run_ids: Optional[Sequence[str]] = None,
+                      densities: Optional[Sequence[float]] = None,
+                      controllers: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        读取车辆表, 参数同 load_experiments
+
+        :return: 每辆车一行的DataFrame
+        """
+        return self._read('vehicles', VEHICLE_COLUMNS, columns, run_ids, densities, controllers)
+
+    def _read(self,
+              table: str,
+              schema: Dict[str, str],
+              columns: Optional[Sequence[str]],
+              run_ids: Optional[Sequence[str]],
+              densities: Optional[Sequence[float]],
+              controllers: Optional[Sequence[str]]) -> pd.DataFrame:
+        """
+        按分区与列读取一张表, 分区过滤在读取文件之前完成
+        """
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+
+        selected = list(schema) if columns is None else [name for name in columns if name in schema]
+        path = os.path.join(self.root, table)
+        if not os.path.isdir(path):
+            return pd.DataFrame(columns=list(PARTITION_COLUMNS) + selected)
+
+        # 分区值以字符串读取, 避免不同运行之间推断出的类型不一致
+        partitioning = ds.partitioning(
+            pa.schema([('run_id', pa.string()), ('density', pa.string())]), flavor='hive'
+        )
+        # 显式给出表结构, 较早写入、缺少新增列的文件读出为空值
+        arrow_types = {'Int64': pa.int64(), 'int64': pa.int64(), 'float64': pa.float64(),
+                       'string': pa.string(), 'bool': pa.bool_()}
+        arrow_schema = pa.schema(
+            [(name, arrow_types[dtype]) for name, dtype in schema.items()]
+            + [('run_id', pa.string()), ('density', pa.string())]
+        )
+        dataset = ds.dataset(path, format='parquet', schema=arrow_schema, partitioning=partitioning,
+                             exclude_invalid_files=True, ignore_prefixes=['.'])
+
+        expression = None
+        for name, values in (('run_id', run_ids),
+                             ('density', None if densities is None else [_format_density(d) for d in densities]),
+                             ('controller', controllers)):
+            if values is None:
+                continue
+            condition = ds.field(name).isin(list(values))
+            expression = condition if expression is None else expression & condition
+
+        frame = dataset.to_table(columns=list(PARTITION_COLUMNS) + selected, filter=expression).to_pandas()
+        frame['density'] = frame['density'].astype(float)
+
+        return frame
+
+    def runs(self) -> List[str]:
+        """
+        :return: 结果库中已有的运行编号
+        """
+        path = os.path.join(self.root, 'experiments')
+        if not os.path.isdir(path):
+            return []
+
+        return sorted(name.split('=', 1)[1] for name in os.listdir(path) if name.startswith('run_id='))
+
+
+def _format_density(density: float) -> str:
+    """
+    分区目录名中的车流密度, 保留6位有效数字以消除浮点误差
+    """
+    return f'{float(density):.6g}'
@@ -1,6 +1,10 @@
 import numpy as np
 import pandas as pd
-from typing import List, Optional
+from typing import List, Union, Iterator
+
+
+# 车流数组中表示"该时段无车辆"的标记值
+NO_VEHICLE = -1
 
 
 class TrafficGenerator:
@@ -9,74 +13,142 @@ class TrafficGenerator:
             p_list: List[float],
             total_time: int,
             bus_start_time: int = 2,
-            bus_interval: int = 8
-    ) -> pd.DataFrame:
+            bus_interval: int = 8,
+            rng: Union[np.random.Generator, int, None] = None,
+            as_dataframe: bool = False
+    ) -> Union[np.ndarray, pd.DataFrame]:
         """
         生成多路段车流信息
 
+        每两个时间单位为一个发车时段, 各道路各时段独立按密度概率到达小汽车,
+        公交车按固定间隔发车并覆盖该时段的小汽车
+
         :param p_list: 每条道路的车流密度概率
         :param total_time: 总模拟时间
         :param bus_start_time: 公交车起始时间
         :param bus_interval: 公交车发车间隔
+        :param rng: 随机数生成器或随机种子
+        :param as_dataframe: 是否返回DataFrame(无车辆时段为NaN)
+        :return: (时段, 道路) 形状的int8数组, 0为小汽车, 1为公交车, NO_VEHICLE为无车辆
+        """
+        rng = np.random.default_rng(rng)
+        p_array = np.asarray(p_list, dtype=float)
+        slots = np.arange(int(total_time / 2 + 1))
+
+        # 小汽车到达
+        arrivals = rng.random((len(slots), len(p_array))) < p_array[None, :]
+
+        # 公交车发车时段
+        bus_offset = slots - bus_start_time / 2
+        bus_mask = (bus_offset >= 0) & (np.mod(bus_offset, bus_interval / 2) == 0)
+
+        flows = np.where(
+            bus_mask[:, None],
+            np.int8(1),
+            np.where(arrivals, np.int8(0), np.int8(NO_VEHICLE))
+        ).astype(np.int8)
+
+        if as_dataframe:
+            return TrafficGenerator.to_dataframe(flows)
+
+        return flows
+
+    @staticmethod
+    def to_dataframe(flows: np.ndarray) -> pd.DataFrame:
+        """
+        将车流数组转换为DataFrame, 无车辆的时段记为NaN
+
+        :param flows: (时段, 道路) 形状的车流数组
         :return: 车流信息DataFrame
         """
-        car_information_list = []
-
-        for road_index, p in enumerate(p_list):
-            # 生成小汽车车流
-            car_flow = np.random.binomial(n=1, p=p, size=int(total_time / 2 + 1))
-
-            # 添加公交车
-            for i in range(len(car_flow)):
-                if i < bus_start_time / 2:
-                    if car_flow[i] == 0:
-                        car_flow[i] = None
-                    elif car_flow[i] == 1:
-                        car_flow[i] = 0
-                else:
-                    if (i - bus_start_time / 2) % (bus_interval / 2) == 0:
-                        car_flow[i] = 1
-                    elif car_flow[i] == 0:
-                        car_flow[i] = None
-                    elif car_flow[i] == 1:
-                        car_flow[i] = 0
-
-            car_information_list.append(car_flow)
-
-        return pd.DataFrame(car_information_list).T
+        return pd.DataFrame(np.where(flows == NO_VEHICLE, np.nan, flows))
 
     @staticmethod
-    def generate_experiment_scenarios(
+    def iter_experiment_scenarios(
             base_density: float = 0.3,
             num_experiments: int = 6,
-            time: int = 50
-    ) -> List[pd.DataFrame]:
+            time: int = 50,
+            rng: Union[np.random.Generator, int, None] = None
+    ) -> Iterator[np.ndarray]:
         """
-        生成不同车流密度的实验场景
+        逐个生成不同车流密度的实验场景, 不预先生成全部场景
 
         :param base_density: 基础车流密度
         :param num_experiments: 实验组数
         :param time: 总模拟时间
-        :return: 实验场景列表
+        :param rng: 随机数生成器或随机种子
+        :return: (时段, 道路) 形状车流数组的迭代器
         """
-        scenarios = []
+        rng = np.random.default_rng(rng)
 
         for i in range(num_experiments):
             # 生成基础车流密度列表
             p_list = [base_density] * 12
 
             # 对第一条道路调整车流密度
-            p_list[0] = base_density + 2 * i / 10
+            p_list[0] = TrafficGenerator.experiment_density(base_density, i)
 
             # 生成车流信息
-            scenario = TrafficGenerator.generate_vehicle_flows(
+            yield TrafficGenerator.generate_vehicle_flows(
                 p_list=p_list,
-                total_time=time
+                total_time=time,
+                rng=rng
             )
 
-            scenarios.append(scenario)
+    @staticmethod
+    def experiment_density(base_density: float, index: int) -> float:
+        """
+        第 index 组实验(从0开始)中第一条道路的车流密度, 即该组实验的车流密度标签
 
-        return scenarios
+        :param base_density: 基础车流密度
+        :param index: 实验序号
+        :return: 车流密度
+        """
+        return base_density + 2 * index / 10
+
+    @staticmethod
+    def generate_experiment_scenarios(
+            base_density: float = 0.3,
+            num_experiments: int = 6,
+            time: int = 50,
+            rng: Union[np.random.Generator, int, None] = None
+    ) -> List[pd.DataFrame]:
+        """
+        生成不同车流密度的实验场景
+
+        :param base_density: 基础车流密度
+        :param num_experiments: 实验组数
+        :param time: 总模拟时间
+        :param rng: 随机数生成器或随机种子
+        :return: 实验场景列表
+        """
+        return [
+            TrafficGenerator.to_dataframe(flows)
+            for flows in TrafficGenerator.iter_experiment_scenarios(
+                base_density=base_density,
+                num_experiments=num_experiments,
+                time=time,
+                rng=rng
+            )
+        ]
+
+    @staticmethod
+    def flows_to_car_list(flows: np.ndarray, slot_duration: int = 2) -> List[List[int]]:
+        """
+        将车流数组转换为车辆列表, 按道路、时段顺序排列
+
+        :param flows: (时段, 道路) 形状的车流数组
+        :param slot_duration: 每个发车时段的时间长度
+        :return: 车辆信息列表 [发车时间, 车辆类型(0:小汽车, 1:公交车), 道路编号]
+        """
+        flows = np.asarray(flows)
+        road, slot = np.nonzero(flows.T != NO_VEHICLE)
+
+        return np.column_stack([
+            slot * slot_duration,
+            flows[slot, road],
+            road + 1
+        ]).astype(int).tolist()
 
 
 def main():
@@ -0,0 +1,209 @@
+import os
+import json
+import tempfile
+import numpy as np
+from typing import Dict, Any, List, Optional, Sequence, Iterator, Union
+
+
+# 各变量块的存储类型: 连续变量为 float32, 0-1 变量为 int8, 与 PerformanceAnalyzer.save_solution 一致
+BLOCK_DTYPES = {
+    'x': np.float32,
+    'v': np.float32,
+    'w': np.int8,
+    'theta': np.int8
+}
+
+# 车辆信息 [发车时间, 车辆类型, 道路编号]
+CAR_DTYPE = np.int32
+
+Selection = Union[slice, Sequence[int], np.ndarray]
+
+
+class TrajectoryArchive:
+    def __init__(self, path: str, total_time: Optional[int] = None):
+        """
+        打开或创建轨迹存档
+
+        所有场景的车辆按写入顺序拼接, 每个变量块保存为一个 (车辆总数, total_time) 形状的
+        定长二进制文件({name}.bin), 车辆信息保存为 cars.bin; index.json 记录时间步数、
+        每个场景在车辆维度上的起始偏移与场景键。读取时以 np.memmap 映射文件,
+        按场景、车辆或时间窗口切片只读取需要的部分, 不把整个存档载入内存
+
+        写入时先追加数据再原子替换索引, 索引之外的数据(写入中断留下的部分)在下次写入前截断
+
+        :param path: 存档目录
+        :param total_time: 时间步数, 创建新存档时必须给定, 打开已有存档时须与之一致
+        """
+        self.path = path
+        index_path = os.path.join(path, 'index.json')
+
+        if os.path.exists(index_path):
+            with open(index_path, 'r') as f:
+                index = json.load(f)
+            if total_time is not None and total_time != index['total_time']:
+                raise ValueError(f"存档的时间步数为 {index['total_time']}, 与给定的 {total_time} 不一致")
+            self.total_time = index['total_time']
+            self.offsets: List[int] = index['offsets']
+            self.keys: List[Optional[str]] = index['keys']
+        else:
+            if total_time is None:
+                raise ValueError(f"存档不存在, 创建时需要给定时间步数: {path}")
+            os.makedirs(path, exist_ok=True)
+            self.total_time = int(total_time)
+            self.offsets = [0]
+            self.keys = []
+            self._write_index()
+
+        self._maps: Dict[str, np.memmap] = {}
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> Optional['TrajectoryArchive']:
+        """
+        根据配置中的 trajectory_archive 部分打开存档
+
+        :param config: 配置参数
+        :return: 轨迹存档, 未启用时返回None
+        """
+        archive_config = config.get('trajectory_archive', {})
+        if not archive_config.get('enabled', False):
+            return None
+
+        return cls(
+            archive_config.get(
+                'dir', os.path.join(config.get('output_dir', 'outputs'), 'trajectories')
+            ),
+            total_time=config.get('total_time', 80)
+        )
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @property
+    def vehicle_count(self) -> int:
+        """
+        :return: 全部场景的车辆总数
+        """
+        return self.offsets[-1]
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, f'{name}.bin')
+
+    def _write_index(self):
+        """
+        先写临时文件再原子替换索引
+        """
+        descriptor, temp_path = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'w') as f:
+                json.dump({'total_time': self.total_time, 'offsets': self.offsets, 'keys': self.keys}, f)
+            os.replace(temp_path, os.path.join(self.path, 'index.json'))
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def append(self,
+               solution: Dict[str, Any],
+               car_list: List[List[int]],
+               key: Optional[str] = None) -> int:
+        """
+        追加一个场景的轨迹
+
+        :param solution: 包含 (车辆, total_time) 形状 x/v/w/theta 数组的解
+        :param car_list: 车辆信息列表 [发车时间, 车辆类型, 道路编号]
+        :param key: 场景键, 如 '运行编号/实验编号/控制策略'
+        :return: 场景序号
+        """
+        cars = np.asarray(car_list, dtype=CAR_DTYPE).reshape(-1, 3)
+        blocks = {}
+        for name, dtype in BLOCK_DTYPES.items():
+            values = np.asarray(solution[name])
+            if values.shape != (len(cars), self.total_time):
+                raise ValueError(f"{name} 的形状 {values.shape} 与 ({len(cars)}, {self.total_time}) 不一致")
+            blocks[name] = np.rint(values).astype(dtype) if dtype == np.int8 else values.astype(dtype)
+        blocks['cars'] = cars
+
+        start = self.vehicle_count
+        for name, values in blocks.items():
+            row_bytes = values.itemsize * values.shape[1]
+            with open(self._file(name), 'ab') as f:
+                # 截断上次写入中断时留下的、索引之外的数据
+                f.truncate(start * row_bytes)
+                f.write(np.ascontiguousarray(values).tobytes())
+
+        self.offsets.append(start + len(cars))
+        self.keys.append(key)
+        self._write_index()
+        self._maps.clear()
+
+        return len(self.keys) - 1
+
+    def array(self, name: str) -> np.ndarray:
+        """
+        映射一个变量块的全部数据
+
+        :param name: 变量块名称(x/v/w/theta)或 cars
+        :return: (车辆总数, total_time) 形状的只读 memmap, cars 为 (车辆总数, 3)
+        """
+        if name not in self._maps:
+            dtype = CAR_DTYPE if name == 'cars' else BLOCK_DTYPES[name]
+            columns = 3 if name == 'cars' else self.total_time
+            if self.vehicle_count == 0:
+                return np.zeros((0, columns), dtype=dtype)
+            self._maps[name] = np.memmap(self._file(name), dtype=dtype, mode='r',
+                                         shape=(self.vehicle_count, columns))
+
+        return self._maps[name]
+
+    def scenario(self,
+                 index: int,
+                 names: Sequence[str] = tuple(BLOCK_DTYPES),
+                 vehicles: Optional[Selection] = None,
+                 time: Optional[Selection] = None) -> Dict[str, np.ndarray]:
+        """
+        读取一个场景, 连续的切片返回 memmap 视图而不复制数据
+
+        :param index: 场景序号
+        :param names: 需要的变量块
+        :param vehicles: 场景内的车辆切片或序号, 默认全部
+        :param time: 时间窗口切片或时间步序号, 默认全部
+        :return: 以变量块名称为键的数组, 以及该场景的车辆信息 car_list
+        """
+        start, end = self.offsets[index], self.offsets[index + 1]
+        rows = slice(start, end) if vehicles is None else np.arange(start, end)[vehicles]
+        columns = slice(None) if time is None else time
+
+        # 先按行再按列切片, 两者均为序号数组时不会被逐元素配对
+        result = {name: self.array(name)[rows][:, columns] for name in names}
+        result['car_list'] = self.array('cars')[rows]
+
+        return result
+
+    def iter_scenarios(self,
+                       names: Sequence[str] = tuple(BLOCK_DTYPES),
+                       vehicles: Optional[Selection] = None,
+                       time: Optional[Selection] = None,
+                       scenarios: Optional[Sequence[int]] = None) -> Iterator[Dict[str, np.ndarray]]:
+        """
+        逐个场景读取相同的车辆与时间窗口切片
+
+        :param names: 需要的变量块
+        :param vehicles: 场景内的车辆切片或序号
+        :param time: 时间窗口切片或时间步序号
+        :param scenarios: 场景序号, 默认全部
+        :return: scenario 返回值的迭代器, 另含场景序号 index 与场景键 key
+        """
+        for index in (range(len(self)) if scenarios is None else scenarios):
+            result = self.scenario(index, names, vehicles, time)
+            result.update({'index': index, 'key': self.keys[index]})
+            yield result
+
+    def find(self, key: str) -> int:
+        """
+        :param key: 场景键
+        :return: 最近一次以该键写入的场景序号
+        """
+        for index in range(len(self.keys) - 1, -1, -1):
+            if self.keys[index] == key:
+                return index
+        raise KeyError(key)
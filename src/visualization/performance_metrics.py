@@ -1,99 +1,287 @@
 import numpy as np
-from typing import Dict, Any
+import pandas as pd
+from typing import Dict, Any, Optional, Sequence
+
+from src.core.intersection import route_length
+
+
+# 模型中按 (车辆, 时间) 组织的变量块
+SOLUTION_BLOCKS = ('x', 'v', 'w', 'theta')
+
+# Gurobi状态码: 2 为最优(基准控制策略为可用解); 3/4/5 为不可行或无界, 即使带有解也不可用
+OPTIMAL_STATUS = 2
+NO_SOLUTION_STATUSES = (3, 4, 5)
 
 
 class PerformanceAnalyzer:
-    @staticmethod
-    def analyze_model_results(model) -> Dict[str, Any]:
+    @classmethod
+    def analyze_model_results(cls, model, config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         分析模型运行结果
 
         :param model: Gurobi优化模型
+        :param config: 包含车辆列表的实验配置, 用于计算车辆级别指标
         :return: 性能指标字典
         """
-        if model.status != 2:  # 非最优解
+        return cls.analyze_solution(cls.extract_solution(model), config)
+
+    @staticmethod
+    def extract_solution(model) -> Dict[str, Any]:
+        """
+        批量提取模型的求解信息与解数组
+
+        x/v/w/theta 通过 TrafficOptimizationModel 保存在 model._optimizer 中的变量句柄读取,
+        与变量在模型中的创建顺序无关
+
+        :param model: Gurobi优化模型
+        :return: 包含求解状态、目标值与解数组的字典
+        """
+        solution = {
+            'status': model.status,
+            'solve_time': model.Runtime
+        }
+        if getattr(model, '_first_incumbent_time', None) is not None:
+            solution['first_incumbent_time'] = model._first_incumbent_time
+        if getattr(model, '_progress', None) is not None:
+            solution['progress'] = model._progress.to_dict()
+
+        if model.SolCount == 0:
+            return solution
+
+        solution['objective_value'] = model.ObjVal
+        if model.IsMIP:
+            solution['mip_gap'] = model.MIPGap
+
+        optimizer = getattr(model, '_optimizer', None)
+        if optimizer is None:
+            return solution
+
+        solution.update(optimizer.get_solution())
+
+        return solution
+
+    @classmethod
+    def analyze_solution(cls,
+                         solution: Dict[str, Any],
+                         config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        根据求解信息与解数组计算汇总性能指标
+
+        达到时间上限等非最优状态但已有可行解(带有目标值)时照常分析, status 为 Feasible 并保留
+        求解状态码 solver_status; 没有可行解或模型不可行时 status 为 Infeasible
+
+        :param solution: extract_solution、结果缓存或基准控制策略返回的字典
+        :param config: 包含车辆列表的实验配置, 用于计算车辆级别指标
+        :return: 性能指标字典
+        """
+        controller = solution.get('controller', 'optimal')
+        status = int(solution['status'])
+        if status != OPTIMAL_STATUS and (
+                status in NO_SOLUTION_STATUSES or solution.get('objective_value') is None
+        ):
             return {
                 'status': 'Infeasible',
-                'message': f'模型求解状态: {model.status}'
+                'controller': controller,
+                'solver_status': status,
+                'message': solution.get('message', f"模型求解状态: {solution['status']}")
             }
 
         # 提取关键性能指标
         performance_metrics = {
-            'status': 'Optimal',
-            'objective_value': model.ObjVal,
-            'solve_time': model.Runtime,
-            'variables': {},
-            'constraints': {}
+            'status': 'Optimal' if controller == 'optimal' else 'Heuristic',
+            'controller': controller,
+            'objective_value': float(solution['objective_value']),
+            'solve_time': float(solution.get('solve_time', 0.0))
         }
-
-        # 变量分析
-        try:
-            for var in model.getVars():
-                performance_metrics['variables'][var.VarName] = {
-                    'value': var.X,
-                    'reduced_cost': var.RC
-                }
-        except Exception as e:
-            performance_metrics['variables_error'] = str(e)
-
-        # 约束分析
-        try:
-            for constr in model.getConstrs():
-                performance_metrics['constraints'][constr.ConstrName] = {
-                    'slack': constr.Slack,
-                    'dual_price': constr.Pi
-                }
-        except Exception as e:
-            performance_metrics['constraints_error'] = str(e)
+        if status != OPTIMAL_STATUS:
+            performance_metrics['status'] = 'Feasible'
+            performance_metrics['solver_status'] = status
+        for name in ('mip_gap', 'first_incumbent_time'):
+            if name in solution:
+                performance_metrics[name] = float(solution[name])
+        if 'progress' in solution:
+            performance_metrics['phase_times'] = dict(solution['progress']['summary']['phase_times'])
 
         # 车辆级别的性能指标
         performance_metrics.update(
-            cls._calculate_vehicle_performance(model)
+            cls._calculate_vehicle_performance(solution, config)
         )
 
         return performance_metrics
 
+    @staticmethod
+    def save_solution(path: str, solution: Dict[str, Any]):
+        """
+        将解数组保存为压缩的 .npz 文件
+
+        连续变量以 float32 保存, 0-1 变量以 int8 保存
+
+        :param path: 保存路径
+        :param solution: 包含解数组的字典
+        """
+        arrays = {}
+        for name in SOLUTION_BLOCKS:
+            if name not in solution:
+                continue
+            values = np.asarray(solution[name])
+            if name in ('w', 'theta'):
+                arrays[name] = np.rint(values).astype(np.int8)
+            else:
+                arrays[name] = values.astype(np.float32)
+
+        np.savez_compressed(path, **arrays)
+
+    @staticmethod
+    def load_solution(path: str) -> Dict[str, np.ndarray]:
+        """
+        读取 save_solution 保存的解数组
+
+        :param path: 文件路径
+        :return: 以变量名称为键的 (车辆, 时间) 形状数组
+        """
+        with np.load(path) as data:
+            return {name: data[name] for name in data.files}
+
+    @staticmethod
+    def calculate_vehicle_metrics(solution: Dict[str, Any],
+                                  config: Dict[str, Any]) -> Dict[str, np.ndarray]:
+        """
+        基于 (车辆, 时间) 解数组批量计算每辆车的性能指标
+
+        w 为1的时间步计为行程时间, 自由流时间为所在进口道长度除以该车型最高速度,
+        停车次数为车辆在有效区域内速度降到 stop_speed 以下的次数
+
+        :param solution: 包含 v/w 解数组的字典
+        :param config: 包含 car_list、road_length 与 vehicle_types 的配置
+        :return: 以指标名称为键的每车数组
+        """
+        car_array = np.asarray(config.get('car_list', []), dtype=int).reshape(-1, 3)
+        initial_time, car_type, car_route = car_array[:, 0], car_array[:, 1], car_array[:, 2]
+
+        time_step = config.get('time_step', 1)
+        stop_speed = config.get('performance_thresholds', {}).get('stop_speed', 0.5)
+        vehicle_types = config['vehicle_types']
+
+        # 车辆进入路网后位于有效区域的时间步
+        steps = np.arange(solution['w'].shape[1])
+        in_area = (solution['w'] > 0.5) & (steps[None, :] >= initial_time[:, None])
+
+        travel_time = in_area.sum(axis=1) * time_step
+
+        v_max = np.where(car_type == 1,
+                         vehicle_types['bus']['v_max'],
+                         vehicle_types['car']['v_max'])
+        free_flow_time = route_length(car_route, config) / v_max
+        delay = np.maximum(travel_time - free_flow_time, 0.0)
+
+        # 停车: 有效区域内由行驶转为低于停车速度
+        stopped = in_area & (solution['v'] < stop_speed)
+        stops = stopped[:, 0].astype(int) + (stopped[:, 1:] & ~stopped[:, :-1]).sum(axis=1)
+
+        return {
+            'car_type': car_type,
+            'car_route': car_route,
+            'travel_time': travel_time.astype(float),
+            'free_flow_time': free_flow_time,
+            'delay': delay,
+            'stops': stops
+        }
+
     @classmethod
-    def _calculate_vehicle_performance(cls, model) -> Dict[str, Any]:
+    def _calculate_vehicle_performance(cls,
+                                       solution: Dict[str, Any],
+                                       config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
-        计算车辆级别的性能指标
+        计算车辆级别的性能指标, 并按车型与路线汇总
 
-        :param model: Gurobi优化模型
+        :param solution: 包含解数组的字典
+        :param config: 包含车辆列表的配置, 缺省时仅统计车辆数
         :return: 车辆性能指标
         """
+        if 'w' not in solution or not config or 'car_list' not in config:
+            return {'total_vehicles': int(solution['w'].shape[0]) if 'w' in solution else 0}
+
+        metrics = cls.calculate_vehicle_metrics(solution, config)
+        car_type = metrics['car_type']
+
         vehicle_metrics = {
-            'total_vehicles': 0,
-            'vehicle_types': {
-                'car': {
-                    'count': 0,
-                    'total_travel_time': 0,
-                    'average_travel_time': 0
-                },
-                'bus': {
-                    'count': 0,
-                    'total_travel_time': 0,
-                    'average_travel_time': 0
-                }
-            },
+            'total_vehicles': int(len(car_type)),
+            'total_travel_time': float(metrics['travel_time'].sum()),
+            'total_delay': float(metrics['delay'].sum()),
+            'average_delay': _safe_mean(metrics['delay']),
+            'total_stops': int(metrics['stops'].sum()),
+            'vehicle_types': {},
             'road_performance': {}
         }
 
-        # 从模型变量中提取性能数据
-        x_vars = [var for var in model.getVars() if var.VarName.startswith('x[')]
-        w_vars = [var for var in model.getVars() if var.VarName.startswith('w[')]
+        # 按车型汇总
+        for type_name, type_value in (('car', 0), ('bus', 1)):
+            mask = car_type == type_value
+            vehicle_metrics['vehicle_types'][type_name] = {
+                'count': int(mask.sum()),
+                'total_travel_time': float(metrics['travel_time'][mask].sum()),
+                'average_travel_time': _safe_mean(metrics['travel_time'][mask]),
+                'total_delay': float(metrics['delay'][mask].sum()),
+                'average_delay': _safe_mean(metrics['delay'][mask]),
+                'average_stops': _safe_mean(metrics['stops'][mask])
+            }
+
+        # 公交车与小汽车的公平性比值
+        car_metrics = vehicle_metrics['vehicle_types']['car']
+        bus_metrics = vehicle_metrics['vehicle_types']['bus']
+        travel_time_ratio = _safe_ratio(bus_metrics['average_travel_time'],
+                                        car_metrics['average_travel_time'])
+        equity_factor = config.get('performance_thresholds', {}).get('equity_factor', 0.2)
+        vehicle_metrics['equity'] = {
+            'travel_time_ratio': travel_time_ratio,
+            'delay_ratio': _safe_ratio(bus_metrics['average_delay'],
+                                       car_metrics['average_delay']),
+            'within_equity_factor': bool(abs(travel_time_ratio - 1) <= equity_factor)
+        }
 
-        # TODO: 根据实际需求完善性能计算逻辑
+        # 按路线汇总
+        routes, route_index = np.unique(metrics['car_route'], return_inverse=True)
+        counts = np.bincount(route_index)
+        for name in ('travel_time', 'delay', 'stops'):
+            totals = np.bincount(route_index, weights=metrics[name], minlength=len(routes))
+            for route, count, total in zip(routes, counts, totals):
+                route_metrics = vehicle_metrics['road_performance'].setdefault(
+                    int(route), {'count': int(count)}
+                )
+                route_metrics[f'total_{name}'] = float(total)
+                route_metrics[f'average_{name}'] = float(total / count)
 
         return vehicle_metrics
 
     @staticmethod
-    def compare_experiments(experiment_results: list) -> Dict[str, Any]:
+    def compare_experiments(experiment_results: Optional[list] = None,
+                            store=None,
+                            run_ids: Optional[Sequence[str]] = None,
+                            densities: Optional[Sequence[float]] = None,
+                            controllers: Optional[Sequence[str]] = None,
+                            group_by: Optional[Sequence[str]] = None) -> Dict[str, Any]:
         """
         比较多组实验结果
 
+        给定结果库时从实验汇总表中按运行、车流密度与控制策略筛选, 只读取汇总列,
+        不加载轨迹; 给定 group_by 时另外返回按这些列分组的均值、标准差与实验数。
+        求解失败的实验没有目标值与求解时间, 统计时忽略
+
         :param experiment_results: 实验结果列表
+        :param store: ResultsStore 结果库或其根目录, 给定时忽略 experiment_results
+        :param run_ids: 只比较这些运行
+        :param densities: 只比较这些车流密度
+        :param controllers: 只比较这些控制策略
+        :param group_by: 分组列, 如 ('density', 'controller')
         :return: 实验比较结果
         """
+        frame = None
+        if store is not None:
+            frame = PerformanceAnalyzer.query_experiments(
+                store, run_ids=run_ids, densities=densities, controllers=controllers
+            )
+            experiment_results = frame.to_dict('records')
+
         if not experiment_results:
             return {'error': '没有可比较的实验结果'}
 
@@ -111,14 +299,60 @@ class PerformanceAnalyzer:
 
         # 统计摘要
         comparison['summary'] = {
-            'mean_objective': np.mean(comparison['objective_values']),
-            'std_objective': np.std(comparison['objective_values']),
-            'mean_solve_time': np.mean(comparison['solve_times']),
-            'std_solve_time': np.std(comparison['solve_times'])
+            'mean_objective': np.nanmean(comparison['objective_values']),
+            'std_objective': np.nanstd(comparison['objective_values']),
+            'mean_solve_time': np.nanmean(comparison['solve_times']),
+            'std_solve_time': np.nanstd(comparison['solve_times'])
         }
 
+        if group_by:
+            if frame is None:
+                frame = pd.DataFrame(experiment_results)
+            metrics = [name for name in ('objective_value', 'solve_time', 'total_delay') if name in frame]
+            comparison['groups'] = frame.groupby(list(group_by))[metrics].agg(['mean', 'std', 'count'])
+
         return comparison
 
+    @staticmethod
+    def query_experiments(store,
+                          columns: Sequence[str] = ('controller', 'status', 'objective_value', 'solve_time',
+                                                    'total_delay', 'average_delay'),
+                          run_ids: Optional[Sequence[str]] = None,
+                          densities: Optional[Sequence[float]] = None,
+                          controllers: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        从结果库读取跨运行的实验汇总行
+
+        :param store: ResultsStore 结果库或其根目录
+        :param columns: 需要读取的列, 分区列 run_id 与 density 总是包含
+        :param run_ids: 只读取这些运行
+        :param densities: 只读取这些车流密度
+        :param controllers: 只读取这些控制策略
+        :return: 每组实验一行的DataFrame
+        """
+        from src.utils.results_store import ResultsStore
+
+        if isinstance(store, str):
+            store = ResultsStore(store, read_only=True)
+
+        return store.load_experiments(
+            columns=columns, run_ids=run_ids, densities=densities, controllers=controllers
+        )
+
+
+def _safe_mean(values: np.ndarray) -> float:
+    """
+    计算均值, 空数组返回0
+    """
+    return float(values.mean()) if len(values) else 0.0
+
+
+def _safe_ratio(numerator: float, denominator: float) -> float:
+    """
+    计算比值, 分母为0时返回1(视为无差异)
+    """
+    return float(numerator / denominator) if denominator else 1.0
+
 
 def main():
     # 模拟实验结果比较示例
@@ -0,0 +1,34 @@
+import pytest
+
+pytest.importorskip('gurobipy')
+
+from src.experiment.experiment_manager import ExperimentManager
+from src.experiment.adaptive_sweep import AdaptiveDensitySweep
+
+
+def test_adaptive_density_sweep_refines_threshold_crossings_with_fewer_solves(tmp_path):
+    # 公平性比值在 0.2 与 0.3 之间跨越阈值 1.2, 只在该区间加密
+    sampler = AdaptiveDensitySweep(low=0.1, high=0.5, min_spacing=0.05, metric='equity.travel_time_ratio',
+                                   thresholds=[1.2], initial_points=5, refine_tolerance=1.0, min_replicates=2)
+    initial = sampler.next_tasks()
+    assert len(initial) == 10
+    sampler.observe([
+        dict(task, equity={'travel_time_ratio': 1.0 if task['parameters']['density'] < 0.25 else 1.5})
+        for task in initial
+    ])
+    assert {task['parameters']['density'] for task in sampler.next_tasks()} == {0.25}
+
+    manager = ExperimentManager()
+    manager.config.update(output_dir=str(tmp_path), results_store={'enabled': False})
+    manager.create_output_directories()
+
+    sampler = AdaptiveDensitySweep(low=0.1, high=0.5, min_spacing=0.05, initial_points=3,
+                                   min_replicates=2, max_replicates=4, max_solves=30)
+    sweep = manager.run_adaptive_density_sweep(sampler, controller='fcfs')
+
+    densities = [point['density'] for point in sweep['curve']]
+    assert densities[0] == 0.1 and densities[-1] == 0.5
+    assert all(right - left >= 0.05 - 1e-9 for left, right in zip(densities, densities[1:]))
+    assert all(point['count'] >= 2 for point in sweep['curve'])
+    # 少于在9个密度点上各重复4次的均匀网格
+    assert sweep['solves'] == len(sweep['results']) <= 30 < 9 * 4
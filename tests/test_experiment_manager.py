@@ -0,0 +1,32 @@
+import pytest
+
+pytest.importorskip('gurobipy')
+
+from src.experiment.experiment_manager import ExperimentManager
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_execute_experiments_keeps_order_and_isolates_failures(workers):
+    config = ExperimentManager().config
+    # 车辆数各不相同的场景, 用于核对结果与提交的实验一一对应
+    car_lists = [
+        [[2 * slot, 0, road] for slot in range(count)]
+        for road, count in zip((1, 4, 7, 10, 2, 5), range(1, 7))
+    ]
+    experiments = [
+        (index, dict(config, car_list=car_list, controller='unknown' if index == 2 else 'fcfs'))
+        for index, car_list in enumerate(car_lists)
+    ]
+
+    results = list(ExperimentManager._execute_experiments(iter(experiments), workers))
+
+    # 按提交顺序返回, 失败的实验只影响自身
+    assert [tag for tag, _, _ in results] == list(range(len(car_lists)))
+    for index, (tag, result, error) in enumerate(results):
+        if index == 2:
+            assert result is None and isinstance(error, ValueError)
+            continue
+        performance, _ = result
+        assert error is None
+        assert performance['status'] == 'Heuristic'
+        assert performance['total_vehicles'] == len(car_lists[index])
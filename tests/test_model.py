@@ -0,0 +1,632 @@
+import numpy as np
+import pytest
+
+gurobipy = pytest.importorskip('gurobipy')
+
+from src.core.model import TrafficOptimizationModel
+
+
+SAMPLE_CONFIG = {
+    'total_time': 10,
+    'road_length': [154, 145, 154, 145],
+    'vehicle_types': {
+        'car': {'v_min': 0, 'v_max': 12, 'a_min': -3, 'a_max': 3},
+        'bus': {'v_min': 0, 'v_max': 10, 'a_min': -2, 'a_max': 2}
+    },
+    'initial_velocity': 6,
+    'cost_car': 1,
+    'cost_bus': 1
+}
+
+SAMPLE_CAR_LIST = [[0, 0, 1], [2, 1, 4], [4, 0, 7]]
+
+
+def build_model(car_list, extra_variables=0, **overrides):
+    optimizer = TrafficOptimizationModel(dict(SAMPLE_CONFIG, **overrides))
+    optimizer.model.Params.OutputFlag = 0
+    if extra_variables:
+        optimizer.model.addVars(extra_variables, ub=1, name='extra')
+    optimizer.create_variables(len(car_list))
+    optimizer.add_constraints(
+        car_count=len(car_list),
+        car_type=[car[1] for car in car_list],
+        car_route=[car[2] for car in car_list],
+        initial_time=[car[0] for car in car_list]
+    )
+    optimizer.set_objective(len(car_list), [car[1] for car in car_list])
+    return optimizer
+
+
+def velocity_sum(optimizer, car):
+    if optimizer.build_mode == 'matrix':
+        return optimizer.v[car, :].sum()
+    return gurobipy.quicksum(optimizer.v[car, t] for t in range(optimizer.total_time))
+
+
+@pytest.mark.parametrize('sense', [gurobipy.GRB.MINIMIZE, gurobipy.GRB.MAXIMIZE])
+@pytest.mark.parametrize('car', [0, 1])
+def test_matrix_build_matches_loop_build(sense, car):
+    objectives = {}
+    for build_mode in ('loop', 'matrix'):
+        optimizer = build_model(SAMPLE_CAR_LIST, build_mode=build_mode)
+        # 仅对车辆进入后的有效时段求极值, 两种构建方式的可行域应一致
+        initial_time = SAMPLE_CAR_LIST[car][0]
+        optimizer.model.addConstrs(
+            optimizer.v[car, t] == 0 for t in range(initial_time)
+        )
+        optimizer.model.setObjective(velocity_sum(optimizer, car), sense)
+        optimizer.model.optimize()
+        objectives[build_mode] = optimizer.model.ObjVal
+
+    assert objectives['loop'] == pytest.approx(objectives['matrix'])
+
+
+def test_unknown_build_mode_is_rejected():
+    with pytest.raises(ValueError):
+        TrafficOptimizationModel(dict(SAMPLE_CONFIG, build_mode='unknown'))
+
+
+def test_rolling_horizon_stitches_feasible_trajectory():
+    from src.core.rolling_horizon import run_rolling_horizon_optimization
+
+    config = dict(SAMPLE_CONFIG, total_time=12, car_list=SAMPLE_CAR_LIST,
+                  rolling_horizon={'window': 5, 'commit': 3, 'window_time_limit': 10})
+    result = run_rolling_horizon_optimization(config)
+
+    assert result['status'] == gurobipy.GRB.OPTIMAL
+    assert result['v'].shape == (len(SAMPLE_CAR_LIST), 12)
+    assert [window['start'] for window in result['windows']] == [0, 2, 5, 8]
+
+    for c, (initial_time, car_type, _) in enumerate(SAMPLE_CAR_LIST):
+        limits = SAMPLE_CONFIG['vehicle_types']['bus' if car_type else 'car']
+        velocity = result['v'][c, initial_time:]
+        assert velocity[0] == pytest.approx(SAMPLE_CONFIG['initial_velocity'])
+        assert velocity.min() >= limits['v_min'] - 1e-6
+        assert velocity.max() <= limits['v_max'] + 1e-6
+        # 跨窗口拼接处同样满足加速度约束
+        assert (abs(velocity[1:] - velocity[:-1]) <= limits['a_max'] + 1e-6).all()
+
+
+def test_rolling_horizon_retires_vehicles_that_left_the_road():
+    from src.core.rolling_horizon import run_rolling_horizon_optimization
+
+    car_list = [[0, 0, 1], [2, 1, 4], [4, 0, 7], [9, 0, 1]]
+    config = dict(SAMPLE_CONFIG, total_time=14, road_length=[30, 30, 30, 30], car_list=car_list,
+                  rolling_horizon={'window': 5, 'commit': 3, 'window_time_limit': 10})
+    result = run_rolling_horizon_optimization(config)
+
+    assert result['status'] == gurobipy.GRB.OPTIMAL
+    # 车辆驶过进口道全长后才退出后续窗口
+    assert [window['vehicles'] for window in result['windows']] == [3, 3, 3, 2, 1]
+
+    x, v, w = result['x'], result['v'], result['w']
+    for c, (initial_time, _, _) in enumerate(car_list):
+        # 拼接轨迹(含离开后的时段)在全时域满足 x[t] = x[t-1] + v[t-1]
+        assert x[c, initial_time + 1:] == pytest.approx(x[c, initial_time:-1] + v[c, initial_time:-1])
+        assert (w[c, x[c] >= 30 - 1e-6] < 0.5).all()
+
+
+def test_rolling_horizon_keeps_conflict_zones_reserved_across_windows():
+    from src.core.rolling_horizon import run_rolling_horizon_optimization
+    from src.core.simulator import TrajectorySimulator
+    from src.core.intersection import crossing_steps
+
+    car_list = [[1, 0, 1], [2, 0, 4], [3, 0, 8]]
+    config = dict(CONFLICT_CONFIG, total_time=14, car_list=car_list,
+                  intersection={'zone_length': 40, 'max_delay': 10},
+                  rolling_horizon={'window': 5, 'commit': 3, 'window_time_limit': 10})
+    result = run_rolling_horizon_optimization(config)
+    assert result['status'] == gurobipy.GRB.OPTIMAL
+
+    validation = TrajectorySimulator(config).validate(result, car_list)
+    assert validation['valid'], validation['violations']
+
+    # 至少一辆车在窗口提交边界处仍占用冲突区
+    cross_time = validation['cross_time']
+    occupy_end = cross_time + crossing_steps(np.asarray(car_list)[:, 1], config) - 1
+    assert any(((cross_time >= 0) & (cross_time < window['commit_end'])
+                & (occupy_end >= window['commit_end'])).any()
+               for window in result['windows'][:-1])
+
+
+@pytest.mark.parametrize('build_mode', ['loop', 'matrix'])
+def test_extract_solution_matches_variable_blocks(build_mode):
+    from src.visualization.performance_metrics import PerformanceAnalyzer
+
+    # 在解变量之前创建的变量不影响提取结果
+    optimizer = build_model(SAMPLE_CAR_LIST, extra_variables=3, build_mode=build_mode)
+    model = optimizer.solve()
+
+    solution = PerformanceAnalyzer.extract_solution(model)
+
+    for name in ('x', 'v', 'w', 'theta'):
+        assert solution[name].shape == (len(SAMPLE_CAR_LIST), SAMPLE_CONFIG['total_time'])
+        expected = [[model.getVarByName(f'{name}[{c},{t}]').X for t in range(SAMPLE_CONFIG['total_time'])]
+                    for c in range(len(SAMPLE_CAR_LIST))]
+        assert solution[name] == pytest.approx(np.array(expected))
+
+
+def test_fcfs_reservation_is_conflict_free():
+    import numpy as np
+    from src.core.heuristics import TrajectoryHeuristics
+    from src.core.intersection import route_zones, route_approach, crossing_steps, headway_steps
+
+    config = dict(SAMPLE_CONFIG, total_time=60,
+                  constraints={'vehicle_gap': {'car': 3, 'bus': 8},
+                               'reaction_time': {'car': 0.2, 'bus': 0.3}})
+    car_list = [[t, t % 5 == 0, route] for t in range(0, 20, 2) for route in (1, 4, 8)]
+    car_array = np.asarray(car_list, dtype=int)
+
+    trajectories = TrajectoryHeuristics.fcfs_reservation(car_list, config)
+    cross_time = trajectories['cross_time']
+    assert (cross_time >= 0).all()
+
+    zones = route_zones(car_array[:, 2], config)
+    duration = crossing_steps(car_array[:, 1], config)
+    occupancy = np.zeros((zones.shape[1], 80), dtype=int)
+    for c in range(len(car_list)):
+        occupancy[zones[c], cross_time[c]:cross_time[c] + duration[c]] += 1
+    assert occupancy.max() == 1
+
+    approach = route_approach(car_array[:, 2], config)
+    headway = headway_steps(car_array[:, 1], config)
+    for a in np.unique(approach):
+        members = np.flatnonzero(approach == a)
+        members = members[np.argsort(cross_time[members])]
+        assert (np.diff(cross_time[members]) >= headway[members[1:]]).all()
+
+    # 在预约时刻之前不会越过停车线
+    entered = trajectories['theta'].astype(bool)
+    assert (trajectories['w'][entered & (np.arange(60)[None, :] >= cross_time[:, None])] == 0).all()
+
+
+CONFLICT_CONFIG = dict(
+    SAMPLE_CONFIG,
+    total_time=20,
+    formulation='linear',
+    road_length=[20, 20, 20, 20],
+    intersection={'zone_length': 20, 'max_delay': 10},
+    constraints={'vehicle_gap': {'car': 3, 'bus': 8},
+                 'reaction_time': {'car': 0.2, 'bus': 0.3}}
+)
+
+
+@pytest.mark.parametrize('build_mode', ['loop', 'matrix'])
+def test_crossing_constraints_keep_conflict_zones_exclusive(build_mode):
+    import numpy as np
+    from src.core.model import build_traffic_optimization
+    from src.core.intersection import route_zones, crossing_steps
+
+    car_list = [[0, 0, 1], [0, 0, 4], [0, 1, 7], [1, 0, 10], [1, 0, 2]]
+    optimizer = build_traffic_optimization(dict(CONFLICT_CONFIG, car_list=car_list,
+                                                build_mode=build_mode))
+    optimizer.model.Params.OutputFlag = 0
+    optimizer.solve()
+    assert optimizer.model.status == gurobipy.GRB.OPTIMAL
+
+    car_array = np.asarray(car_list)
+    w = optimizer.get_solution()['w']
+    steps = np.arange(20)
+    crossed = (w < 0.5) & (steps[None, :] >= car_array[:, :1])
+    cross_time = np.argmax(crossed, axis=1)
+    assert crossed.any(axis=1).all()
+
+    zones = route_zones(car_array[:, 2], CONFLICT_CONFIG)
+    duration = crossing_steps(car_array[:, 1], CONFLICT_CONFIG)
+    occupancy = np.zeros((zones.shape[1], 40), dtype=int)
+    for c in range(len(car_list)):
+        occupancy[zones[c], cross_time[c]:cross_time[c] + duration[c]] += 1
+    assert occupancy.max() == 1
+
+    # 同一进口道的前后车按发车顺序通过
+    assert cross_time[4] > cross_time[0]
+
+
+def test_conflict_pairs_skip_disjoint_windows():
+    from src.core.conflicts import build_crossing_constraints
+
+    config = dict(CONFLICT_CONFIG, total_time=80,
+                  intersection={'zone_length': 20, 'max_delay': 3})
+    # 发车间隔远大于通过时间窗口, 不产生冲突约束
+    sparse = [[10 * k, 0, 1 + 3 * (k % 4)] for k in range(6)]
+    dense = [[k % 2, 0, 1 + 3 * (k % 4)] for k in range(6)]
+
+    assert build_crossing_constraints(sparse, config)['num_pairs'] == 0
+    assert build_crossing_constraints(dense, config)['num_pairs'] == 15
+
+
+def test_decomposition_bounds_bracket_monolithic_optimum():
+    from src.core.model import build_traffic_optimization
+    from src.core.decomposition import run_decomposition_optimization
+
+    config = dict(CONFLICT_CONFIG, road_length=[40, 40, 40, 40],
+                  intersection={'zone_length': 10, 'max_delay': 10},
+                  decomposition={'max_iterations': 20, 'gap_tolerance': 0.0})
+    config['car_list'] = [[t, int(t % 3 == 0), route] for t in range(4) for route in (1, 5, 8)]
+
+    result = run_decomposition_optimization(config)
+    optimizer = build_traffic_optimization(config)
+    optimizer.model.Params.OutputFlag = 0
+    optimizer.solve()
+
+    optimum = optimizer.model.ObjVal
+    assert result['lower_bound'] <= optimum + 1e-6
+    assert result['objective_value'] >= optimum - 1e-6
+    assert result['objective_value'] == pytest.approx(result['w'].sum())
+    gaps = [record['gap'] for record in result['iterations']]
+    assert gaps == sorted(gaps, reverse=True)
+
+
+@pytest.mark.parametrize('backend', ['gurobi', 'highs'])
+def test_solver_backends_match_native_model(backend):
+    from src.core.model import build_traffic_optimization
+    from src.core.backends import solve_with_backend
+
+    config = dict(CONFLICT_CONFIG, car_list=[[0, 0, 1], [0, 0, 4], [0, 1, 7], [1, 0, 10], [1, 0, 2]])
+    optimizer = build_traffic_optimization(config)
+    optimizer.model.Params.OutputFlag = 0
+    optimizer.solve()
+
+    solution = solve_with_backend(config, backend)
+    assert solution['status'] == gurobipy.GRB.OPTIMAL
+    assert solution['objective_value'] == pytest.approx(optimizer.model.ObjVal)
+    assert solution['w'].shape == (5, CONFLICT_CONFIG['total_time'])
+    assert solution['objective_value'] == pytest.approx(solution['w'].sum())
+
+
+def test_backend_problem_matches_native_matrix_model():
+    from src.core.model import build_traffic_optimization
+    from src.core.formulation import build_matrix_problem
+
+    config = dict(CONFLICT_CONFIG, car_list=[[0, 0, 1], [0, 0, 4], [0, 1, 7], [1, 0, 10], [1, 0, 2]])
+    optimizer = build_traffic_optimization(config)
+    optimizer.model.update()
+    problem = build_matrix_problem(config)
+
+    assert optimizer.model.NumVars == sum(len(lb) for _, lb, _, _ in problem['variables'])
+    assert optimizer.model.NumConstrs == sum(
+        np.isfinite(lower).sum() + (np.isfinite(upper) & (lower != upper)).sum()
+        for _, _, lower, upper in problem['constraints']
+    )
+    for name, lb, ub, _ in problem['variables']:
+        variables = getattr(optimizer, name)
+        model_ub = np.asarray(variables.ub).ravel()
+        assert np.array_equal(np.asarray(variables.lb).ravel(), lb)
+        assert np.array_equal(np.where(model_ub >= gurobipy.GRB.INFINITY, np.inf, model_ub), ub)
+
+
+@pytest.mark.parametrize('backend', ['gurobi', 'highs'])
+def test_backend_warm_start_uses_heuristic_trajectories(backend, monkeypatch):
+    from src.core import backends
+
+    config = dict(CONFLICT_CONFIG, car_list=[[0, 0, 1], [0, 0, 4], [0, 1, 7], [1, 0, 10], [1, 0, 2]],
+                  solver={'warm_start': 'heuristic'})
+    problem = backends.build_matrix_problem(config)
+    start = backends.heuristic_start(config, problem)
+
+    # 启发式初始解满足矩阵模型的全部约束
+    assert np.all(start >= np.concatenate([lb for _, lb, _, _ in problem['variables']]) - 1e-6)
+    assert np.all(start <= np.concatenate([ub for _, _, ub, _ in problem['variables']]) + 1e-6)
+    for _, A, lower, upper in problem['constraints']:
+        assert np.all(A @ start >= lower - 1e-6)
+        assert np.all(A @ start <= upper + 1e-6)
+
+    applied = []
+    original = backends.get_backend(backend).set_start
+    monkeypatch.setattr(backends.get_backend(backend), 'set_start',
+                        lambda self, values: applied.append(values) or original(self, values))
+    solution = backends.solve_with_backend(config, backend)
+
+    assert solution['status'] == gurobipy.GRB.OPTIMAL
+    assert len(applied) == 1
+    assert np.array_equal(applied[0], start)
+
+
+def test_unknown_backend_is_rejected():
+    from src.core.backends import get_backend
+
+    with pytest.raises(ValueError):
+        get_backend('unknown')
+
+
+def test_incomplete_backend_cannot_be_created():
+    from src.core.backends import SolverBackend
+
+    class PartialBackend(SolverBackend):
+        name = 'partial'
+
+        def add_variables(self, name, lb, ub, binary):
+            return 0
+
+    with pytest.raises(TypeError):
+        PartialBackend()
+
+
+@pytest.mark.parametrize('build_mode', ['loop', 'matrix'])
+def test_linear_formulation_matches_bilinear(build_mode):
+    from src.core.model import build_traffic_optimization
+
+    # 双线性模型在受限许可证下只能求解很小的实例
+    config = dict(CONFLICT_CONFIG, total_time=10, build_mode=build_mode,
+                  car_list=[[0, 0, 1], [0, 0, 5]])
+    objectives = {}
+    for formulation in ('linear', 'bilinear'):
+        optimizer = build_traffic_optimization(dict(config, formulation=formulation))
+        optimizer.model.Params.OutputFlag = 0
+        optimizer.solve()
+        assert (optimizer.model.NumQConstrs > 0) == (formulation == 'bilinear')
+        objectives[formulation] = optimizer.model.ObjVal
+
+        # 位置按离散运动学更新, 越过停车线之前位于有效区域
+        solution = optimizer.get_solution()
+        x, v, w = solution['x'], solution['v'], solution['w']
+        assert x[:, 1:] == pytest.approx(x[:, :-1] + v[:, :-1])
+        assert (w[x < 20 - 1e-6] > 0.5).all()
+
+    assert objectives['linear'] == pytest.approx(objectives['bilinear'])
+
+
+@pytest.mark.parametrize('conflicts', [True, False])
+def test_model_template_matches_fresh_models(conflicts):
+    from src.core.model import build_traffic_optimization
+    from src.core.template import ModelTemplate
+
+    config = dict(CONFLICT_CONFIG,
+                  intersection=dict(CONFLICT_CONFIG['intersection'], conflicts=conflicts))
+    template = ModelTemplate(config, 4)
+    template.model.Params.OutputFlag = 0
+
+    # 车辆数、进入时刻与路线各不相同的场景依次写入同一模板
+    for car_list in ([[0, 0, 1], [0, 0, 5], [2, 1, 4]],
+                     [[1, 1, 7]],
+                     [[0, 0, 2], [1, 0, 2], [1, 0, 8], [3, 1, 11]]):
+        optimizer = build_traffic_optimization(dict(config, car_list=car_list))
+        optimizer.model.Params.OutputFlag = 0
+        optimizer.solve()
+
+        solution = template.solve_scenario(car_list)
+        assert solution['objective_value'] == pytest.approx(optimizer.model.ObjVal)
+        assert solution['x'].shape == (len(car_list), CONFLICT_CONFIG['total_time'])
+
+
+def test_reused_template_applies_each_experiments_solver_settings():
+    from src.experiment.experiment_manager import _get_template
+
+    config = dict(CONFLICT_CONFIG, experiments={'reuse_model': True})
+    car_list = [[0, 0, 1], [0, 0, 5], [2, 1, 4]]
+    loose = _get_template(dict(config, solver={'mip_gap': 0.5, 'time_limit': 30}), len(car_list))
+    exact = _get_template(dict(config, solver={'mip_gap': 0.0, 'time_limit': 20}), len(car_list))
+
+    # 只有求解器配置不同时复用同一模板, 并按新配置设置Gurobi参数
+    assert exact is loose
+    assert exact.model.Params.MIPGap == 0.0
+    assert exact.model.Params.TimeLimit == 20
+    assert exact.config['solver']['mip_gap'] == 0.0
+
+
+def test_incremental_arrivals_match_full_model():
+    from src.core.model import build_traffic_optimization
+    from src.core.online import OnlineOptimizer
+
+    # 所有车辆同时到达时没有已执行的轨迹, 增量构建的模型应与一次构建的模型一致
+    car_list = [[0, 0, 1], [0, 0, 5], [0, 1, 4], [0, 0, 2], [0, 0, 8]]
+    online = OnlineOptimizer(CONFLICT_CONFIG)
+    decisions = online.replay(car_list)
+
+    optimizer = build_traffic_optimization(dict(CONFLICT_CONFIG, car_list=car_list))
+    optimizer.model.Params.OutputFlag = 0
+    optimizer.solve()
+
+    assert [decision['car_count'] for decision in decisions] == [1, 2, 3, 4, 5]
+    assert decisions[-1]['objective_value'] == pytest.approx(optimizer.model.ObjVal)
+    assert online.get_solution()['x'].shape == (5, CONFLICT_CONFIG['total_time'])
+
+    with pytest.raises(ValueError):
+        online.optimizer.add_vehicle([-1, 0, 1])
+
+
+def test_control_service_answers_simulated_arrivals():
+    import asyncio
+    from src.core.service import simulate_arrivals
+
+    config = dict(CONFLICT_CONFIG, service={'port': 0, 'batch_window': 0.01, 'time_budget': 0.5})
+    car_list = [[0, 0, 1], [0, 0, 5], [2, 1, 4], [4, 0, 2]]
+    responses, latency = asyncio.run(simulate_arrivals(config, car_list, interval=0.005))
+
+    for car, response in zip(car_list, responses):
+        assert 'error' not in response
+        assert response['source'] in ('optimizer', 'heuristic')
+        assert len(response['velocity']) == CONFLICT_CONFIG['total_time'] - car[0]
+        assert response['velocity'][0] == pytest.approx(CONFLICT_CONFIG['initial_velocity'])
+    assert set(latency) == {'p50', 'p90', 'p99', 'max'}
+
+
+def test_control_service_rejects_late_requests_and_falls_back_around_committed_crossings(monkeypatch):
+    import numpy as np
+    from src.core.service import ControlService
+    from src.core.heuristics import TrajectoryHeuristics
+    from src.core.simulator import TrajectorySimulator
+
+    service = ControlService(dict(CONFLICT_CONFIG, service={'time_budget': 5}))
+    first = service._plan_batch([[0, 0, 1], [0, 0, 5], [2, 1, 4]])
+    assert [plan['source'] for plan in first] == ['optimizer'] * 3
+    committed = service.cross_time.copy()
+    incumbent = service.online.incumbent
+
+    # 求解预算内没有可行解时, 已有车辆保持原通过时刻, 新车在其后预约
+    monkeypatch.setattr(service.online.optimizer, 'solve', service.online.optimizer.model.reset)
+    second = service._plan_batch([[3, 0, 10], [1, 0, 7], [2, 0, 2]])
+
+    assert isinstance(second[1], ValueError)
+    assert [second[i]['source'] for i in (0, 2)] == ['heuristic', 'heuristic']
+    assert service.car_list == [[0, 0, 1], [0, 0, 5], [2, 1, 4], [2, 0, 2], [3, 0, 10]]
+    assert np.array_equal(service.cross_time[:3], committed)
+    # 对全部车辆重新运行FCFS会改变已应答车辆的通过时刻
+    rerun = TrajectoryHeuristics.fcfs_reservation(service.car_list, CONFLICT_CONFIG)['cross_time']
+    assert not np.array_equal(rerun[:3], committed)
+
+    # 已有车辆的最优轨迹与新车的回退轨迹组合后仍然安全
+    reserved = np.concatenate([committed, [np.nan, np.nan]])
+    fallback = TrajectoryHeuristics.fcfs_reservation(service.car_list, CONFLICT_CONFIG, reserved=reserved)
+    assert second[2]['velocity'] == pytest.approx(fallback['v'][3, 2:].tolist())
+    assert second[0]['velocity'] == pytest.approx(fallback['v'][4, 3:].tolist())
+    solution = {name: np.vstack([incumbent[name], fallback[name][3:]]) for name in ('x', 'v', 'w')}
+    violations = TrajectorySimulator(CONFLICT_CONFIG).validate(solution, service.car_list)['violations']
+    assert violations['conflict'] == 0
+    assert violations['headway'] == 0
+
+    # 之后的求解固定已应答的回退轨迹与通过时刻
+    monkeypatch.undo()
+    fallback_cross = service.cross_time.copy()
+    third = service._plan_batch([[4, 0, 8]])
+    assert third[0]['source'] == 'optimizer'
+    assert np.array_equal(service.cross_time[:5], fallback_cross)
+    velocity = service.online.incumbent['v']
+    assert velocity[3, 2:] == pytest.approx(second[2]['velocity'], abs=1e-6)
+    assert velocity[4, 3:] == pytest.approx(second[0]['velocity'], abs=1e-6)
+
+
+def test_control_service_keeps_vehicles_aligned_when_the_solver_fails(monkeypatch):
+    from src.core.service import ControlService
+
+    service = ControlService(dict(CONFLICT_CONFIG, service={'time_budget': 5}))
+    service._plan_batch([[0, 0, 1]])
+
+    def crash():
+        raise gurobipy.GurobiError(10010, 'Model too large for size-limited license')
+
+    monkeypatch.setattr(service.online.optimizer, 'solve', crash)
+    plans = service._plan_batch([[1, 0, 5], [2, 1, 4]])
+    assert [plan['source'] for plan in plans] == ['heuristic', 'heuristic']
+    assert len(service.car_list) == service.online.optimizer.car_count == 3
+
+    monkeypatch.undo()
+    plans = service._plan_batch([[3, 0, 2]])
+    assert plans[0]['source'] == 'optimizer'
+    assert len(service.car_list) == len(service.cross_time) == service.online.optimizer.car_count == 4
+
+
+def test_simulator_validates_model_and_flags_conflicts():
+    import numpy as np
+    from src.core.model import build_traffic_optimization
+    from src.core.simulator import TrajectorySimulator
+
+    car_list = [[0, 0, 1], [0, 0, 5], [2, 1, 4], [3, 0, 2], [4, 0, 8]]
+    optimizer = build_traffic_optimization(dict(CONFLICT_CONFIG, car_list=car_list))
+    optimizer.model.Params.OutputFlag = 0
+    optimizer.solve()
+
+    simulator = TrajectorySimulator(CONFLICT_CONFIG)
+    result = simulator.evaluate(optimizer.get_solution(), car_list)
+    for name in ('kinematics', 'velocity', 'acceleration', 'position', 'conflict', 'headway'):
+        assert result['violations'][name] == 0
+    assert result['objective_value'] == pytest.approx(optimizer.model.ObjVal)
+
+    # 回放模型的速度变化量得到相同的位置
+    solution = optimizer.get_solution()
+    change = np.diff(solution['v'], axis=1, prepend=0.0)
+    replay = simulator.simulate(car_list, acceleration=change)
+    assert replay['x'] == pytest.approx(solution['x'], abs=1e-6)
+
+    # 不加控制匀速行驶时, 冲突路线上的车辆同时占用冲突区
+    constant = simulator.validate(simulator.simulate(car_list), car_list)
+    assert not constant['valid']
+    assert constant['violations']['conflict'] > 0
+
+
+def test_simulator_reports_gap_shortfall_without_failing_validation():
+    from src.core.heuristics import TrajectoryHeuristics
+    from src.core.simulator import TrajectorySimulator
+
+    # 同时发车的同路线车辆满足车头时距, 但排队时车距小于最小车距
+    car_list = [[0, 0, 1], [0, 0, 1]]
+    solution = TrajectoryHeuristics.fcfs_reservation(car_list, CONFLICT_CONFIG)
+    result = TrajectorySimulator(CONFLICT_CONFIG).validate(solution, car_list)
+
+    assert result['gap_shortfall'] > 0
+    assert 'gap' not in result['violations']
+    assert result['valid']
+
+
+@pytest.mark.parametrize('controller', ['fixed_time', 'actuated', 'fcfs'])
+def test_baseline_controllers_are_safe_and_no_better_than_optimal(controller):
+    from src.core.model import build_traffic_optimization
+    from src.experiment.experiment_manager import _run_experiment
+
+    car_list = [[0, 0, 1], [0, 0, 5], [2, 1, 4], [3, 0, 2], [4, 0, 8]]
+    optimizer = build_traffic_optimization(dict(CONFLICT_CONFIG, car_list=car_list))
+    optimizer.model.Params.OutputFlag = 0
+    optimizer.solve()
+
+    performance, solution = _run_experiment(dict(CONFLICT_CONFIG, car_list=car_list, controller=controller))
+    assert performance['status'] == 'Heuristic'
+    assert performance['controller'] == controller
+    assert solution['x'].shape == (len(car_list), CONFLICT_CONFIG['total_time'])
+    assert solution['violation_count'] == 0
+    assert solution['objective_value'] >= optimizer.model.ObjVal - 1e-6
+
+
+def test_unsafe_controller_is_reported_as_infeasible():
+    from src.core.controllers import BaselineController, SOLVED
+    from src.visualization.performance_metrics import PerformanceAnalyzer
+
+    class ConstantSpeedController(BaselineController):
+        name = 'constant'
+
+        def trajectories(self, car_array):
+            return self.simulator.simulate(car_array)
+
+    car_list = [[0, 0, 1], [0, 0, 5], [2, 1, 4], [3, 0, 2], [4, 0, 8]]
+    result = ConstantSpeedController(CONFLICT_CONFIG).run(car_list)
+
+    assert result['violation_count'] == sum(result['violations'].values()) > 0
+    assert result['status'] != SOLVED
+    performance = PerformanceAnalyzer.analyze_solution(result, dict(CONFLICT_CONFIG, car_list=car_list))
+    assert performance['status'] == 'Infeasible'
+    assert performance['controller'] == 'constant'
+
+
+def test_incomplete_signal_controller_cannot_be_created():
+    from src.core.controllers import SignalController
+
+    with pytest.raises(TypeError):
+        SignalController(CONFLICT_CONFIG)
+
+
+def test_solve_records_progress_and_phase_times():
+    from src.core.model import build_traffic_optimization
+    from src.visualization.performance_metrics import PerformanceAnalyzer
+
+    car_list = [[0, 0, 1], [0, 0, 5], [2, 1, 4], [3, 0, 2], [4, 0, 8]]
+    config = dict(CONFLICT_CONFIG, car_list=car_list, solver={'progress_interval': 0.0})
+    optimizer = build_traffic_optimization(config)
+    optimizer.model.Params.OutputFlag = 0
+    solution = PerformanceAnalyzer.extract_solution(optimizer.solve())
+
+    progress = solution['progress']
+    final = progress['timeline'][-1]
+    assert final['event'] == 'final'
+    assert final['objective'] == pytest.approx(optimizer.model.ObjVal)
+    assert any(record['event'] == 'incumbent' for record in progress['timeline'])
+    assert progress['summary']['first_incumbent_time'] == solution['first_incumbent_time']
+    assert set(progress['summary']['presolve']) >= {'removed_rows', 'removed_columns'}
+
+    phases = PerformanceAnalyzer.analyze_solution(solution, config)['phase_times']
+    assert set(phases) == {'presolve', 'root_relaxation', 'heuristics', 'branching'}
+    assert sum(phases.values()) == pytest.approx(optimizer.model.Runtime)
+
+
+def test_progress_falls_back_to_runtime_without_work_units(monkeypatch):
+    from types import SimpleNamespace
+    from src.core import progress
+    from src.core.model import build_traffic_optimization
+
+    monkeypatch.setattr(progress, 'WORK_CALLBACK', None)
+    config = dict(CONFLICT_CONFIG, car_list=[[0, 0, 1], [0, 0, 5], [2, 1, 4]], solver={'progress_interval': 0.0})
+    optimizer = build_traffic_optimization(config)
+    optimizer.model.Params.OutputFlag = 0
+    optimizer.solve()
+
+    records = optimizer.progress.timeline[:-1]
+    assert records and all(record['work'] == record['time'] for record in records)
+    assert progress._model_work(SimpleNamespace(Runtime=1.5)) == 1.5
@@ -0,0 +1,70 @@
+import json
+import pytest
+
+pytest.importorskip('gurobipy')
+
+from src.experiment.experiment_manager import ExperimentManager
+from src.experiment.parameter_sweep import ParameterSweep
+
+
+def make_manager(tmp_path, **config):
+    manager = ExperimentManager()
+    manager.config.update(dict({'output_dir': str(tmp_path), 'results_store': {'enabled': False}}, **config))
+    manager.create_output_directories()
+    return manager
+
+
+def test_parameter_sweep_shares_scenarios_across_config_parameters(tmp_path, monkeypatch):
+    manager = make_manager(tmp_path, results_store={'enabled': True, 'dir': str(tmp_path / 'results')})
+
+    generated = []
+    scenario = ParameterSweep.scenario
+    monkeypatch.setattr(ParameterSweep, 'scenario',
+                        lambda self, task, config: generated.append(task['id']) or scenario(self, task, config))
+
+    sweep = ParameterSweep(grid={'density': [0.1, 0.2], 'vehicle_types.bus.v_max': [8, 10]}, replicates=2)
+    results = manager.run_parameter_sweep(sweep, controllers=['fcfs'])
+
+    # 2个密度 x 2次重复共4个场景, 公交车限速不同的实验点共用场景
+    assert len(results) == 8 and len(generated) == 4
+    assert all(result['status'] == 'Heuristic' for result in results)
+    by_point = {(result['parameters']['density'], result['parameters']['vehicle_types.bus.v_max'],
+                 result['replicate']): result for result in results}
+    for density in (0.1, 0.2):
+        for replicate in (0, 1):
+            assert (by_point[density, 8, replicate]['total_vehicles']
+                    == by_point[density, 10, replicate]['total_vehicles'])
+    assert manager.config['vehicle_types']['bus']['v_max'] == 10
+
+    frame = manager.results_store.load_experiments(columns=['parameters', 'replicate'])
+    assert len(frame) == 8
+    assert {json.loads(value)['vehicle_types.bus.v_max'] for value in frame['parameters']} == {8, 10}
+
+
+def test_solver_parameter_sweep_solves_each_point_with_its_own_setting(tmp_path, monkeypatch):
+    from src.core.template import ModelTemplate
+    from src.utils.result_cache import ResultCache
+
+    manager = make_manager(tmp_path, total_time=10, formulation='linear',
+                           cache={'enabled': True, 'dir': str(tmp_path / 'cache')})
+    manager.config['experiments'] = dict(manager.config['experiments'], reuse_model=True)
+
+    # 记录每次求解时模板实际使用的MIP间隙
+    gaps = []
+    solve = ModelTemplate.solve
+    monkeypatch.setattr(ModelTemplate, 'solve',
+                        lambda self: gaps.append(self.model.Params.MIPGap) or solve(self))
+
+    # 公交车在时域之外发车, 场景只有少量小汽车
+    sweep = ParameterSweep(grid={'density': [0.05], 'bus_start_time': [100], 'solver.mip_gap': [0.5, 0.0]})
+    results = manager.run_parameter_sweep(sweep, controllers=['optimal'])
+
+    assert [result['status'] for result in results] == ['Optimal', 'Optimal']
+    assert gaps == [0.5, 0.0]
+    assert not any(result.get('cached') for result in results)
+
+    # 再次运行时两个实验点各自命中自己的缓存条目
+    gaps.clear()
+    again = manager.run_parameter_sweep(sweep, controllers=['optimal'])
+    assert gaps == [] and all(result['cached'] for result in again)
+    assert len(ResultCache(str(tmp_path / 'cache'))._entries()) == 2
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from src.visualization.performance_metrics import PerformanceAnalyzer
+
+
+CONFIG = {
+    'road_length': [10, 20, 10, 20],
+    'vehicle_types': {
+        'car': {'v_min': 0, 'v_max': 5, 'a_min': -3, 'a_max': 3},
+        'bus': {'v_min': 0, 'v_max': 4, 'a_min': -2, 'a_max': 2}
+    },
+    'performance_thresholds': {'equity_factor': 0.2, 'stop_speed': 0.5},
+    # 小汽车在进口道0(长10), 公交车在进口道1(长20), 公交车在时刻1进入
+    'car_list': [[0, 0, 1], [1, 1, 4]]
+}
+
+SOLUTION = {
+    'status': 2,
+    'objective_value': 8.0,
+    'w': np.array([[1, 1, 1, 0, 0, 0],
+                   [1, 1, 1, 1, 1, 1]], dtype=float),
+    'v': np.array([[5, 0.2, 5, 5, 5, 5],
+                   [0, 0, 0.1, 2, 0.3, 2]], dtype=float)
+}
+
+
+def test_vehicle_metrics_match_hand_computed_values():
+    metrics = PerformanceAnalyzer.calculate_vehicle_metrics(SOLUTION, CONFIG)
+
+    # 小汽车: 有效区域 t0..t2; 公交车: 进入前的 t0 不计, 有效区域 t1..t5
+    assert metrics['travel_time'].tolist() == [3.0, 5.0]
+    # 自由流时间 10/5 与 20/4
+    assert metrics['free_flow_time'].tolist() == [2.0, 5.0]
+    assert metrics['delay'].tolist() == [1.0, 0.0]
+    # 小汽车在 t1 停车一次; 公交车在 t1-t2 与 t4 各停车一次
+    assert metrics['stops'].tolist() == [1, 2]
+
+
+def test_equity_ratios_compare_bus_with_car():
+    performance = PerformanceAnalyzer.analyze_solution(SOLUTION, CONFIG)
+
+    assert performance['total_vehicles'] == 2
+    assert performance['total_travel_time'] == 8.0
+    assert performance['total_delay'] == 1.0
+    assert performance['total_stops'] == 3
+    assert performance['equity']['travel_time_ratio'] == pytest.approx(5 / 3)
+    assert performance['equity']['delay_ratio'] == 0.0
+    assert performance['equity']['within_equity_factor'] is False
+    assert performance['road_performance'][4]['average_delay'] == 0.0
+
+
+def test_time_limited_solution_with_incumbent_is_analyzed():
+    performance = PerformanceAnalyzer.analyze_solution(dict(SOLUTION, status=9), CONFIG)
+
+    assert performance['status'] == 'Feasible'
+    assert performance['solver_status'] == 9
+    assert performance['objective_value'] == 8.0
+    assert performance['total_delay'] == 1.0
+
+
+@pytest.mark.parametrize('solution', [{'status': 9}, dict(SOLUTION, status=3)])
+def test_solution_without_usable_incumbent_is_infeasible(solution):
+    performance = PerformanceAnalyzer.analyze_solution(solution, CONFIG)
+
+    assert performance['status'] == 'Infeasible'
+    assert performance['solver_status'] == solution['status']
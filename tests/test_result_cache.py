@@ -0,0 +1,103 @@
+import os
+import numpy as np
+import pytest
+
+from src.utils.result_cache import ResultCache
+
+
+CONFIG = {
+    'total_time': 10,
+    'road_length': [154, 145, 154, 145],
+    'cost_car': 1,
+    'cost_bus': 1,
+    'solver': {'backend': 'gurobi', 'time_limit': 60, 'mip_gap': 0.001, 'threads': 1}
+}
+
+CAR_LIST = [[0, 0, 1], [2, 1, 4]]
+
+
+def make_solution(car_count=2, total_time=10):
+    rng = np.random.default_rng(0)
+    return {
+        'x': rng.random((car_count, total_time)),
+        'v': rng.random((car_count, total_time)),
+        'w': rng.integers(0, 2, (car_count, total_time)).astype(float),
+        'theta': rng.integers(0, 2, (car_count, total_time)).astype(float)
+    }
+
+
+def test_put_and_get_round_trip(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    key = ResultCache.make_key(CONFIG, CAR_LIST)
+    assert cache.get(key) is None
+
+    solution = make_solution()
+    cache.put(key, solution, objective_value=12.5, status=2, solve_time=0.25)
+
+    entry = cache.get(key)
+    for name, values in solution.items():
+        assert np.array_equal(entry[name], values)
+    assert entry['objective_value'] == 12.5
+    assert entry['status'] == 2
+    assert entry['solve_time'] == 0.25
+
+
+def test_invalidate_removes_entry(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    key = ResultCache.make_key(CONFIG, CAR_LIST)
+    cache.put(key, make_solution(), objective_value=1.0, status=2)
+
+    assert cache.invalidate(key)
+    assert cache.get(key) is None
+    assert not cache.invalidate(key)
+
+
+def test_eviction_keeps_most_recently_used_entries(tmp_path):
+    cache = ResultCache(str(tmp_path), max_entries=2)
+    keys = [ResultCache.make_key(CONFIG, [[t, 0, 1]]) for t in (0, 2, 4)]
+
+    for access_time, key in enumerate(keys[:2], 1):
+        cache.put(key, make_solution(), objective_value=1.0, status=2)
+        os.utime(cache._entry_path(key), (access_time, access_time))
+    # 读取第一个条目后, 第二个条目成为最久未使用的条目
+    assert cache.get(keys[0]) is not None
+    cache.put(keys[2], make_solution(), objective_value=1.0, status=2)
+
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[2]) is not None
+
+
+@pytest.mark.parametrize('name, value', [('mip_gap', 0.5), ('time_limit', 1), ('backend', 'highs'),
+                                         ('warm_start', 'heuristic')])
+def test_key_changes_with_solver_settings(name, value):
+    key = ResultCache.make_key(CONFIG, CAR_LIST)
+    changed = dict(CONFIG, solver=dict(CONFIG['solver'], **{name: value}))
+
+    assert ResultCache.make_key(changed, CAR_LIST) != key
+
+
+def test_key_ignores_thread_count_and_tracks_car_list():
+    key = ResultCache.make_key(CONFIG, CAR_LIST)
+    threads = dict(CONFIG, solver=dict(CONFIG['solver'], threads=4))
+
+    assert ResultCache.make_key(threads, CAR_LIST) == key
+    assert ResultCache.make_key(CONFIG, CAR_LIST[:1]) != key
+
+
+def test_only_optimal_solutions_are_cached(tmp_path, monkeypatch):
+    pytest.importorskip('gurobipy')
+    from src.experiment import experiment_manager
+
+    time_limited = dict(make_solution(len(CAR_LIST)), status=9, objective_value=3.0, solve_time=1.0)
+    monkeypatch.setattr(experiment_manager, 'solve_with_backend', lambda config, backend: dict(time_limited))
+
+    vehicle_types = {'car': {'v_min': 0, 'v_max': 12, 'a_min': -3, 'a_max': 3},
+                     'bus': {'v_min': 0, 'v_max': 10, 'a_min': -2, 'a_max': 2}}
+    exp_config = dict(CONFIG, car_list=CAR_LIST, vehicle_types=vehicle_types,
+                      cache={'enabled': True, 'dir': str(tmp_path)}, solver=dict(CONFIG['solver'], backend='highs'))
+    performance, _ = experiment_manager._run_experiment(exp_config)
+
+    assert performance['status'] == 'Feasible'
+    assert performance['solver_status'] == 9
+    assert ResultCache(str(tmp_path)).get(ResultCache.make_key(exp_config, CAR_LIST)) is None
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from src.utils.results_store import ResultsStore
+from src.visualization.performance_metrics import PerformanceAnalyzer
+
+
+def test_results_store_appends_runs_and_queries_across_them(tmp_path):
+    vehicle_metrics = {
+        'car_type': np.array([0, 1]), 'car_route': np.array([1, 4]),
+        'travel_time': np.array([10.0, 12.0]), 'free_flow_time': np.array([8.0, 9.0]),
+        'delay': np.array([2.0, 3.0]), 'stops': np.array([0, 1])
+    }
+    for run_id, offset in (('first', 0.0), ('second', 10.0)):
+        store = ResultsStore(str(tmp_path), run_id=run_id)
+        for exp_index, density in enumerate((0.1, 0.3), 1):
+            store.append_experiment(density, exp_index,
+                                    {'status': 'Optimal', 'objective_value': offset + exp_index,
+                                     'solve_time': 1.0, 'total_delay': 5.0},
+                                    vehicle_metrics=vehicle_metrics, initial_time=np.array([0, 2]))
+        store.append_experiment(0.1, 1, {'status': 'Infeasible'}, controller='fcfs')
+
+    assert store.runs() == ['first', 'second']
+    experiments = store.load_experiments(columns=['objective_value'], densities=[0.1],
+                                         controllers=['optimal'])
+    assert sorted(experiments['objective_value']) == [1.0, 11.0]
+    assert len(store.load_vehicles(run_ids=['second'])) == 4
+
+    comparison = PerformanceAnalyzer.compare_experiments(store=str(tmp_path), controllers=['optimal'],
+                                                         group_by=('density',))
+    assert comparison['groups'].loc[0.3, ('objective_value', 'mean')] == pytest.approx(7.0)
+    assert comparison['groups'].loc[0.3, ('objective_value', 'count')] == 2
+
+
+def test_comparison_ignores_failed_experiments(tmp_path):
+    store = ResultsStore(str(tmp_path / 'results'), run_id='first')
+    store.append_experiment(0.1, 1, {'status': 'Optimal', 'objective_value': 4.0, 'solve_time': 1.0})
+    store.append_experiment(0.1, 2, {'status': 'Optimal', 'objective_value': 6.0, 'solve_time': 3.0})
+    store.append_experiment(0.1, 3, {'status': 'Infeasible'})
+
+    experiments = PerformanceAnalyzer.query_experiments(str(tmp_path / 'results'))
+    assert sorted(experiments['status']) == ['Infeasible', 'Optimal', 'Optimal']
+
+    comparison = PerformanceAnalyzer.compare_experiments(store=str(tmp_path / 'results'),
+                                                         group_by=('density',))
+    assert comparison['summary']['mean_objective'] == pytest.approx(5.0)
+    assert comparison['summary']['mean_solve_time'] == pytest.approx(2.0)
+    assert comparison['groups'].loc[0.1, ('objective_value', 'count')] == 2
+
+
+def test_query_does_not_create_runs(tmp_path):
+    PerformanceAnalyzer.query_experiments(str(tmp_path / 'missing'))
+    assert not (tmp_path / 'missing').exists()
+
+    store = ResultsStore(str(tmp_path), run_id='first')
+    store.append_experiment(0.1, 1, {'status': 'Optimal', 'objective_value': 1.0})
+    PerformanceAnalyzer.query_experiments(str(tmp_path))
+    assert store.runs() == ['first']
+
+    with pytest.raises(RuntimeError):
+        ResultsStore(str(tmp_path), read_only=True).append_experiment(0.1, 2, {'status': 'Optimal'})
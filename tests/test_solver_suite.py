@@ -0,0 +1,52 @@
+import json
+import pytest
+
+pytest.importorskip('gurobipy')
+
+from src.benchmark.solver_suite import compare_benchmark_results
+
+
+BASELINE = {
+    'max_vehicles': 5,
+    'total_time': 10,
+    'density': 0.1,
+    'seed': 0,
+    'status': 2,
+    'solve_time': 1.0,
+    'objective_value': 20.0,
+    'mip_gap': 0.0
+}
+
+
+def write_results(path, *records):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'metadata': {}, 'results': list(records)}, f)
+    return str(path)
+
+
+def compare(tmp_path, **changes):
+    baseline = write_results(tmp_path / 'baseline.json', BASELINE)
+    current = write_results(tmp_path / 'current.json', dict(BASELINE, **changes))
+    return compare_benchmark_results(baseline, current)
+
+
+def test_equal_results_are_not_flagged(tmp_path):
+    assert compare(tmp_path) == []
+
+
+@pytest.mark.parametrize('changes, reason', [
+    ({'solve_time': 2.0}, '求解时间'),
+    ({'objective_value': 21.0}, '目标值'),
+    ({'mip_gap': 0.05}, 'MIP间隙'),
+    ({'status': 9}, '状态')
+])
+def test_regressions_are_flagged(tmp_path, changes, reason):
+    regressions = compare(tmp_path, **changes)
+
+    assert len(regressions) == 1
+    assert regressions[0]['seed'] == BASELINE['seed']
+    assert [r for r in regressions[0]['reasons'] if r.startswith(reason)]
+
+
+def test_faster_and_better_results_are_not_flagged(tmp_path):
+    assert compare(tmp_path, solve_time=0.5, objective_value=19.0) == []
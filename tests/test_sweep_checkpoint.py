@@ -0,0 +1,69 @@
+import json
+import pytest
+
+pytest.importorskip('gurobipy')
+
+from src.core import controllers
+from src.experiment.sweep_checkpoint import SweepCheckpoint
+from src.experiment.experiment_manager import ExperimentManager
+
+
+def test_checkpointed_sweep_resumes_only_failed_experiments(tmp_path, monkeypatch):
+    manager = ExperimentManager()
+    manager.config.update(output_dir=str(tmp_path), results_store={'enabled': False})
+    manager.create_output_directories()
+    sweep_dir = str(tmp_path / 'sweep')
+
+    class BrokenController(controllers.FCFSReservationController):
+        def trajectories(self, car_array):
+            raise RuntimeError('solver crashed')
+
+    monkeypatch.setitem(controllers.CONTROLLERS, 'fixed_time', BrokenController)
+    first = manager.run_density_experiments(base_density=0.1, num_experiments=2,
+                                            controllers=['fcfs', 'fixed_time'], sweep_dir=sweep_dir)
+    assert [result['status'] for result in first] == ['Heuristic', 'Failed'] * 2
+    assert 'solver crashed' in first[1]['message']
+
+    monkeypatch.undo()
+    second = manager.run_density_experiments(base_density=0.1, num_experiments=2, sweep_dir=sweep_dir)
+    assert [result['status'] for result in second] == ['Heuristic'] * 4
+
+    with open(tmp_path / 'sweep' / 'records.jsonl') as f:
+        records = [json.loads(line) for line in f]
+    assert [record['id'] for record in records] == ['1/fcfs', '1/fixed_time', '2/fcfs', '2/fixed_time',
+                                                   '1/fixed_time', '2/fixed_time']
+    assert records[1]['status'] == 'failed' and records[-1]['status'] == 'completed'
+    # 恢复时生成的场景与首次运行相同
+    assert second[0]['objective_value'] == first[0]['objective_value']
+
+    with pytest.raises(ValueError):
+        manager.run_density_experiments(base_density=0.2, num_experiments=2, sweep_dir=sweep_dir)
+
+
+def test_checkpointed_sweep_keeps_an_explicit_seed(tmp_path):
+    manager = ExperimentManager()
+    manager.config.update(output_dir=str(tmp_path), results_store={'enabled': False})
+    manager.create_output_directories()
+    sweep_dir = str(tmp_path / 'sweep')
+
+    plain = manager.run_density_experiments(base_density=0.2, num_experiments=2, seed=42, controllers=['fcfs'])
+    first = manager.run_density_experiments(base_density=0.2, num_experiments=2, seed=42, controllers=['fcfs'],
+                                            sweep_dir=sweep_dir)
+    resumed = manager.run_density_experiments(base_density=0.2, num_experiments=2, seed=42, sweep_dir=sweep_dir)
+
+    with open(tmp_path / 'sweep' / 'manifest.json') as f:
+        assert json.load(f)['parameters']['seed'] == 42
+    # 相同种子在有无检查点时生成相同的场景
+    assert [result['objective_value'] for result in first] == [result['objective_value'] for result in plain]
+    assert resumed == first
+
+
+def test_time_limited_experiments_count_as_completed(tmp_path):
+    checkpoint = SweepCheckpoint(str(tmp_path))
+    checkpoint.plan({}, [{'id': 'limited'}, {'id': 'infeasible'}], config_key='')
+
+    checkpoint.record({'id': 'limited'}, {'status': 'Feasible', 'solver_status': 9, 'objective_value': 3.0})
+    checkpoint.record({'id': 'infeasible'}, {'status': 'Infeasible', 'solver_status': 9})
+
+    assert checkpoint.completed_ids() == {'limited'}
+    assert [record['solver_status'] for record in checkpoint.results()] == [9, 9]
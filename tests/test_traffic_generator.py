@@ -0,0 +1,74 @@
+import numpy as np
+
+from src.utils.traffic_generator import TrafficGenerator, NO_VEHICLE
+
+
+def test_vehicle_flows_are_typed_and_reproducible():
+    flows = TrafficGenerator.generate_vehicle_flows([0.3] * 12, total_time=50, rng=7)
+
+    assert flows.dtype == np.int8
+    assert flows.shape == (26, 12)
+    assert set(np.unique(flows)) <= {NO_VEHICLE, 0, 1}
+
+    again = TrafficGenerator.generate_vehicle_flows(
+        [0.3] * 12, total_time=50, rng=np.random.default_rng(7)
+    )
+    assert np.array_equal(flows, again)
+
+
+def test_buses_follow_start_time_and_interval():
+    flows = TrafficGenerator.generate_vehicle_flows(
+        [0.0, 1.0], total_time=40, bus_start_time=2, bus_interval=8, rng=0
+    )
+
+    bus_slots = np.flatnonzero((flows == 1).all(axis=1))
+    assert bus_slots.tolist() == [1, 5, 9, 13, 17]
+
+    other = np.setdiff1d(np.arange(len(flows)), bus_slots)
+    assert (flows[other, 0] == NO_VEHICLE).all()
+    assert (flows[other, 1] == 0).all()
+
+
+def test_arrival_rate_matches_density():
+    flows = TrafficGenerator.generate_vehicle_flows(
+        [0.2, 0.6], total_time=20000, bus_interval=10 ** 6, rng=1
+    )
+
+    rates = (flows == 0).mean(axis=0)
+    assert np.allclose(rates, [0.2, 0.6], atol=0.02)
+
+
+def test_dataframe_output_marks_empty_slots_as_nan():
+    flows = TrafficGenerator.generate_vehicle_flows([0.5] * 3, total_time=10, rng=3)
+    frame = TrafficGenerator.generate_vehicle_flows(
+        [0.5] * 3, total_time=10, rng=3, as_dataframe=True
+    )
+
+    assert frame.shape == flows.shape
+    assert (frame.isna().to_numpy() == (flows == NO_VEHICLE)).all()
+
+
+def test_flows_to_car_list_orders_by_road_then_time():
+    flows = TrafficGenerator.generate_vehicle_flows([0.4] * 12, total_time=50, rng=5)
+    frame = TrafficGenerator.to_dataframe(flows)
+
+    expected = [
+        [time * 2, int(vehicle_type), road + 1]
+        for road in range(frame.shape[1])
+        for time, vehicle_type in enumerate(frame.iloc[:, road])
+        if not np.isnan(vehicle_type)
+    ]
+
+    assert TrafficGenerator.flows_to_car_list(flows) == expected
+
+
+def test_experiment_scenarios_are_generated_lazily():
+    scenarios = TrafficGenerator.iter_experiment_scenarios(num_experiments=3, time=20, rng=0)
+
+    first = next(scenarios)
+    assert first.dtype == np.int8
+    assert len(list(scenarios)) == 2
+
+    frames = TrafficGenerator.generate_experiment_scenarios(num_experiments=3, time=20, rng=0)
+    assert np.array_equal(TrafficGenerator.to_dataframe(first).to_numpy(),
+                          frames[0].to_numpy(), equal_nan=True)
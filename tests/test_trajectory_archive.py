@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+from src.utils.trajectory_archive import TrajectoryArchive
+
+
+def test_trajectory_archive_round_trips_and_slices_scenarios(tmp_path):
+    rng = np.random.default_rng(0)
+    archive = TrajectoryArchive(str(tmp_path), total_time=6)
+    scenarios = []
+    for index, car_count in enumerate((3, 0, 2)):
+        solution = {name: rng.random((car_count, 6)).round(2) for name in ('x', 'v')}
+        solution.update({name: rng.integers(0, 2, (car_count, 6)) for name in ('w', 'theta')})
+        car_list = [[t, 0, t + 1] for t in range(car_count)]
+        assert archive.append(solution, car_list, key=f'run/{index}') == index
+        scenarios.append((solution, car_list))
+
+    reopened = TrajectoryArchive(str(tmp_path))
+    assert len(reopened) == 3 and reopened.vehicle_count == 5
+    solution, car_list = scenarios[2]
+    window = reopened.scenario(reopened.find('run/2'), vehicles=[1], time=slice(2, 5))
+    assert window['x'] == pytest.approx(solution['x'][[1], 2:5].astype(np.float32))
+    assert np.array_equal(window['w'], solution['w'][[1], 2:5])
+    assert window['car_list'].tolist() == [car_list[1]]
+    assert [item['v'].shape for item in reopened.iter_scenarios(names=('v',))] == [(3, 6), (0, 6), (2, 6)]
+
+    with pytest.raises(ValueError):
+        TrajectoryArchive(str(tmp_path), total_time=8)